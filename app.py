@@ -2,12 +2,12 @@ import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
 import urllib.error
-import io
 import html
 import os
 import sys
 import time
 import logging
+import uuid
 from datetime import datetime
 
 # --- MODÜL YOLLARI ---
@@ -21,7 +21,8 @@ try:
         PAGE_TITLE, PAGE_ICON, REQUEST_TIMEOUT, USER_AGENT,
         DEFAULT_TR_FILTER, TABLE_HEIGHT, DISABLE_SSL_VERIFY,
         APP_VERSION, HEALTH_CHECK_MAX_WORKERS, HEALTH_CHECK_TIMEOUT,
-        HEALTH_CHECK_MAX_CHANNELS,
+        HEALTH_CHECK_MAX_CHANNELS, HEALTH_CHECK_ENGINE, HEALTH_CHECK_CONCURRENCY,
+        HEALTH_CHECK_TIER, HEALTH_CHECK_ESCALATE, HEALTH_CHECK_DEADLINE,
     )
 except ImportError:
     PAGE_TITLE = "M3U Editör Pro"
@@ -32,9 +33,14 @@ except ImportError:
     TABLE_HEIGHT = 600
     DISABLE_SSL_VERIFY = True
     APP_VERSION = "2.0.0"
-    HEALTH_CHECK_MAX_WORKERS = 10
-    HEALTH_CHECK_TIMEOUT = 5
-    HEALTH_CHECK_MAX_CHANNELS = 50
+    HEALTH_CHECK_MAX_WORKERS = 30
+    HEALTH_CHECK_TIMEOUT = 3
+    HEALTH_CHECK_MAX_CHANNELS = 20000
+    HEALTH_CHECK_ENGINE = "async"
+    HEALTH_CHECK_CONCURRENCY = 500
+    HEALTH_CHECK_TIER = "head"
+    HEALTH_CHECK_ESCALATE = True
+    HEALTH_CHECK_DEADLINE = 60
 
 # --- LOG ---
 if not logging.getLogger().hasHandlers():
@@ -50,11 +56,48 @@ st.set_page_config(
 )
 
 # --- YARDIMCI MODÜLLER ---
-from utils.parser import parse_m3u_lines, filter_channels, convert_df_to_m3u, batch_check_health
+from utils.parser import convert_df_to_m3u, write_m3u, export_fingerprint, plan_health_sweep
+from utils import store as channel_store
+from utils.search import SearchIndex
+from utils import dedup
+from utils.ingest import ingest_sources, source_label
+from utils.cache import PlaylistCache
+from utils.health_store import HealthStore
+from utils.jobs import HealthJobManager, JOB_PAUSED, JOB_QUEUED, JOB_DONE, JOB_CANCELLED
 from utils import network as network_utils
 from utils.visitor_counter import VisitorCounter
 from utils.proxy_server import LocalProxyServer
 
+# Kenar çubuğundaki yinelenen kanal seçenekleri → dedup politikası
+DEDUP_CHOICES = {
+    "Hepsini göster": None,
+    "İlkini tut": dedup.KEEP_FIRST,
+    "En sağlıklıyı tut": dedup.KEEP_HEALTHIEST,
+    "Alternatif olarak birleştir": dedup.MERGE,
+}
+
+@st.cache_resource
+def get_playlist_cache():
+    # Tüm oturumlar aynı disk önbelleğini paylaşır (CACHE_TTL / CACHE_MAX_MB)
+    return PlaylistCache()
+
+# Sağlık kontrolü yoklama kademeleri (utils.health.TIER_*)
+HEALTH_TIER_LABELS = {
+    "connect": "🔌 Bağlantı",
+    "head": "🌐 HTTP",
+    "get": "🧪 Derin HLS",
+}
+
+@st.cache_resource
+def get_health_store():
+    # Sağlık sonuçları tüm oturumlar arasında paylaşılır (HEALTH_RESULT_MAX_AGE)
+    return HealthStore()
+
+@st.cache_resource
+def get_health_jobs():
+    # Sağlık taramaları süreç genelinde arka planda çalışır; her oturum iş kimliğiyle izler
+    return HealthJobManager()
+
 @st.cache_resource
 def get_proxy_server():
     server = LocalProxyServer()
@@ -81,15 +124,52 @@ vc = VisitorCounter()
 # YARDIMCI FONKSİYONLAR
 # =====================================================================
 
-def _safe_contains(series: pd.Series, term: str) -> pd.Series:
-    return series.astype(str).str.contains(term, case=False, na=False, regex=False)
+def _search_index(df: pd.DataFrame) -> SearchIndex:
+    """Yüklü liste için arama indeksini bir kez oluşturur ve oturumda saklar."""
+    index = st.session_state.get("search_index")
+    if index is None or index.size != len(df):
+        index = SearchIndex.from_frame(df)
+        st.session_state.search_index = index
+    return index
+
+
+def _dedup_labels(df: pd.DataFrame):
+    """Yüklü liste için yinelenen küme etiketlerini bir kez hesaplar ve oturumda saklar."""
+    labels = st.session_state.get("dedup_labels")
+    if labels is None or len(labels) != len(df):
+        labels = dedup.cluster_labels(df)
+        st.session_state.dedup_labels = labels
+    return labels
+
+
+def _describe_load_error(error: Exception) -> str:
+    if isinstance(error, urllib.error.HTTPError):
+        return f"🚫 HTTP Hatası: {error.code}"
+    if isinstance(error, urllib.error.URLError):
+        return f"🔌 Bağlantı Hatası: {error.reason}"
+    if isinstance(error, TimeoutError):
+        return f"⏱️ Zaman Aşımı ({REQUEST_TIMEOUT}s)"
+    return f"❌ Hata: {error}"
 
 
 def _ensure_channel_columns(df: pd.DataFrame) -> pd.DataFrame:
-    for column_name, default_value in [("LogoURL", ""), ("Tür", ""), ("Durum", "❔ Bekliyor")]:
-        if column_name not in df.columns:
-            df[column_name] = default_value
-    return df
+    return channel_store.ensure_channel_columns(df)
+
+
+def _prepare_export(df: pd.DataFrame, fingerprint: str) -> str:
+    """Filtrelenmiş listeyi yalnızca gerektiğinde proxy'nin çalma listesi dosyasına yazar ve yolunu döndürür."""
+    proxy_server = get_proxy_server()
+    if hasattr(proxy_server, "write_playlist"):
+        proxy_server.write_playlist(lambda f: write_m3u(df, f), fingerprint)
+    else:
+        # Eski cache'lenmiş proxy örnekleri için geriye dönük uyumluluk
+        proxy_server.set_m3u_content(convert_df_to_m3u(df))
+        proxy_server.playlist_fingerprint = fingerprint
+    return proxy_server.playlist_file
+
+
+def _export_ready(fingerprint: str) -> bool:
+    return getattr(get_proxy_server(), "playlist_fingerprint", None) == fingerprint
 
 
 def create_m3u_link(m3u_content: str) -> str:
@@ -101,6 +181,17 @@ def create_m3u_link(m3u_content: str) -> str:
     )
 
 
+def _health_workers(tier: str, escalate: bool) -> int:
+    """Sağlık taraması için eşzamanlı yoklama sayısı.
+
+    ``head`` dışındaki kademeler ve bağlantı yükseltmesi her zaman async
+    motorda çalışır; iş parçacığı sayısı yalnızca thread motoru için geçerlidir.
+    """
+    if HEALTH_CHECK_ENGINE == "async" or tier != "head" or escalate:
+        return HEALTH_CHECK_CONCURRENCY
+    return HEALTH_CHECK_MAX_WORKERS
+
+
 def _status_counts(df: pd.DataFrame) -> dict[str, int]:
     statuses = df.get("Durum", pd.Series(dtype=str)).astype(str)
     return {
@@ -356,6 +447,108 @@ def render_live_player(stream_url: str, height: int = 420) -> str:
 
 
 
+def _fragment(run_every):
+    # Streamlit ≥1.37 st.fragment, 1.33–1.36 st.experimental_fragment; daha eskisinde
+    # panel normal akışta çizilir ve "Yenile" düğmesiyle güncellenir
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        return lambda fn: fn
+    return fragment(run_every=run_every)
+
+
+def _rerun_app():
+    try:
+        st.rerun(scope="app")
+    except TypeError:
+        st.rerun()
+
+
+def _health_job_summary(job) -> tuple:
+    """Biten işin ``(st fonksiyonu adı, mesaj)`` özeti."""
+    completed, total = job.progress
+    by_url, _ = job.results_since(0)
+    results = [by_url[url].status for url in job.urls if url in by_url]
+    aktif = sum(1 for r in results if "✅" in r or "🔌" in r)
+    oldu = sum(1 for r in results if "❌" in r)
+    diger = len(results) - aktif - oldu
+    summary = f"({job.elapsed:.1f}s) — 🟢 {aktif} aktif | 🔴 {oldu} ölü | 🟡 {diger} belirsiz"
+    if job.expired:
+        return "warning", (
+            f"⏱️ Süre sınırı doldu: {completed}/{total} kanal kontrol edildi {summary}. "
+            "Kalanlar bir sonraki kontrolde önce yoklanır."
+        )
+    if job.state == JOB_DONE:
+        return "success", f"✅ Tamamlandı {summary}"
+    if job.state == JOB_CANCELLED:
+        return "warning", f"⏹️ İptal edildi: {completed}/{total} kanal kontrol edildi {summary}"
+    return "error", f"❌ Sağlık kontrolü başarısız: {job.error}"
+
+
+def _render_health_job():
+    """Oturumun sağlık kontrolü işinin ilerlemesini gösterir ve yeni sonuçları tabloya uygular."""
+    manager = get_health_jobs()
+    job = manager.get(st.session_state.get("health_job"))
+    if job is None:
+        summary = st.session_state.get("health_job_summary")
+        if summary:
+            getattr(st, summary[0])(summary[1])
+        return
+
+    updates, st.session_state.health_job_cursor = job.results_since(st.session_state.get("health_job_cursor", 0))
+    if updates and not st.session_state.data.empty:
+        # Aynı URL'ye sahip tüm satırlar güncellenir
+        channel_store.set_statuses(st.session_state.data, {url: probe.status for url, probe in updates.items()})
+        if job.options.get("tier") == "get":
+            channel_store.set_probe_metrics(st.session_state.data, updates)
+        st.session_state.data_version = uuid.uuid4().hex
+
+    completed, total = job.progress
+    if job.active:
+        pct = completed / total if total else 0.0
+        speed = completed / job.elapsed if job.elapsed > 0 else 0
+        remaining = (total - completed) / speed if speed > 0 else 0
+        if job.state == JOB_QUEUED:
+            label = "⏳ Sırada"
+        elif job.state == JOB_PAUSED:
+            label = "⏸️ Duraklatıldı"
+        else:
+            label = "🔍"
+        st.progress(pct, text=f"{label} {completed}/{total} — {pct:.0%} | ⏱️ ~{remaining:.0f}s kaldı")
+        ctrl1, ctrl2, ctrl3 = st.columns(3)
+        with ctrl1:
+            if job.state == JOB_PAUSED:
+                st.button("▶️ Sürdür", on_click=manager.resume, args=(job.id,), use_container_width=True)
+            else:
+                st.button("⏸️ Duraklat", on_click=manager.pause, args=(job.id,), use_container_width=True)
+        with ctrl2:
+            st.button("⏹️ İptal", on_click=manager.cancel, args=(job.id,), use_container_width=True)
+        with ctrl3:
+            st.button("🔄 Yenile", use_container_width=True)
+        st.caption("Tarama arka planda sürüyor; sonuçlar geldikçe kaydedilir ve tablo tarama bitince yenilenir.")
+        if job.state == JOB_PAUSED and job.options.get("deadline"):
+            st.caption(f"⏱️ Süre sınırı ({job.options['deadline']:.0f}s) duraklatılmışken de işler.")
+        return
+
+    # Tüm sonuçlar tabloya uygulandı: özet saklanır, iş bırakılır ve sonuçlarıyla
+    # birlikte yöneticiden silinebilir. Tablo ve filtreler son durumlarla yeniden çizilir.
+    st.session_state.health_job_summary = _health_job_summary(job)
+    st.session_state.health_job = None
+    manager.release(job.id)
+    _rerun_app()
+
+
+# Süren iş saniyede bir yenilenir; iş yokken veya bittiğinde panel zamanlayıcısız çizilir
+_health_job_live = _fragment(run_every=1.0)(_render_health_job)
+
+
+def health_job_panel():
+    job = get_health_jobs().get(st.session_state.get("health_job"))
+    if job is not None and job.active:
+        _health_job_live()
+    else:
+        _render_health_job()
+
+
 # =====================================================================
 # SESSION STATE
 # =====================================================================
@@ -364,6 +557,9 @@ if "data" not in st.session_state:
     st.session_state.data = pd.DataFrame()
 if "play_channel" not in st.session_state:
     st.session_state.play_channel = None
+if "data_version" not in st.session_state:
+    # Yüklenen veri veya durumları değiştikçe yenilenir (dışa aktarım önbelleği anahtarı)
+    st.session_state.data_version = uuid.uuid4().hex
 
 # Ziyaretçi takibi
 if "visited" not in st.session_state:
@@ -395,61 +591,83 @@ with st.sidebar:
     )
     st.markdown("---")
 
-    url = st.text_input("🌐 M3U Linki Yapıştır:")
-    uploaded_file = st.file_uploader("📂 veya M3U Dosyası Yükle", type=["m3u", "m3u8"])
+    url = st.text_area("🌐 M3U Linki Yapıştır (her satıra bir link):", height=80)
+    uploaded_files = st.file_uploader("📂 veya M3U Dosyası Yükle", type=["m3u", "m3u8", "gz", "zst"], accept_multiple_files=True)
     only_tr = st.checkbox("🇹🇷 Sadece TR Kanalları", value=DEFAULT_TR_FILTER)
 
     if st.button("🚀 Listeyi Çek ve Tara", use_container_width=True, type="primary"):
         # Belleği hemen boşaltmak için eski verileri temizle
         st.session_state.data = pd.DataFrame()
+        st.session_state.search_index = None
+        st.session_state.dedup_labels = None
         import gc
         gc.collect()
 
-        source_lines = None
-        start = time.time()
-        if url:
-            try:
-                with st.spinner("Link indiriliyor..."):
-                    source_lines = network_utils.fetch_m3u_source(
-                        url,
-                        user_agent=USER_AGENT,
-                        timeout=REQUEST_TIMEOUT,
-                        disable_ssl_verify=DISABLE_SSL_VERIFY,
-                    )
-            except urllib.error.HTTPError as e:
-                st.error(f"🚫 HTTP Hatası: {e.code}")
-            except urllib.error.URLError as e:
-                st.error(f"🔌 Bağlantı Hatası: {e.reason}")
-            except TimeoutError:
-                st.error(f"⏱️ Zaman Aşımı ({REQUEST_TIMEOUT}s)")
-            except Exception as e:
-                logger.error("Yükleme hatası", exc_info=True)
-                st.error(f"❌ Hata: {e}")
-        elif uploaded_file:
-            source_lines = io.StringIO(uploaded_file.getvalue().decode("utf-8", errors="ignore")).readlines()
-        else:
+        sources, labels = [], []
+        for line in (url or "").splitlines():
+            if line.strip():
+                sources.append(line.strip())
+                labels.append(source_label(line.strip(), len(labels)))
+        for uploaded_file in uploaded_files or []:
+            # Yüklenen dosya zaten bellekte; kopyalamadan memoryview üzerinden parse edilir
+            sources.append(uploaded_file.getbuffer())
+            labels.append(f"{len(labels) + 1}. {uploaded_file.name}")
+        if not sources:
             st.warning("Lütfen bir link girin veya dosya yükleyin.")
 
-        if source_lines:
-            raw = parse_m3u_lines(source_lines)
-            source_lines = None
-            gc.collect()
-
-            filtered = filter_channels(raw, only_tr)
-            raw = None
-            gc.collect()
-
+        df = None
+        if sources:
+            start = time.time()
+            progress = st.progress(0.0) if len(sources) > 1 else None
+
+            def update_ingest_progress(done, total, report):
+                if progress is not None:
+                    progress.progress(done / total, text=f"{done}/{total} kaynak tamamlandı")
+
+            with st.spinner("Liste indiriliyor ve taranıyor..."):
+                # Kaynaklar paralel indirilir; her biri indirilirken parça parça parse edilip
+                # doğrudan sütunlu tabloya yazılır, hatalı kaynak diğerlerini bekletmez
+                df, reports = ingest_sources(
+                    sources,
+                    labels=labels,
+                    only_tr=only_tr,
+                    user_agent=USER_AGENT,
+                    timeout=REQUEST_TIMEOUT,
+                    disable_ssl_verify=DISABLE_SSL_VERIFY,
+                    cache=get_playlist_cache(),
+                    progress_callback=update_ingest_progress,
+                )
+            sources = None
+            if progress is not None:
+                progress.empty()
+
+            for report in reports:
+                prefix = f"{report['source']}: " if len(reports) > 1 else ""
+                if report["error"] is not None:
+                    if not isinstance(report["error"], (urllib.error.URLError, TimeoutError)):
+                        logger.error("Yükleme hatası", exc_info=report["error"])
+                    st.error(prefix + _describe_load_error(report["error"]))
+                elif len(reports) > 1:
+                    st.caption(f"✅ {report['source']} — {report['channels']} kanal ({report['seconds']}s)")
+
+        if df is not None:
             elapsed = round(time.time() - start, 2)
-            if filtered:
-                df = _ensure_channel_columns(pd.DataFrame(filtered))
-                filtered = None
-                gc.collect()
-
+            if not df.empty:
+                try:
+                    # Daha önce kontrol edilmiş URL'ler son bilinen durumlarıyla gelir
+                    channel_store.set_statuses(df, get_health_store().statuses(df["URL"].unique().tolist()))
+                except Exception as e:
+                    logger.warning(f"Sağlık sonuçları yüklenemedi: {e}")
                 st.session_state.data = df
+                st.session_state.data_version = uuid.uuid4().hex
+                st.session_state.search_index = None
+                st.session_state.dedup_labels = None
                 st.session_state.play_channel = None  # ✅ Yeni liste yüklendiğinde eski oynatmayı sıfırla
                 st.success(f"✅ {len(df)} kanal bulundu ({elapsed}s)")
-            else:
+            elif not any(report["error"] is not None for report in reports):
                 st.warning("⚠️ Kanal bulunamadı.")
+            df = None
+            gc.collect()
 
     st.markdown("---")
 
@@ -457,21 +675,32 @@ with st.sidebar:
     selected_groups = []
     selected_types = []
     selected_statuses = []
+    selected_regions = []
+    selected_sources = []
+    dedup_policy = None
     if not st.session_state.data.empty:
         st.markdown("#### ⚙️ Filtre")
         try:
-            group_options = sorted(st.session_state.data["Grup"].astype(str).dropna().unique())
+            group_options = channel_store.category_options(st.session_state.data, "Grup")
         except Exception:
             group_options = []
         if group_options:
             selected_groups = st.multiselect("Grupları filtrele", group_options, default=None, key="group_filter")
 
-        type_options = sorted(st.session_state.data.get("Tür", pd.Series(dtype=str)).astype(str).dropna().unique())
+        type_options = channel_store.category_options(st.session_state.data, "Tür")
         if type_options:
             selected_types = st.multiselect("Yayın türü", type_options, default=None, key="type_filter")
-        status_options = sorted(st.session_state.data.get("Durum", pd.Series(dtype=str)).astype(str).dropna().unique())
+        status_options = channel_store.category_options(st.session_state.data, "Durum")
         if status_options:
             selected_statuses = st.multiselect("Duruma göre", status_options, default=None, key="status_filter")
+        region_options = channel_store.category_options(st.session_state.data, "Bölge")
+        if len(region_options) > 1:
+            selected_regions = st.multiselect("Bölge", region_options, default=None, key="region_filter")
+        source_options = channel_store.category_options(st.session_state.data, "Kaynak")
+        if len(source_options) > 1:
+            selected_sources = st.multiselect("Kaynak", source_options, default=None, key="source_filter")
+        dedup_choice = st.selectbox("Yinelenen kanallar", list(DEDUP_CHOICES), key="dedup_filter")
+        dedup_policy = DEDUP_CHOICES[dedup_choice]
 
     # İstatistikler
     st.markdown("---")
@@ -490,14 +719,18 @@ with st.sidebar:
 # =====================================================================
 
 if not st.session_state.data.empty:
-    # Filtreleme
-    df_display = st.session_state.data.copy()
-    if selected_groups:
-        df_display = df_display[df_display["Grup"].isin(selected_groups)]
-    if selected_types:
-        df_display = df_display[df_display["Tür"].isin(selected_types)]
-    if selected_statuses:
-        df_display = df_display[df_display["Durum"].isin(selected_statuses)]
+    # Filtreleme (kategori kodları üzerinden; tam kopya alınmaz)
+    df_base = st.session_state.data
+    if dedup_policy:
+        df_base = dedup.deduplicate(df_base, dedup_policy, _dedup_labels(df_base))
+    df_display = channel_store.filter_frame(
+        df_base,
+        groups=selected_groups,
+        types=selected_types,
+        statuses=selected_statuses,
+        regions=selected_regions,
+        sources=selected_sources,
+    )
 
     st.markdown(
         f"""
@@ -510,10 +743,9 @@ if not st.session_state.data.empty:
     )
     search_term = st.text_input("🔍 Kanal Ara:", "", placeholder="Kanal adı veya grup yazın...")
     if search_term:
-        df_display = df_display[
-            _safe_contains(df_display["Kanal Adı"], search_term)
-            | _safe_contains(df_display["Grup"], search_term)
-        ]
+        data = st.session_state.data
+        hits = _search_index(data).mask(search_term)
+        df_display = df_display[hits[data.index.get_indexer(df_display.index)]]
 
     status_counts = _status_counts(df_display)
     group_count = df_display["Grup"].nunique()
@@ -532,6 +764,10 @@ if not st.session_state.data.empty:
     active_filters.extend(f"Grup: {value}" for value in selected_groups)
     active_filters.extend(f"Tür: {value}" for value in selected_types)
     active_filters.extend(f"Durum: {value}" for value in selected_statuses)
+    active_filters.extend(f"Bölge: {value}" for value in selected_regions)
+    active_filters.extend(f"Kaynak: {value}" for value in selected_sources)
+    if dedup_policy:
+        active_filters.append(f"Yinelenenler: {dedup_choice}")
     summary_text = " • ".join(active_filters) if active_filters else "Tüm kanallar gösteriliyor"
     st.markdown(
         f"<div class='simple-strip'><strong>Filtreler</strong><span>{html.escape(summary_text)}</span></div>",
@@ -541,24 +777,33 @@ if not st.session_state.data.empty:
     st.markdown("### İşlemler")
 
     # --- İşlemler ---
-    m3u_out = convert_df_to_m3u(df_display)
+    # Liste her rerun'da değil, yalnızca istendiğinde ve filtre durumu değiştiyse üretilir
+    export_key = export_fingerprint(
+        st.session_state.data_version, selected_groups, selected_types, selected_statuses, selected_regions,
+        selected_sources, dedup_policy, search_term,
+    )
     act1, act2, act3 = st.columns(3)
     with act1:
-        st.download_button(
-            label=f"📥 M3U İndir ({len(df_display)})",
-            data=m3u_out,
-            file_name="iptv_listesi.m3u",
-            mime="text/plain",
-            type="primary",
-            use_container_width=True,
-        )
+        if _export_ready(export_key):
+            with open(get_proxy_server().playlist_file, "rb") as playlist_fp:
+                st.download_button(
+                    label=f"📥 M3U İndir ({len(df_display)})",
+                    data=playlist_fp,
+                    file_name="iptv_listesi.m3u",
+                    mime="text/plain",
+                    type="primary",
+                    use_container_width=True,
+                )
+        elif st.button(f"📦 M3U Hazırla ({len(df_display)})", type="primary", use_container_width=True):
+            with st.spinner("Liste hazırlanıyor..."):
+                _prepare_export(df_display, export_key)
+            st.rerun()
     with act2:
         if st.button("🔗 M3U Link Oluştur", use_container_width=True):
             with st.spinner("Link oluşturuluyor..."):
-                # 🆕 Yerel proxy sunucusuna M3U içeriğini kaydet (Eski cache kalıntılarından ötürü hata almamak için korumalı çağrı yapıyoruz)
+                # 🆕 Yerel proxy sunucusunun çalma listesi dosyasına doğrudan yaz (değişmediyse yeniden üretilmez)
+                playlist_path = _prepare_export(df_display, export_key)
                 proxy_server = get_proxy_server()
-                if hasattr(proxy_server, "set_m3u_content"):
-                    proxy_server.set_m3u_content(m3u_out)
                 
                 # Yerel ağ IP adresini bul
                 import socket
@@ -579,61 +824,54 @@ if not st.session_state.data.empty:
                 st.session_state.m3u_network_link = f"http://{local_ip}:{proxy_server.port}/playlist.m3u"
 
                 # 🆕 Bulut/Dış Cihazlar için link oluştur (Engelsiz termbin.com altyapısı ile)
+                with open(playlist_path, encoding="utf-8") as playlist_fp:
+                    m3u_content = playlist_fp.read()
                 st.session_state.m3u_cloud_link = network_utils.create_m3u_link(
-                    m3u_out,
+                    m3u_content,
                     user_agent=USER_AGENT,
                     disable_ssl_verify=DISABLE_SSL_VERIFY,
                 )
             st.success("✅ Linkler başarıyla oluşturuldu!")
     with act3:
+        probe_tier = st.selectbox(
+            "Yoklama türü",
+            list(HEALTH_TIER_LABELS),
+            index=list(HEALTH_TIER_LABELS).index(HEALTH_CHECK_TIER) if HEALTH_CHECK_TIER in HEALTH_TIER_LABELS else 1,
+            format_func=HEALTH_TIER_LABELS.get,
+            help="Bağlantı: yalnızca sunucu erişilebilir mi (en hızlı, rtmp/rtsp/udp dahil). "
+            "HTTP: HEAD isteği. Derin HLS: liste ve ilk segment indirilerek oynatılabilirlik, "
+            "ilk bayt süresi, hız ve çözünürlük ölçülür (en yavaş).",
+        )
+        escalate = probe_tier != "connect" and st.checkbox(
+            "Önce bağlantı kontrolü",
+            value=HEALTH_CHECK_ESCALATE,
+            help="Her sunucuya bir kez bağlanılır; yalnızca bağlantı kabul eden sunuculardaki kanallar HTTP ile yoklanır.",
+        )
         if st.button("🔍 Sağlık Kontrolü", use_container_width=True):
-            max_health_channels = HEALTH_CHECK_MAX_CHANNELS if HEALTH_CHECK_MAX_CHANNELS > 0 else len(df_display)
-            urls = df_display["URL"].head(max_health_channels).tolist()
-            total = len(urls)
-            if len(df_display) > total:
-                st.info(f"Sağlık kontrolü ilk {total} kanal ile sınırlandı.")
-
-            progress_bar = st.progress(0, text=f"🔍 Taranıyor... 0/{total}")
-            status_text = st.empty()
-            start_time = time.time()
-
-            def update_progress(completed, total_count):
-                pct = completed / total_count
-                elapsed = time.time() - start_time
-                speed = completed / elapsed if elapsed > 0 else 0
-                remaining = (total_count - completed) / speed if speed > 0 else 0
-                progress_bar.progress(
-                    pct, 
-                    text=f"🔍 {completed}/{total_count} — {pct:.0%} | ⏱️ ~{remaining:.0f}s kaldı"
-                )
-
-            results = batch_check_health(
-                urls, 
-                max_workers=HEALTH_CHECK_MAX_WORKERS,
+            # Öncelik: görünen satırlar, sonra hiç kontrol edilmemiş, sonra en eski kontrol edilmiş URL'ler
+            sweep = plan_health_sweep(
+                st.session_state.data["URL"].tolist(),
+                visible=df_display["URL"].tolist(),
+                store=get_health_store(),
+                limit=HEALTH_CHECK_MAX_CHANNELS,
+                deadline=HEALTH_CHECK_DEADLINE,
+                max_workers=_health_workers(probe_tier, escalate),
                 timeout=HEALTH_CHECK_TIMEOUT,
                 user_agent=USER_AGENT,
-                progress_callback=update_progress
+                engine=HEALTH_CHECK_ENGINE,
+                tier=probe_tier,
+                escalate=escalate,
             )
+            if sweep.skipped:
+                st.info(f"Sağlık kontrolü öncelikli {len(sweep.urls)} kanal ile sınırlandı.")
 
-            elapsed = round(time.time() - start_time, 1)
-
-            # Sonuçları ana veriye yaz
-            for i, u in enumerate(urls):
-                st.session_state.data.loc[st.session_state.data["URL"] == u, "Durum"] = results[i]
+            # Tarama arka planda sürer; rerun veya başka etkileşimler onu kesmez
+            get_health_jobs().release(st.session_state.get("health_job"))
+            st.session_state.health_job = get_health_jobs().submit(sweep.urls, **sweep.options)
+            st.session_state.health_job_summary = None
+            st.session_state.health_job_cursor = 0
 
-            # İstatistik göster
-            aktif = sum(1 for r in results if "✅" in r)
-            oldu = sum(1 for r in results if "❌" in r)
-            diger = total - aktif - oldu
-
-            progress_bar.empty()
-            status_text.empty()
-            st.success(
-                f"✅ Tamamlandı ({elapsed}s) — "
-                f"🟢 {aktif} aktif | 🔴 {oldu} ölü | 🟡 {diger} belirsiz"
-            )
-            time.sleep(1.5)
-            st.rerun()
+    health_job_panel()
 
     if st.session_state.get("m3u_local_link"):
         st.markdown("### 🔗 M3U Çalma Listesi Linkleri")
@@ -665,28 +903,24 @@ if not st.session_state.data.empty:
     # --- Canlı Oynatıcı ---
     st.markdown("### 🎬 Canlı Oynatıcı")
 
-    play_options = []      # display name listesi
-    play_url_map = {}      # display_name → {name, url, logo, group, durum}
-
-    for idx, row in df_display.iterrows():
-        durum = row.get("Durum", "❔").split(" ")[0] if "Durum" in row else "❔"
-        base_name = f"{durum} {row['Kanal Adı']}"
-
-        # ✅ Duplicate isim varsa sayaç ekle
-        display_name = base_name
-        counter = 2
-        while display_name in play_url_map:
-            display_name = f"{base_name} ({counter})"
-            counter += 1
-
-        play_options.append(display_name)
-        play_url_map[display_name] = {
-            "name": row["Kanal Adı"],
-            "url": row["URL"],
-            "logo": row.get("LogoURL", ""),
-            "group": row.get("Grup", ""),
-            "durum": row.get("Durum", ""),
-        }
+    # display name listesi ve display_name → {name, url, logo, group, durum} eşlemesi
+    statuses = df_display["Durum"].astype(str) if "Durum" in df_display.columns else pd.Series("❔", index=df_display.index)
+    base_names = statuses.str.split(" ", n=1).str[0] + " " + df_display["Kanal Adı"].astype(str)
+
+    # ✅ Duplicate isim varsa sayaç ekle: "Ad", "Ad (2)", "Ad (3)" ...
+    occurrence = base_names.groupby(base_names, sort=False).cumcount()
+    play_options = base_names.where(occurrence == 0, base_names + " (" + (occurrence + 1).astype(str) + ")").tolist()
+    play_url_map = {
+        display_name: {"name": name, "url": url, "logo": logo, "group": group, "durum": durum}
+        for display_name, name, url, logo, group, durum in zip(
+            play_options,
+            df_display["Kanal Adı"].tolist(),
+            df_display["URL"].tolist(),
+            df_display["LogoURL"].tolist() if "LogoURL" in df_display.columns else [""] * len(df_display),
+            df_display["Grup"].astype(str).tolist(),
+            statuses.tolist(),
+        )
+    }
 
     # ✅ FIX: Selectbox doğru index ile — rerun sonrası seçim korunuyor
     current_play = st.session_state.get("play_channel")
@@ -763,7 +997,10 @@ if not st.session_state.data.empty:
 
     # --- Kanal Tablosu ---
     st.markdown("### Kanal Tablosu")
-    display_cols = [c for c in ["Durum", "Grup", "Kanal Adı", "URL", "Tür"] if c in df_display.columns]
+    display_cols = [
+        c for c in ["Durum", "Grup", "Kanal Adı", "URL", "Alternatifler", "Tür", *channel_store.PROBE_COLUMNS]
+        if c in df_display.columns
+    ]
     table_df = df_display[display_cols] if display_cols else df_display
 
     # Pandas Styler (.style) binlerce satırda devasa RAM tüketir ve Streamlit'in
@@ -776,8 +1013,15 @@ if not st.session_state.data.empty:
         height=TABLE_HEIGHT,
         column_config={
             "URL": st.column_config.TextColumn("URL", width="large"),
+            "Alternatifler": st.column_config.ListColumn(
+                "Alternatifler", help="Birleştirilen yinelenen kanalların URL'leri; dışa aktarımda ayrı kayıt olarak yazılır"
+            ),
             "Tür": st.column_config.TextColumn("Tür", width="small"),
             "Durum": st.column_config.TextColumn("Durum", width="small"),
+            "TTFB (ms)": st.column_config.NumberColumn("TTFB (ms)", format="%d", width="small"),
+            "Hız (kbit/s)": st.column_config.NumberColumn("Hız (kbit/s)", format="%d", width="small"),
+            "Bant Genişliği (kbit/s)": st.column_config.NumberColumn("Bant Genişliği (kbit/s)", format="%d", width="small"),
+            "Çözünürlük": st.column_config.TextColumn("Çözünürlük", width="small"),
         },
     )
 
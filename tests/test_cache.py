@@ -0,0 +1,75 @@
+import os
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from utils import parser as parser_utils
+from utils.cache import PlaylistCache
+
+SAMPLE = (
+    "#EXTM3U\n"
+    '#EXTINF:-1 tvg-id="a" group-title="TR | Spor",Spor 1\n'
+    "#EXTVLCOPT:http-user-agent=VLC\n"
+    "http://example.com/1.m3u8\n"
+    '#EXTINF:-1 group-title="UK | News",News\n'
+    "http://example.com/2.mpd\n"
+).encode("utf-8")
+
+
+def test_cache_round_trip_preserves_columns(tmp_path):
+    cache = PlaylistCache(directory=str(tmp_path))
+    df = parser_utils.parse_m3u_bytes(SAMPLE)
+    assert cache.put("key", df)
+
+    loaded = cache.get("key")
+    assert loaded.columns.tolist() == df.columns.tolist()
+    # Sıcak yükleme taze parse ile aynı dtype'ları verir (metin sütunları nesneye dönmez)
+    assert loaded.dtypes.to_dict() == df.dtypes.to_dict()
+    assert isinstance(loaded["Grup"].dtype, pd.CategoricalDtype)
+    assert loaded["Kanal Adı"].tolist() == ["Spor 1", "News"]
+    assert loaded["Seçenekler"].tolist() == [["#EXTVLCOPT:http-user-agent=VLC"], None]
+    assert parser_utils.write_m3u(loaded) == parser_utils.write_m3u(df)
+
+
+def test_cache_expires_after_ttl(tmp_path):
+    cache = PlaylistCache(directory=str(tmp_path), ttl=60)
+    cache.put("key", parser_utils.parse_m3u_bytes(SAMPLE))
+    path = cache._path("key")
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert cache.get("key") is None
+    assert not os.path.exists(path)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    df = parser_utils.parse_m3u_bytes(SAMPLE)
+    cache = PlaylistCache(directory=str(tmp_path))
+    cache.put("probe", df)
+    entry_size = os.path.getsize(cache._path("probe"))
+    cache.clear()
+
+    cache = PlaylistCache(directory=str(tmp_path), max_bytes=entry_size * 2)
+    cache.put("a", df)
+    cache.put("b", df)
+    now = time.time()
+    os.utime(cache._path("a"), (now - 50, now))
+    os.utime(cache._path("b"), (now - 100, now))
+    cache.put("c", df)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_load_channel_frame_uses_cache_for_identical_upload(tmp_path):
+    cache = PlaylistCache(directory=str(tmp_path))
+    first = parser_utils.load_channel_frame(memoryview(SAMPLE), cache=cache)
+
+    with patch.object(parser_utils, "_load_frame", side_effect=AssertionError("parsed again")):
+        second = parser_utils.load_channel_frame(bytearray(SAMPLE), cache=cache)
+        assert len(parser_utils.load_channel_frame(SAMPLE, only_tr=False, cache=cache)) == 2
+
+    assert second["URL"].tolist() == first["URL"].tolist()
+    assert len(parser_utils.load_channel_frame(SAMPLE, only_tr=True, cache=cache)) == 1
@@ -0,0 +1,49 @@
+import re
+
+import pandas as pd
+
+from utils import parser as parser_utils
+from utils.classifier import REGION_OTHER, RegionClassifier, keyword_pattern
+
+
+def test_keyword_pattern_respects_word_boundaries():
+    pattern = keyword_pattern(["TR", "TURK", "TURKIYE"], re.IGNORECASE)
+    for text in ["tr | spor", "[tr] haber", "kanal_tr_hd", "(tr)", "tr:ulusal", "turkiye"]:
+        assert pattern.search(text), text
+    for text in ["trt 1", "4tr", "turkcell", "str"]:
+        assert not pattern.search(text), text
+
+
+def test_classifier_folds_turkish_letters_and_prefers_group():
+    classifier = RegionClassifier({"TR": ["TÜRKİYE", "ISTANBUL"], "DE": ["DE", "GERMANY"]})
+    assert classifier.classify("Türkiye Ulusal", "Kanal") == "TR"
+    assert classifier.classify("TÜRKIYE", "") == "TR"
+    assert classifier.classify("", "İstanbul TV") == "TR"
+    assert classifier.classify("DE | News", "Istanbul Haber") == "DE"
+    assert classifier.classify("Movies", "Action") == REGION_OTHER
+
+
+def test_match_many_agrees_with_match():
+    import pyarrow as pa
+
+    classifier = RegionClassifier({"TR": ["TR", "TÜRKİYE"], "DE": ["DE"]})
+    texts = ["TR | Spor", "trt 1", "Kanal_tr_hd", "türkıye", "DE tr", "4TR", "", "TÜRKİYE HD", "Haber"]
+    expected = [classifier.match(text) for text in texts]
+    assert classifier.match_many(pa.array(texts)).tolist() == expected
+    assert classifier.match_many(texts).tolist() == expected
+
+
+def test_build_channel_frame_tags_region_column():
+    lines = [
+        "#EXTM3U",
+        '#EXTINF:-1 group-title="TR | Spor",Spor 1',
+        "http://example.com/1.m3u8",
+        '#EXTINF:-1 group-title="UK | News",News',
+        "http://example.com/2.m3u8",
+    ]
+    df = parser_utils.build_channel_frame(parser_utils._iter_records(lines))
+    assert isinstance(df["Bölge"].dtype, pd.CategoricalDtype)
+    assert df["Bölge"].tolist() == ["TR", REGION_OTHER]
+
+    only_tr = parser_utils.build_channel_frame(parser_utils._iter_records(lines), only_tr=True)
+    assert only_tr["Kanal Adı"].tolist() == ["Spor 1"]
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from utils import dedup
+from utils.parser import write_m3u
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["Kanal Adı", "URL", "Durum"])
+
+
+def test_normalize_name_strips_prefix_and_quality():
+    keys = {dedup.normalize_name(name) for name in ["TRT 1 HD", "TR: TRT1", "TRT 1 FHD", "[TR] trt 1", "TRT 1 (1080p)"]}
+    assert keys == {"trt1"}
+    assert dedup.normalize_name("HD") == "hd"
+
+
+def test_normalize_url_drops_tracking_params():
+    assert dedup.normalize_url("HTTP://Host.com/Live/1.m3u8?utm_source=x&token=5#frag") == "http://host.com/Live/1.m3u8?token=5"
+    assert dedup.normalize_url("http://host.com/a?_=123") == "http://host.com/a"
+
+
+def test_cluster_labels_links_names_and_urls_transitively():
+    df = _frame([
+        ("TRT 1 HD", "http://a/1", "❔ Bekliyor"),
+        ("Spor", "http://a/2", "❔ Bekliyor"),
+        ("TR: TRT1", "http://b/1", "❔ Bekliyor"),
+        ("TRT 1 Yedek Link", "http://b/1?utm_medium=x", "❔ Bekliyor"),
+        ("Haber", "http://a/3", "❔ Bekliyor"),
+    ])
+    assert dedup.cluster_labels(df).tolist() == [0, 1, 0, 0, 4]
+
+
+def test_deduplicate_policies():
+    df = _frame([
+        ("TRT 1 HD", "http://a/1", "❌ Hata"),
+        ("TRT 1", "http://b/1", "✅ Aktif"),
+        ("Spor", "http://a/2", "❔ Bekliyor"),
+    ])
+    assert dedup.deduplicate(df, dedup.KEEP_FIRST)["URL"].tolist() == ["http://a/1", "http://a/2"]
+    assert dedup.deduplicate(df, dedup.KEEP_HEALTHIEST)["URL"].tolist() == ["http://b/1", "http://a/2"]
+
+    merged = dedup.deduplicate(df, dedup.MERGE)
+    assert merged["URL"].tolist() == ["http://b/1", "http://a/2"]
+    assert merged["Alternatifler"].tolist() == [["http://a/1"], None]
+
+    with pytest.raises(ValueError):
+        dedup.deduplicate(df, "unknown")
+
+
+def test_merged_alternates_are_exported_as_extra_entries():
+    df = _frame([
+        ("TRT 1 HD", "http://a/1", "❌ Hata"),
+        ("TRT 1", "http://b/1", "✅ Aktif"),
+        ("TRT1", "http://c/1", "❔ Bekliyor"),
+        ("Spor", "http://a/2", "❔ Bekliyor"),
+    ])
+    df["Grup"] = "Ulusal"
+    merged = dedup.deduplicate(df, dedup.MERGE)
+
+    text = write_m3u(merged).decode("utf-8")
+    assert text.splitlines() == [
+        "#EXTM3U",
+        '#EXTINF:-1 group-title="Ulusal",TRT 1',
+        "http://b/1",
+        '#EXTINF:-1 group-title="Ulusal",TRT 1',
+        "http://a/1",
+        '#EXTINF:-1 group-title="Ulusal",TRT 1',
+        "http://c/1",
+        '#EXTINF:-1 group-title="Ulusal",Spor',
+        "http://a/2",
+    ]
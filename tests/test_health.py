@@ -0,0 +1,550 @@
+import asyncio
+import http.server
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+import time
+
+import pytest
+
+from utils import health
+from utils import parser as parser_utils
+
+
+class StatusHandler(http.server.BaseHTTPRequestHandler):
+    """``/<kod>`` yolları o HTTP kodunu, ``/html`` web sayfası, ``/nohead`` HEAD için 405 döndürür."""
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, head_only):
+        path = self.path.split("?")[0].strip("/")
+        if path == "nohead" and head_only:
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if path == "moved":
+            self.send_response(302)
+            self.send_header("Location", "/200")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        code = int(path) if path.isdigit() else 200
+        body = b"#EXTM3U\n"
+        self.send_response(code)
+        self.send_header("Content-Type", "text/html" if path == "html" else "application/vnd.apple.mpegurl")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(head_only=True)
+
+    def do_GET(self):
+        self._respond(head_only=False)
+
+
+@pytest.fixture
+def status_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_async_engine_matches_thread_engine(status_server):
+    urls = [f"{status_server}/{path}" for path in ("200", "html", "403", "404", "401", "500", "nohead", "moved")]
+    urls += [f"http://127.0.0.1:{_closed_port()}/x.m3u8", "rtmp://example.com/live", ""]
+
+    threaded = [parser_utils._check_single_url(url, timeout=2) for url in urls]
+    probes = health.check_urls(urls, concurrency=4, timeout=2)
+
+    assert [probe.status for probe in probes] == threaded
+    assert probes[0] == (health.STATUS_ACTIVE, 200, probes[0].latency)
+    assert probes[-1].status == health.STATUS_INVALID
+
+
+def test_probe_times_out_on_silent_server():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        url = f"http://127.0.0.1:{listener.getsockname()[1]}/live.m3u8"
+        [probe] = health.check_urls([url], timeout=0.2)
+
+    assert probe.status == health.STATUS_TIMEOUT
+
+
+def test_batch_check_health_async_engine_reports_progress(status_server):
+    urls = [f"{status_server}/200?n={i}" for i in range(20)]
+    progress_calls = []
+
+    results = parser_utils.batch_check_health(
+        urls,
+        max_workers=8,
+        timeout=2,
+        progress_callback=lambda completed, total: progress_calls.append((completed, total)),
+        engine="async",
+    )
+
+    assert results == [health.STATUS_ACTIVE] * 20
+    assert progress_calls[-1] == (20, 20)
+
+
+class KeepAliveHandler(StatusHandler):
+    protocol_version = "HTTP/1.1"
+
+
+def _serve(handler, ssl_context=None):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    if ssl_context is not None:
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _check_with_pool(urls, pool, **options):
+    try:
+        return await health.check_urls_async(urls, pool=pool, **options)
+    finally:
+        pool.close()
+
+
+def test_connection_pool_reuses_keep_alive_connections():
+    server = _serve(KeepAliveHandler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/200?n={i}" for i in range(30)] + [f"{base}/nohead", f"{base}/404"]
+    pool = health.ConnectionPool(max_per_host=2)
+    try:
+        probes = asyncio.run(_check_with_pool(urls, pool, concurrency=2, host_rate=0, timeout=2))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [probe.status for probe in probes] == [health.STATUS_ACTIVE] * 31 + [health.STATUS_NOT_FOUND]
+    assert pool.stats["opened"] <= 4
+    assert pool.stats["reused"] >= 28
+
+
+def test_connection_pool_resumes_tls_sessions(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl bulunamadı")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+         "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+    server = _serve(StatusHandler, server_context)
+    # HTTP/1.0 sunucu her yanıttan sonra bağlantıyı kapatır: her yoklama yeni TLS bağlantısı açar
+    urls = [f"https://127.0.0.1:{server.server_address[1]}/200?n={i}" for i in range(5)]
+    pool = health.ConnectionPool()
+    try:
+        probes = asyncio.run(_check_with_pool(urls, pool, concurrency=1, timeout=2))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [probe.status for probe in probes] == [health.STATUS_ACTIVE] * 5
+    assert pool.stats["opened"] == 5
+    assert pool.stats["tls_resumed"] >= 3
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    """İstekleri Host başlığına göre sayar ve host başına en yüksek eşzamanlılığı kaydeder."""
+
+    lock = threading.Lock()
+    active: dict = {}
+    peak: dict = {}
+    paths: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        host = self.headers["Host"].split(":")[0]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            self.paths.append(self.path)
+        time.sleep(0.05)
+        with self.lock:
+            self.active[host] -= 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def test_scheduler_interleaves_hosts_round_robin():
+    urls = ["http://a/1", "http://a/2", "http://a/3", "http://b/1", "http://b/2", "http://a/1"]
+
+    async def take(count):
+        scheduler = health.HostScheduler(urls, per_host=2, rate=0)
+        return [(await scheduler.next())[1] for _ in range(count)], scheduler
+
+    order, scheduler = asyncio.run(take(4))
+    assert order == ["http://a/1", "http://b/1", "http://a/2", "http://b/2"]
+    assert scheduler.row_ids == [0, 1, 2, 3, 4, 0]
+    assert scheduler.multiplicity[0] == 2
+
+
+def test_check_urls_caps_per_host_concurrency_and_dedups():
+    CountingHandler.active, CountingHandler.peak, CountingHandler.paths = {}, {}, []
+    server = _serve(CountingHandler)
+    port = server.server_address[1]
+    urls = [f"http://{host}:{port}/{i}" for i in range(12) for host in ("127.0.0.1", "localhost")]
+    urls += urls[:6]
+    try:
+        # Yedek istekler kapalı: her benzersiz URL tam bir istek almalı
+        breaker = health.CircuitBreaker(timeout=2, hedge_ratio=0)
+        probes = health.check_urls(urls, concurrency=20, per_host=3, host_rate=0, timeout=2, breaker=breaker)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [probe.status for probe in probes] == [health.STATUS_ACTIVE] * len(urls)
+    assert len(CountingHandler.paths) == 24
+    assert max(CountingHandler.peak.values()) <= 3
+    assert set(CountingHandler.peak) == {"127.0.0.1", "localhost"}
+
+
+def test_scheduler_enforces_per_host_rate():
+    urls = [f"http://a/{i}" for i in range(6)]
+
+    async def drain():
+        scheduler = health.HostScheduler(urls, per_host=0, rate=50)
+        start = asyncio.get_running_loop().time()
+        while (item := await scheduler.next()) is not None:
+            scheduler.done(item[2])
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(drain()) >= 5 / 50 - 0.01
+
+
+def test_dns_is_resolved_once_per_host_and_dead_hosts_are_not_probed(status_server):
+    port = status_server.rsplit(":", 1)[1]
+    lookups = []
+
+    def fake_getaddrinfo(host):
+        lookups.append(host)
+        if host == "dead.invalid":
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return ["127.0.0.1"]
+
+    dns = health.DNSCache(ttl=60)
+    dns._getaddrinfo = fake_getaddrinfo
+    urls = [f"http://panel.test:{port}/200?n={i}" for i in range(10)] + [f"http://dead.invalid/{i}" for i in range(3)]
+
+    first = health.check_urls(urls, concurrency=4, timeout=2, host_rate=0, dns=dns)
+    second = health.check_urls(urls[:2], timeout=2, host_rate=0, dns=dns)
+
+    assert [probe.status for probe in first] == [health.STATUS_ACTIVE] * 10 + [health.STATUS_DNS] * 3
+    assert first[-1].code is None
+    assert [probe.status for probe in second] == [health.STATUS_ACTIVE] * 2
+    assert sorted(lookups) == ["dead.invalid", "panel.test"]
+
+
+def test_dns_prefetch_timeout_does_not_poison_queued_lookups(status_server):
+    port = status_server.rsplit(":", 1)[1]
+
+    def slow_getaddrinfo(host):
+        time.sleep(0.3)
+        return ["127.0.0.1"]
+
+    # Tek çözümleme iş parçacığı: host'ların çoğu ön çözümleme süresi dolarken kuyrukta bekler
+    dns = health.DNSCache(ttl=60, workers=1)
+    dns._getaddrinfo = slow_getaddrinfo
+    urls = [f"http://slow{i}.test:{port}/200" for i in range(4)]
+
+    first = health.check_urls(urls, timeout=0.2, host_rate=0, dns=dns)
+    second = health.check_urls(urls, timeout=2, host_rate=0, dns=dns)
+
+    assert all(probe.status != health.STATUS_DNS for probe in first)
+    assert [probe.status for probe in second] == [health.STATUS_ACTIVE] * 4
+    assert not dns._inflight
+
+
+class HLSHandler(http.server.BaseHTTPRequestHandler):
+    """Ana liste → varyant → segment zinciri; medya listeleri chunked gönderilir."""
+
+    protocol_version = "HTTP/1.1"
+    segment = b"\x47" * 300_000
+    playlists = {
+        "/master.m3u8": (
+            "#EXTM3U\n"
+            "#EXT-X-STREAM-INF:BANDWIDTH=2560000,RESOLUTION=1280x720\nlow/index.m3u8\n"
+            "#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080\nhigh/index.m3u8\n"
+        ),
+        "/low/index.m3u8": "#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXTINF:6.0,\nseg0.ts\n#EXTINF:6.0,\nseg1.ts\n",
+        "/empty.m3u8": "#EXTM3U\n#EXT-X-TARGETDURATION:6\n",
+        "/dead.m3u8": "#EXTM3U\n#EXTINF:6.0,\n/missing.ts\n",
+    }
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        playlist = self.playlists.get(self.path)
+        if playlist is not None:
+            body = playlist.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.apple.mpegurl")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 16):
+                piece = body[start:start + 16]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        body = self.segment if self.path.endswith("seg0.ts") else b""
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "video/mp2t")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_deep_probe_follows_master_playlist_to_first_segment():
+    server = _serve(HLSHandler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/master.m3u8", f"{base}/empty.m3u8", f"{base}/dead.m3u8", f"{base}/low/seg0.ts"]
+    try:
+        probes = health.check_urls(urls, timeout=2, host_rate=0, tier=health.TIER_GET, deep_max_bytes=64 * 1024)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    master, empty, dead, direct = probes
+    assert master.status == health.STATUS_ACTIVE
+    assert (master.bandwidth, master.resolution) == (2560, "1280x720")
+    assert master.ttfb is not None and master.ttfb <= master.latency
+    assert master.throughput > 0
+    assert empty.status == health.STATUS_EMPTY_PLAYLIST
+    assert dead.status == health.STATUS_NO_SEGMENT
+    assert direct.status == health.STATUS_ACTIVE and direct.bandwidth is None
+
+
+def test_deep_probe_respects_time_budget():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        url = f"http://127.0.0.1:{listener.getsockname()[1]}/live.m3u8"
+        start = time.perf_counter()
+        [probe] = health.check_urls([url], timeout=5, tier=health.TIER_GET, deep_budget=0.2)
+
+    assert probe.status == health.STATUS_TIMEOUT
+    assert time.perf_counter() - start < 2
+
+
+def test_connect_tier_checks_each_endpoint_once_and_covers_stream_schemes():
+    accepted = []
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        port = listener.getsockname()[1]
+
+        def accept():
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except OSError:
+                    return
+                accepted.append(conn)
+
+        threading.Thread(target=accept, daemon=True).start()
+        closed = _closed_port()
+        urls = [f"http://127.0.0.1:{port}/{i}.m3u8" for i in range(5)]
+        urls += [f"rtmp://127.0.0.1:{port}/live/a", f"rtsp://127.0.0.1:{closed}/cam", "ftp://127.0.0.1/x", "udp://@239.0.0.1"]
+        probes = health.check_urls(urls, timeout=2, host_rate=0, tier=health.TIER_CONNECT)
+        time.sleep(0.1)
+
+    assert [probe.status for probe in probes] == [health.STATUS_REACHABLE] * 6 + [
+        health.STATUS_CONNECTION,
+        health.STATUS_INVALID,
+        health.STATUS_INVALID,
+    ]
+    # http ve rtmp aynı host:port'ta olsa da şema başına bir bağlantı açılır
+    assert len(accepted) == 2
+    for conn in accepted:
+        conn.close()
+
+
+def test_connect_tier_waits_for_udp_datagram():
+    port = _closed_port()
+    stop = threading.Event()
+
+    def send():
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            while not stop.is_set():
+                sender.sendto(b"\x47" * 188, ("127.0.0.1", port))
+                time.sleep(0.02)
+
+    threading.Thread(target=send, daemon=True).start()
+    try:
+        [probe] = health.check_urls([f"udp://@:{port}"], timeout=2, tier=health.TIER_CONNECT)
+    finally:
+        stop.set()
+    [silent] = health.check_urls([f"udp://@:{_closed_port()}"], timeout=0.2, tier=health.TIER_CONNECT)
+
+    assert probe.status == health.STATUS_ACTIVE
+    assert silent.status == health.STATUS_TIMEOUT
+
+
+def test_escalation_probes_only_reachable_servers():
+    CountingHandler.active, CountingHandler.peak, CountingHandler.paths = {}, {}, []
+    server = _serve(CountingHandler)
+    alive = [f"http://127.0.0.1:{server.server_address[1]}/{i}" for i in range(4)]
+    dead = [f"http://127.0.0.1:{_closed_port()}/{i}" for i in range(3)]
+    try:
+        statuses = parser_utils.batch_check_health(alive + dead, timeout=2, escalate=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == [health.STATUS_ACTIVE] * 4 + [health.STATUS_CONNECTION] * 3
+    assert sorted(CountingHandler.paths) == ["/0", "/1", "/2", "/3"]
+
+
+def test_circuit_opens_on_dead_host_and_skips_remaining_urls():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(64)
+        urls = [f"http://127.0.0.1:{listener.getsockname()[1]}/{i}.m3u8" for i in range(40)]
+        start = time.perf_counter()
+        probes = health.check_urls(
+            urls, timeout=0.3, per_host=2, host_rate=0, breaker=health.CircuitBreaker(failures=3, timeout=0.3)
+        )
+        elapsed = time.perf_counter() - start
+
+    statuses = [probe.status for probe in probes]
+    assert set(statuses) == {health.STATUS_TIMEOUT, health.STATUS_HOST_DOWN}
+    assert statuses.count(health.STATUS_HOST_DOWN) >= 35
+    # Devre olmadan 40 URL × (HEAD + GET) × 0.3 sn / 2 ≈ 12 sn sürerdi
+    assert elapsed < 4
+
+
+def test_breaker_adapts_timeout_and_hedges_only_healthy_hosts():
+    breaker = health.CircuitBreaker(failures=5, timeout=3, hedge_ratio=0.5)
+    assert breaker.timeout("a") == 3
+    for _ in range(10):
+        breaker.record("a", health.ProbeResult(health.STATUS_NOT_FOUND, 404, 0.05))
+    assert breaker.timeout("a") == 1.0
+    assert breaker.hedge_delay("a") == 0.05
+
+    breaker.record("a", health.ProbeResult(health.STATUS_TIMEOUT))
+    assert breaker.hedge_delay("a") is None
+    assert not breaker.is_open("a")
+
+
+def test_hedge_budget_is_counted_when_hedges_start():
+    breaker = health.CircuitBreaker(timeout=3, hedge_ratio=0.5)
+    for _ in range(10):
+        breaker.record("a", health.ProbeResult(health.STATUS_ACTIVE, 200, 0.05))
+    # Dört yoklamanın gecikmesi aynı anda dolar; bütçe yalnızca ikisine yeter
+    delays = [breaker.hedge_delay("a") for _ in range(4)]
+    assert delays == [0.05] * 4
+    assert [breaker.start_hedge("a") for _ in range(4)] == [True, True, False, False]
+
+
+def test_hedged_requests_respect_per_host_limit():
+    CountingHandler.active, CountingHandler.peak, CountingHandler.paths = {}, {}, []
+    server = _serve(CountingHandler)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/{i}" for i in range(8)]
+    # Gözlenen p95 (5 ms) her yoklamadan kısa: sınır olmasa her yoklamaya yedek gönderilirdi
+    breaker = health.CircuitBreaker(timeout=2, hedge_ratio=1)
+    for _ in range(10):
+        breaker.record("127.0.0.1", health.ProbeResult(health.STATUS_ACTIVE, 200, 0.005))
+    try:
+        probes = health.check_urls(urls, concurrency=8, per_host=2, host_rate=0, timeout=2, breaker=breaker)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [probe.status for probe in probes] == [health.STATUS_ACTIVE] * 8
+    assert CountingHandler.peak["127.0.0.1"] <= 2
+
+
+class SlowFirstHandler(KeepAliveHandler):
+    """Her URL'nin ilk isteğini geciktirir; yedek istek hemen yanıt alır."""
+
+    seen: set = set()
+    lock = threading.Lock()
+
+    def do_HEAD(self):
+        with self.lock:
+            first = self.path not in self.seen
+            self.seen.add(self.path)
+        if first:
+            time.sleep(1.5)
+        super().do_HEAD()
+
+
+def test_hedged_request_rescues_slow_probe_on_healthy_host():
+    server = _serve(SlowFirstHandler)
+    url = f"http://127.0.0.1:{server.server_address[1]}/200"
+    breaker = health.CircuitBreaker(timeout=3, hedge_ratio=1)
+    for _ in range(10):
+        breaker.record("127.0.0.1", health.ProbeResult(health.STATUS_ACTIVE, 200, 0.02))
+    try:
+        start = time.perf_counter()
+        [probe] = health.check_urls([url], timeout=3, host_rate=0, breaker=breaker)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert probe.status == health.STATUS_ACTIVE
+    assert elapsed < 1
+
+
+def test_ordered_scheduler_follows_list_priority_across_hosts():
+    urls = ["http://b/1", "http://a/1", "http://a/2", "http://b/2", "http://c/1"]
+
+    async def take():
+        scheduler = health.HostScheduler(urls, per_host=2, rate=0, ordered=True)
+        return [(await scheduler.next())[1] for _ in range(len(urls))]
+
+    assert asyncio.run(take()) == urls
+
+
+class SlowHandler(KeepAliveHandler):
+    def do_HEAD(self):
+        time.sleep(0.3)
+        super().do_HEAD()
+
+
+@pytest.mark.parametrize("engine", ["async", "thread"])
+def test_deadline_returns_partial_results_and_leaves_rest_pending(engine):
+    server = _serve(SlowHandler)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/200?n={i}" for i in range(20)]
+    try:
+        start = time.perf_counter()
+        statuses = parser_utils.batch_check_health(
+            urls, max_workers=2, timeout=2, engine=engine, ordered=True, deadline=0.8
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert elapsed < 1.5
+    done = [status for status in statuses if status != health.STATUS_PENDING]
+    assert done and set(done) == {health.STATUS_ACTIVE}
+    # Öncelik sırasıyla yoklandığından tamamlananlar listenin başındadır
+    assert statuses[: len(done)] == done
+    assert len(done) < len(urls)
@@ -0,0 +1,109 @@
+import time
+
+from utils import health
+from utils import parser as parser_utils
+from utils.health_store import HealthStore
+
+
+def test_store_round_trip_and_staleness(tmp_path):
+    store = HealthStore(str(tmp_path / "health.sqlite3"), max_age=60)
+    now = time.time()
+    store.record({"http://a/1": health.ProbeResult(health.STATUS_ACTIVE, 200, 0.1)}, checked_at=now)
+    store.record({"http://a/2": health.STATUS_NOT_FOUND}, checked_at=now - 120)
+    store.record({"http://a/3": health.STATUS_PENDING})
+
+    assert store.get(["http://a/1"])["http://a/1"] == (health.STATUS_ACTIVE, 200, 0.1, now)
+    assert store.statuses(["http://a/1", "http://a/2", "http://a/3"]) == {
+        "http://a/1": health.STATUS_ACTIVE,
+        "http://a/2": health.STATUS_NOT_FOUND,
+    }
+    fresh, stale = store.split_fresh(["http://a/1", "http://a/2", "http://a/3", "http://a/1"])
+    assert fresh == {"http://a/1": health.STATUS_ACTIVE}
+    assert stale == ["http://a/2", "http://a/3"]
+    store.close()
+
+    # Kayıtlar yeni bir bağlantıda (başka süreç/oturum) da görünür
+    reopened = HealthStore(str(tmp_path / "health.sqlite3"))
+    assert set(reopened.statuses(["http://a/1", "http://a/2"])) == {"http://a/1", "http://a/2"}
+    reopened.close()
+
+
+def test_unprobed_results_are_not_stored_as_fresh(tmp_path):
+    store = HealthStore(str(tmp_path / "health.sqlite3"), max_age=60)
+    store.record({"http://a/1": health.STATUS_ACTIVE}, checked_at=time.time() - 600)
+    store.record(
+        {
+            "http://a/1": health.ProbeResult(health.STATUS_HOST_DOWN),
+            "http://a/2": health.ProbeResult(health.STATUS_HOST_DOWN),
+            "http://dead.invalid/1": health.ProbeResult(health.STATUS_DNS),
+        }
+    )
+
+    # Atlanan URL'nin önceki sonucu korunur; DNS hatası görünür ama yeniden yoklanır
+    assert store.statuses(["http://a/1", "http://a/2", "http://dead.invalid/1"]) == {
+        "http://a/1": health.STATUS_ACTIVE,
+        "http://dead.invalid/1": health.STATUS_DNS,
+    }
+    fresh, stale = store.split_fresh(["http://a/1", "http://a/2", "http://dead.invalid/1"])
+    assert fresh == {}
+    assert stale == ["http://a/1", "http://a/2", "http://dead.invalid/1"]
+    store.close()
+
+
+def test_batch_check_health_probes_only_stale_urls(tmp_path, monkeypatch):
+    probed = []
+
+    def fake_check(url, timeout=3, user_agent=None):
+        probed.append(url)
+        return health.STATUS_ACTIVE
+
+    monkeypatch.setattr(parser_utils, "_check_single_url", fake_check)
+    store = HealthStore(str(tmp_path / "health.sqlite3"), max_age=60)
+    store.record({"http://a/1": health.STATUS_NOT_FOUND})
+    urls = ["http://a/1", "http://a/2", "http://a/3", "http://a/2"]
+    progress_calls = []
+
+    results = parser_utils.batch_check_health(
+        urls,
+        max_workers=2,
+        progress_callback=lambda completed, total: progress_calls.append((completed, total)),
+        store=store,
+    )
+
+    assert results == [health.STATUS_NOT_FOUND] + [health.STATUS_ACTIVE] * 3
+    assert "http://a/1" not in probed and set(probed) == {"http://a/2", "http://a/3"}
+    assert progress_calls[-1] == (4, 4)
+
+    probed.clear()
+    assert parser_utils.batch_check_health(urls, store=store) == results
+    assert probed == []
+    store.close()
+
+
+def test_sweep_prioritizes_visible_then_unchecked_then_stalest(tmp_path, monkeypatch):
+    store = HealthStore(str(tmp_path / "health.sqlite3"), max_age=60)
+    now = time.time()
+    store.record({"http://a/old": health.STATUS_ACTIVE}, checked_at=now - 500)
+    store.record({"http://a/older": health.STATUS_ACTIVE}, checked_at=now - 900)
+    store.record({"http://a/seen": health.STATUS_ACTIVE}, checked_at=now - 100)
+    urls = ["http://a/old", "http://a/new", "http://a/older", "http://a/seen", "http://a/shown", "http://a/new"]
+
+    queue = parser_utils.prioritize_urls(urls, visible=["http://a/seen", "http://a/shown"], store=store)
+    assert queue == ["http://a/shown", "http://a/seen", "http://a/new", "http://a/older", "http://a/old"]
+
+    sweep = parser_utils.plan_health_sweep(
+        urls, visible=["http://a/seen", "http://a/shown"], store=store, limit=4, deadline=5, timeout=3
+    )
+    assert sweep.urls == queue[:4] and sweep.skipped == 1
+    assert sweep.options == {"timeout": 3, "store": store, "ordered": True, "deadline": 5}
+
+    def fake_probe(urls, **options):
+        # Süre sınırı yalnızca ilk iki URL'ye yetmiş gibi davran
+        assert options["ordered"] and 0 < options["deadline"] <= 5
+        return [health.ProbeResult(health.STATUS_NOT_FOUND)] * 2 + [health.ProbeResult(health.STATUS_PENDING)] * (len(urls) - 2)
+
+    monkeypatch.setattr(parser_utils, "_probe_urls", fake_probe)
+    results = parser_utils.batch_probe(sweep.urls, **sweep.options)
+    assert [probe.status for probe in results] == [health.STATUS_NOT_FOUND] * 2 + [health.STATUS_PENDING] * 2
+    assert parser_utils.plan_health_sweep(urls, store=store, limit=0).skipped == 0
+    store.close()
@@ -0,0 +1,47 @@
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+
+from utils import dedup, ingest
+
+
+def _write_playlist(path, names):
+    lines = ["#EXTM3U"]
+    for i, name in enumerate(names):
+        lines.append(f'#EXTINF:-1 group-title="TR | Test",{name}')
+        lines.append(f"http://{path.stem}.example/{i}.m3u8")
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return str(path)
+
+
+def test_ingest_sources_merges_in_source_order_and_reports_failures(tmp_path):
+    first = _write_playlist(tmp_path / "a.m3u", ["TRT 1 HD", "Spor"])
+    second = _write_playlist(tmp_path / "b.m3u", ["TR: TRT1", "Haber"])
+    missing = str(tmp_path / "missing.m3u")
+
+    df, reports = ingest.ingest_sources([first, missing, second])
+
+    assert df["Kanal Adı"].tolist() == ["TRT 1 HD", "Spor", "TR: TRT1", "Haber"]
+    assert isinstance(df["Kaynak"].dtype, pd.CategoricalDtype)
+    assert df["Kaynak"].tolist() == ["1. a.m3u", "1. a.m3u", "3. b.m3u", "3. b.m3u"]
+    assert [report["channels"] for report in reports] == [2, 0, 2]
+    assert reports[1]["error"] is not None and reports[0]["error"] is None
+
+    deduped, _ = ingest.ingest_sources([first, second], dedup_policy=dedup.KEEP_FIRST)
+    assert deduped["Kanal Adı"].tolist() == ["TRT 1 HD", "Spor", "Haber"]
+
+
+def test_ingest_sources_downloads_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_load(source, **kwargs):
+        # Kaynaklar sırayla yüklenseydi bariyer zaman aşımına uğrardı
+        barrier.wait()
+        return pd.DataFrame({"Kanal Adı": [source], "URL": [f"http://{source}"]})
+
+    with patch.object(ingest, "load_channel_frame", side_effect=fake_load):
+        df, reports = ingest.ingest_sources(["x", "y"], labels=["X", "Y"], max_workers=2)
+
+    assert [report["error"] for report in reports] == [None, None]
+    assert df["Kaynak"].tolist() == ["X", "Y"]
@@ -0,0 +1,130 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from utils import health
+from utils import jobs
+from utils import parser as parser_utils
+from utils.health_store import HealthStore
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def slow_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _wait(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_job_streams_results_and_can_be_paused_and_resumed(slow_server, tmp_path):
+    manager = jobs.HealthJobManager()
+    urls = [f"{slow_server}/{i}" for i in range(40)]
+    store = HealthStore(str(tmp_path / "health.sqlite3"))
+    try:
+        job_id = manager.submit(urls, max_workers=2, timeout=2, engine="async", store=store)
+        assert manager.submit(urls, max_workers=2, timeout=2, engine="async", store=store) == job_id
+        job = manager.get(job_id)
+
+        _wait(lambda: job.progress[0] >= 4)
+        assert manager.pause(job_id)
+        assert job.state == jobs.JOB_PAUSED
+        time.sleep(0.3)
+        paused_at = job.progress[0]
+        time.sleep(0.3)
+        assert job.progress[0] == paused_at < 40
+
+        partial, cursor = job.results_since(0)
+        assert 0 < len(partial) == cursor < 40
+
+        manager.resume(job_id)
+        _wait(lambda: not job.active)
+        rest, _ = job.results_since(cursor)
+        assert job.state == jobs.JOB_DONE
+        assert set(partial) | set(rest) == set(urls)
+        assert set(store.statuses(urls).values()) == {health.STATUS_ACTIVE}
+    finally:
+        manager.shutdown()
+        store.close()
+
+
+def test_cancelled_job_keeps_partial_results(slow_server):
+    manager = jobs.HealthJobManager()
+    urls = [f"{slow_server}/{i}" for i in range(200)]
+    try:
+        job_id = manager.submit(urls, max_workers=2, timeout=2, engine="async")
+        job = manager.get(job_id)
+        _wait(lambda: job.progress[0] >= 2)
+        assert manager.cancel(job_id)
+        _wait(lambda: not job.active)
+    finally:
+        manager.shutdown()
+
+    results, _ = job.results_since(0)
+    assert job.state == jobs.JOB_CANCELLED
+    assert 0 < len(results) < 200
+    assert not manager.cancel(job_id)
+
+
+def test_released_finished_jobs_are_dropped(slow_server):
+    manager = jobs.HealthJobManager()
+    urls = [f"{slow_server}/{i}" for i in range(5)]
+    try:
+        job_id = manager.submit(urls, max_workers=2, timeout=2, engine="async")
+        # İkinci oturum aynı işe bağlanır
+        assert manager.submit(urls, max_workers=2, timeout=2, engine="async") == job_id
+        job = manager.get(job_id)
+        _wait(lambda: not job.active)
+
+        manager.release(job_id)
+        assert manager.get(job_id) is job
+        manager.release(job_id)
+        assert manager.get(job_id) is None
+
+        # Süren iş bırakılsa da bitene kadar tutulur, sonraki temizlikte silinir
+        other = manager.submit(urls[:2], max_workers=2, timeout=2, engine="async")
+        manager.release(other)
+        assert manager.get(other) is not None
+        _wait(lambda: not any(j.active for j in manager.jobs()))
+        manager.release(None)
+        assert manager.jobs() == []
+    finally:
+        manager.shutdown()
+
+
+@pytest.mark.parametrize("engine", ["async", "thread"])
+def test_paused_sweep_ends_at_deadline_without_leaking_workers(slow_server, engine):
+    control = health.SweepControl()
+    control.pause()
+    urls = [f"{slow_server}/{i}" for i in range(10)]
+    before = threading.active_count()
+
+    start = time.monotonic()
+    probes = parser_utils.batch_probe(urls, max_workers=4, timeout=2, engine=engine, control=control, deadline=0.3)
+
+    assert time.monotonic() - start < 2
+    assert {probe.status for probe in probes} == {health.STATUS_PENDING}
+    # Duraklatmada bekleyen işçiler süre sınırında uyanıp çıkar
+    _wait(lambda: threading.active_count() <= before, timeout=2)
@@ -1,5 +1,14 @@
+import gzip
+import hashlib
+import http.server
+import threading
+import time
+import urllib.error
+import zlib
 from unittest.mock import patch
 
+import pytest
+
 from utils import network
 
 
@@ -52,3 +61,277 @@ def test_create_m3u_link_falls_back_to_dpaste():
         )
 
     assert link == "https://dpaste.com/abcd.txt"
+
+
+class ChunkedResponse(MockResponse):
+    def __init__(self, payload: bytes, headers: dict | None = None):
+        super().__init__(payload)
+        self._offset = 0
+        self._headers = headers or {}
+
+    def getheader(self, name, default=None):
+        return self._headers.get(name, default)
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self.payload) - self._offset
+        chunk = self.payload[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+
+def test_iter_byte_lines_splits_across_chunk_boundaries():
+    chunks = [b"#EXTM3U\n#EXTI", b"NF:-1,A\nhttp://a", b".com/1\n"]
+    lines = list(network.iter_byte_lines(chunks, max_bytes=1024))
+    assert lines == [b"#EXTM3U", b"#EXTINF:-1,A", b"http://a.com/1"]
+
+
+def test_iter_byte_lines_enforces_size_limit():
+    with pytest.raises(ValueError):
+        list(network.iter_byte_lines([b"x" * 10, b"y" * 10], max_bytes=15))
+
+
+def test_iter_m3u_source_streams_lines_in_chunks():
+    payload = b"#EXTM3U\n#EXTINF:-1,Kanal\nhttp://example.com/live.m3u8\n"
+    response = ChunkedResponse(payload)
+
+    with patch("urllib.request.urlopen", return_value=response):
+        lines = list(
+            network.iter_m3u_source(
+                "http://example.com/list.m3u",
+                user_agent="TestAgent",
+                timeout=5,
+                disable_ssl_verify=True,
+                chunk_size=7,
+            )
+        )
+
+    assert lines == [b"#EXTM3U", b"#EXTINF:-1,Kanal", b"http://example.com/live.m3u8"]
+
+
+def test_iter_m3u_source_rejects_large_content_length():
+    response = ChunkedResponse(b"", headers={"Content-Length": str(10 * 1024 * 1024 * 1024)})
+
+    with patch("urllib.request.urlopen", return_value=response):
+        with pytest.raises(ValueError):
+            list(
+                network.iter_m3u_source(
+                    "http://example.com/list.m3u",
+                    user_agent="TestAgent",
+                    timeout=5,
+                    disable_ssl_verify=True,
+                )
+            )
+
+
+def test_iter_m3u_chunks_records_validators_and_sends_conditional_headers():
+    payload = b"#EXTM3U\n#EXTINF:-1,Kanal\nhttp://example.com/live.m3u8\n"
+    response = ChunkedResponse(payload, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    validators = {}
+
+    with patch("urllib.request.urlopen", return_value=response):
+        body = b"".join(
+            network.iter_m3u_chunks(
+                "http://example.com/list.m3u",
+                user_agent="TestAgent",
+                timeout=5,
+                disable_ssl_verify=True,
+                validators=validators,
+            )
+        )
+
+    assert body == payload
+    assert validators["etag"] == '"v1"'
+    assert len(validators["content_hash"]) == 64
+    assert network.conditional_headers(validators) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_iter_m3u_chunks_raises_not_modified_on_304():
+    error = urllib.error.HTTPError("http://example.com/list.m3u", 304, "Not Modified", {}, None)
+
+    with patch("urllib.request.urlopen", side_effect=error) as urlopen:
+        with pytest.raises(network.NotModified):
+            list(
+                network.iter_m3u_chunks(
+                    "http://example.com/list.m3u",
+                    user_agent="TestAgent",
+                    timeout=5,
+                    disable_ssl_verify=True,
+                    validators={"etag": '"v1"'},
+                )
+            )
+
+    assert urlopen.call_args[0][0].get_header("If-none-match") == '"v1"'
+
+
+def test_iter_m3u_source_decodes_gzip_content_encoding():
+    payload = b"#EXTM3U\n#EXTINF:-1,Kanal\nhttp://example.com/live.m3u8\n"
+    response = ChunkedResponse(gzip.compress(payload), headers={"Content-Encoding": "gzip"})
+
+    with patch("urllib.request.urlopen", return_value=response) as urlopen:
+        lines = list(
+            network.iter_m3u_source(
+                "http://example.com/list.m3u",
+                user_agent="TestAgent",
+                timeout=5,
+                disable_ssl_verify=True,
+                chunk_size=5,
+            )
+        )
+
+    assert lines == [b"#EXTM3U", b"#EXTINF:-1,Kanal", b"http://example.com/live.m3u8"]
+    assert "gzip" in urlopen.call_args[0][0].get_header("Accept-encoding")
+
+
+def test_decode_chunks_handles_deflate_and_multi_member_gzip():
+    payload = b"#EXTM3U\n" * 100
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw_deflate = raw.compress(payload) + raw.flush()
+
+    assert b"".join(network.decode_chunks([zlib.compress(payload)], "deflate")) == payload
+    assert b"".join(network.decode_chunks([raw_deflate], "deflate")) == payload
+    # Uzantısı olmayan .m3u.gz içerik sihirli baytlardan tanınır
+    members = gzip.compress(payload) + gzip.compress(payload)
+    assert b"".join(network.decode_chunks([members[:3], members[3:]])) == payload * 2
+
+
+def test_decode_chunks_limits_decompressed_size():
+    bomb = gzip.compress(b"\n" * (1024 * 1024))
+
+    with pytest.raises(ValueError):
+        list(network.decode_chunks([bomb], "gzip", max_bytes=64 * 1024, chunk_size=4096))
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    payload = b""
+    honour_ranges = True
+    fail_from = None
+    ranges_seen: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        header = self.headers.get("Range")
+        if header and self.honour_ranges:
+            start, _, end = header.removeprefix("bytes=").partition("-")
+            start, end = int(start), int(end)
+            type(self).ranges_seen.append((start, end))
+            if self.fail_from is not None and start >= self.fail_from:
+                self.send_error(500)
+                return
+            body = self.payload[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.payload)}")
+        else:
+            body = self.payload
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def range_server():
+    RangeHandler.payload = b"#EXTM3U\n" + b"".join(
+        b"#EXTINF:-1,Kanal %d\nhttp://example.com/%d.m3u8\n" % (i, i) for i in range(2000)
+    )
+    RangeHandler.ranges_seen = []
+    RangeHandler.honour_ranges = True
+    RangeHandler.fail_from = None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with patch.object(network, "_ranged_settings", return_value=(1024, 4, 1)):
+            yield f"http://127.0.0.1:{server.server_address[1]}/list.m3u"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_large_sources_download_in_parallel_ranges(range_server):
+    options = {"user_agent": "TestAgent", "timeout": 5, "disable_ssl_verify": True}
+    validators = {}
+
+    body = b"".join(network.iter_m3u_chunks(range_server, chunk_size=4096, validators=validators, **options))
+    lines = network.fetch_m3u_source(range_server, **options)
+
+    payload = RangeHandler.payload
+    assert body == payload
+    assert b"".join(lines) == payload
+    assert len(RangeHandler.ranges_seen) == 6
+    assert max(end for _, end in RangeHandler.ranges_seen) == len(payload) - 1
+    assert validators["content_hash"] == hashlib.sha256(payload).hexdigest()
+
+
+@pytest.mark.parametrize("ranged", [True, False])
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_fetch_m3u_source_sniffs_compressed_body_without_content_encoding(range_server, codec, ranged):
+    # .m3u.gz/.m3u.zst dosyası Content-Encoding olmadan sunulur
+    payload = RangeHandler.payload
+    if codec == "zstd":
+        RangeHandler.payload = pytest.importorskip("zstandard").ZstdCompressor().compress(payload)
+    else:
+        RangeHandler.payload = gzip.compress(payload)
+    RangeHandler.honour_ranges = ranged
+    validators = {}
+
+    lines = network.fetch_m3u_source(
+        range_server, user_agent="TestAgent", timeout=5, disable_ssl_verify=True, validators=validators
+    )
+
+    assert b"".join(lines) == payload
+    assert lines[1] == b"#EXTINF:-1,Kanal 0\n"
+    assert bool(RangeHandler.ranges_seen) == ranged
+    assert validators["content_hash"] == hashlib.sha256(payload).hexdigest()
+
+
+def test_ranged_download_buffers_only_a_window_of_blocks(range_server):
+    payload = RangeHandler.payload
+    with patch.object(network, "_range_block_bytes", return_value=4096):
+        chunks = network.iter_m3u_chunks(range_server, user_agent="TestAgent", timeout=5, disable_ssl_verify=True)
+        body = next(chunks)
+        time.sleep(0.3)
+        # Tüketici beklerken ilk aralığın ardından en fazla PARTS - 1 blok istenir
+        assert len(RangeHandler.ranges_seen) == 3
+        body += b"".join(chunks)
+
+    assert body == payload
+    blocks = sorted(RangeHandler.ranges_seen)
+    assert blocks == [(start, end - 1) for start, end in network.range_bounds(len(payload), 4, 4096)[1:]]
+
+
+def test_ranged_download_falls_back_to_single_stream(range_server):
+    RangeHandler.honour_ranges = False
+
+    body = b"".join(
+        network.iter_m3u_chunks(range_server, user_agent="TestAgent", timeout=5, disable_ssl_verify=True)
+    )
+
+    assert body == RangeHandler.payload
+
+
+def test_ranged_download_resumes_at_failed_later_range(range_server):
+    payload = RangeHandler.payload
+    # Yalnızca üçüncü ve sonraki aralıklar başarısız olur; ikinci aralık tampondan gelir
+    RangeHandler.fail_from = network.range_bounds(len(payload), 4)[2][0]
+    validators = {}
+
+    body = b"".join(
+        network.iter_m3u_chunks(
+            range_server, user_agent="TestAgent", timeout=5, disable_ssl_verify=True, validators=validators
+        )
+    )
+
+    assert body == payload
+    assert validators["content_hash"] == hashlib.sha256(payload).hexdigest()
+
+
+def test_range_bounds_cover_body_without_gaps():
+    assert network.range_bounds(10, 3) == [(0, 4), (4, 8), (8, 10)]
+    assert network.range_bounds(2, 4) == [(0, 1), (1, 2)]
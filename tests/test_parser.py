@@ -1,5 +1,7 @@
 # M3U Editor Pro parser tests
 
+import gzip
+import io
 import os
 import sys
 from unittest.mock import patch
@@ -150,3 +152,257 @@ def test_batch_check_health_progress_is_consistent():
     assert results == [mock_status, mock_status, mock_status]
     assert sorted(call[0] for call in progress_calls) == [1, 2, 3]
     assert all(call[1] == 3 for call in progress_calls)
+
+
+def test_iter_m3u_channels_from_file_object():
+    payload = (
+        b"#EXTM3U\r\n"
+        b'#EXTINF:-1 group-title="Haber",Haber Kanal\r\n'
+        b"http://example.com/haber.m3u8\r\n"
+    )
+    channels = list(parser_utils.iter_m3u_channels(io.BytesIO(payload)))
+    assert len(channels) == 1
+    assert channels[0]["Grup"] == "Haber"
+    assert channels[0]["URL"] == "http://example.com/haber.m3u8"
+
+
+def test_iter_m3u_channels_is_lazy():
+    def lines():
+        yield b'#EXTINF:-1 group-title="A",Bir'
+        yield b"http://example.com/1.m3u8"
+        raise AssertionError("kaynak gereğinden fazla okundu")
+
+    with patch.object(parser_utils, "_iter_source_lines", return_value=lines()):
+        first = next(parser_utils.iter_m3u_channels("http://example.com/list.m3u"))
+    assert first["Kanal Adı"] == "Bir"
+
+
+def test_filter_channels_accepts_generator():
+    channels = (ch for ch in [{"Grup": "TR | Spor", "Kanal Adı": "A"}, {"Grup": "UK", "Kanal Adı": "B"}])
+    assert len(filter_channels(channels, only_tr=True)) == 1
+
+
+def test_parse_m3u_keeps_all_extinf_attributes():
+    sample = [
+        "#EXTM3U",
+        '#EXTINF:-1 tvg-id="trt1.tr" tvg-name="TRT 1" tvg-chno="1" catchup="default" '
+        'tvg-logo="http://logo.com/trt1.png" group-title="Ulusal, HD",TRT 1, HD',
+        "#EXTVLCOPT:http-user-agent=VLC/3.0",
+        "#KODIPROP:inputstream=inputstream.adaptive",
+        "http://example.com/trt1.m3u8",
+    ]
+    channel = parse_m3u_lines(sample)[0]
+    assert channel["Grup"] == "Ulusal, HD"
+    assert channel["Kanal Adı"] == "TRT 1, HD"
+    assert channel["LogoURL"] == "http://logo.com/trt1.png"
+    attrs = parser_utils.parse_attributes(channel["Öznitelikler"])
+    assert attrs["tvg-id"] == "trt1.tr"
+    assert attrs["tvg-chno"] == "1"
+    assert attrs["catchup"] == "default"
+    assert channel["Seçenekler"] == [
+        "#EXTVLCOPT:http-user-agent=VLC/3.0",
+        "#KODIPROP:inputstream=inputstream.adaptive",
+    ]
+
+
+def test_parse_extinf_title_may_contain_attribute_like_text():
+    group, logo, title, raw = parser_utils.parse_extinf(
+        '#EXTINF:-1 tvg-id="a.tr" group-title="Film, Dizi",Kanal x="1", HD'
+    )
+    assert (group, title) == ("Film, Dizi", 'Kanal x="1", HD')
+    assert parser_utils.parse_attributes(raw) == {"tvg-id": "a.tr", "group-title": "Film, Dizi"}
+
+    assert parser_utils.parse_extinf("#EXTINF:-1,Düz Başlık") == ("", "", "Düz Başlık", "-1")
+
+
+def test_convert_df_to_m3u_round_trips_attributes():
+    sample = [
+        "#EXTM3U",
+        '#EXTINF:-1 tvg-id="a.tr" tvg-name="A" tvg-logo="http://l/a.png" group-title="G1",A, Kanal',
+        "#EXTVLCOPT:http-referrer=http://example.com/",
+        "http://example.com/a.m3u8",
+        '#EXTINF:0 tvg-id="b.tr" group-title="G2",B',
+        "http://example.com/b.ts",
+    ]
+    df = pd.DataFrame(parse_m3u_lines(sample))
+    m3u = convert_df_to_m3u(df)
+    assert m3u.splitlines() == sample
+
+    df.loc[1, "Grup"] = "Yeni"
+    df.loc[1, "LogoURL"] = "http://l/b.png"
+    assert '#EXTINF:0 tvg-id="b.tr" group-title="Yeni" tvg-logo="http://l/b.png",B' in convert_df_to_m3u(df)
+
+
+def _large_playlist(count: int) -> bytes:
+    lines = ["#EXTM3U"]
+    for i in range(count):
+        lines.append(f'#EXTINF:-1 tvg-id="c{i}" group-title="{"TR" if i % 3 else "UK"} | G{i % 7}",Kanal {i}')
+        if i % 5 == 0:
+            lines.append("#EXTVLCOPT:http-user-agent=VLC")
+        lines.append(f"http://example.com/live/{i}.m3u8")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def test_parse_m3u_bytes_parallel_matches_serial():
+    data = _large_playlist(500)
+    serial = parser_utils.parse_m3u_bytes(data, workers=1)
+    parallel = parser_utils.parse_m3u_bytes(data, workers=3, min_parallel_bytes=0)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert len(serial) == 500
+
+    tr_serial = parser_utils.parse_m3u_bytes(data, only_tr=True, workers=1)
+    tr_parallel = parser_utils.parse_m3u_bytes(data, only_tr=True, workers=3, min_parallel_bytes=0)
+    pd.testing.assert_frame_equal(tr_parallel, tr_serial)
+
+
+def test_split_at_extinf_boundaries():
+    data = _large_playlist(50)
+    ranges = parser_utils._split_at_extinf(data, 4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for start, end in ranges[1:]:
+        assert data[start:start + 7] == b"#EXTINF"
+
+
+def test_parse_m3u_bytes_over_memoryview_matches_line_parser():
+    data = _large_playlist(40) + b"\n\n#EXTGRP:yoksay\n   \n"
+    channels = parse_m3u_lines(data.splitlines())
+    df = parser_utils.parse_m3u_bytes(memoryview(data), workers=1)
+    assert df["URL"].tolist() == [ch["URL"] for ch in channels]
+    assert df["Kanal Adı"].tolist() == [ch["Kanal Adı"] for ch in channels]
+    assert df["Seçenekler"].tolist() == [ch["Seçenekler"] for ch in channels]
+
+
+def test_scanner_matches_record_parser_on_edge_cases():
+    data = (
+        b"#EXTM3U\r\n"
+        b'#EXTINF:-1 tvg-name="a,b" group-title="TR Spor" tvg-logo="http://l/1.png",Kanal, virg\xc3\xbcl \r\n'
+        b"#EXTVLCOPT:http-user-agent=x\r\n"
+        b"  http://x/1.M3U8  \r\n"
+        b'#EXTINF:-1 tvg-name="kapanmayan,Kanal A\n'
+        b"http://u/2.mpd\n"
+        b'#EXTINF:-1 group-title="",\xc2\xa0T\xc3\xbcrk Kanal\xc2\xa0\n'
+        b"#KODIPROP:inputstream=x\n"
+        b"http://u/3/LIVE/x\n"
+        b'#EXTINF:-1 group-title="DE",Eslesmeyen\n'
+        b'#EXTINF:-1 group-title="Genel",B\n'
+        b"http://u/4\n"
+        b"http://u/yetim\n"
+        b"#EXTVLCOPT:sahipsiz\n"
+        b"#EXTINF:-1,Son"
+    )
+    for only_tr in (False, True):
+        expected = parser_utils.build_channel_frame(
+            parser_utils._iter_records(parser_utils._iter_buffer_lines(data)), only_tr=only_tr
+        )
+        pd.testing.assert_frame_equal(parser_utils.parse_m3u_bytes(data, only_tr=only_tr, workers=1), expected)
+    lines = data.split(b"\n")
+    assert parse_m3u_lines(lines) == list(parser_utils._iter_channels(lines))
+
+    # Geçersiz UTF-8: satır satır parser'a düşülür (geçersiz baytlar atılır)
+    broken = b'#EXTINF:-1 group-title="G",Ka\xffnal\nhttp://u/5\n'
+    assert parser_utils.parse_m3u_bytes(broken, workers=1)["Kanal Adı"].tolist() == ["Kanal"]
+    assert parse_m3u_lines(broken.split(b"\n"))[0]["Kanal Adı"] == "Kanal"
+
+
+def test_parse_m3u_file_mmap_parallel_matches_serial(tmp_path):
+    path = tmp_path / "liste.m3u"
+    path.write_bytes(_large_playlist(300))
+    serial = parser_utils.parse_m3u_file(path, workers=1)
+    parallel = parser_utils.parse_m3u_file(path, workers=2, min_parallel_bytes=0)
+    pd.testing.assert_frame_equal(parallel, serial)
+    pd.testing.assert_frame_equal(parser_utils.load_channel_frame(str(path)), serial)
+
+
+def test_parse_compressed_playlist_matches_plain(tmp_path):
+    data = _large_playlist(60)
+    plain = parser_utils.parse_m3u_bytes(data, workers=1)
+    packed = gzip.compress(data)
+    path = tmp_path / "liste.m3u.gz"
+    path.write_bytes(packed)
+
+    pd.testing.assert_frame_equal(parser_utils.parse_m3u_bytes(memoryview(packed)), plain)
+    pd.testing.assert_frame_equal(parser_utils.parse_m3u_file(path), plain)
+    assert [ch["URL"] for ch in parser_utils.iter_m3u_channels(io.BytesIO(packed))] == plain["URL"].tolist()
+
+
+def test_write_m3u_streams_chunks_to_file_object():
+    data = _large_playlist(25)
+    df = parser_utils.parse_m3u_bytes(data, workers=1)
+    out = io.BytesIO()
+    assert parser_utils.write_m3u(df, out, chunk_rows=7) is None
+    assert out.getvalue() == parser_utils.write_m3u(df)
+    assert out.getvalue().decode("utf-8").splitlines() == data.decode("utf-8").splitlines()
+
+
+def test_write_m3u_escapes_quotes_and_newlines():
+    df = pd.DataFrame(
+        [{"Grup": 'Film "HD"', "Kanal Adı": "Kanal\nX", "URL": "http://a.com/1", "LogoURL": 'http://l/"a".png'}]
+    )
+    lines = parser_utils.write_m3u(df).decode("utf-8").splitlines()
+    assert lines == [
+        "#EXTM3U",
+        "#EXTINF:-1 tvg-logo=\"http://l/'a'.png\" group-title=\"Film 'HD'\",Kanal X",
+        "http://a.com/1",
+    ]
+
+
+def test_export_fingerprint_ignores_filter_order():
+    a = parser_utils.export_fingerprint("v1", ["B", "A"], [], [], "trt")
+    assert a == parser_utils.export_fingerprint("v1", ["A", "B"], [], [], "trt")
+    assert a != parser_utils.export_fingerprint("v1", ["A", "B"], [], [], "trt1")
+    assert a != parser_utils.export_fingerprint("v2", ["A", "B"], [], [], "trt")
+
+
+def test_load_channel_frame_reuses_unchanged_source(tmp_path):
+    import functools
+    import http.server
+    import threading
+
+    (tmp_path / "list.m3u").write_bytes(_large_playlist(50))
+
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=str(tmp_path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/list.m3u"
+    parser_utils.clear_source_cache()
+    try:
+        first = parser_utils.load_channel_frame(url)
+        # İkinci istek If-Modified-Since ile gider, sunucu 304 döner; tekrar parse edilmez
+        with patch.object(parser_utils, "build_channel_frame", side_effect=AssertionError("parsed again")), \
+                patch.object(parser_utils, "parse_m3u_bytes", side_effect=AssertionError("parsed again")):
+            second = parser_utils.load_channel_frame(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+        parser_utils.clear_source_cache()
+
+    assert len(second) == len(first) == 50
+    second["Durum"] = "✅ Aktif"
+    assert (first["Durum"] != "✅ Aktif").all()
+
+
+def test_source_cache_is_bounded_by_frame_size():
+    small = parser_utils.parse_m3u_bytes(_large_playlist(10))
+    large = parser_utils.parse_m3u_bytes(_large_playlist(2000))
+    small_size = small.memory_usage(index=False, deep=True).sum()
+    budget_mb = 2 * small_size / (1024 * 1024)
+    parser_utils.clear_source_cache()
+    try:
+        with patch.object(parser_utils, "SOURCE_CACHE_MAX_MB", budget_mb):
+            parser_utils._remember_source(("a", False), {"etag": "a"}, small)
+            parser_utils._remember_source(("b", False), {"etag": "b"}, small)
+            # Bütçeyi tek başına aşan tablo tutulmaz, diğer kayıtlar da atılmaz
+            parser_utils._remember_source(("c", False), {"etag": "c"}, large)
+            assert parser_utils._cached_source(("c", False)) is None
+            assert parser_utils._cached_source(("a", False)) is not None
+            # Üçüncü küçük tablo bütçeyi aşar; en uzun süredir kullanılmayan ("b") atılır
+            parser_utils._remember_source(("d", False), {"etag": "d"}, small)
+            assert parser_utils._cached_source(("b", False)) is None
+            validators, frame = parser_utils._cached_source(("d", False))
+            assert validators == {"etag": "d"} and len(frame) == 10
+    finally:
+        parser_utils.clear_source_cache()
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from utils.parser import filter_channels
+from utils.search import SearchIndex, fold_tr
+
+
+NAMES = ["TRT 1 HD", "İZMİR TV", "Kanal D", "ISTANBUL FM", "ıslak", "Show TV"]
+GROUPS = ["Ulusal", "Yerel", "Ulusal", "Radyo", "Diğer", "Ulusal"]
+
+
+def _brute_force(query, prefix=False):
+    folded = fold_tr(query)
+    hits = []
+    for row, (name, group) in enumerate(zip(NAMES, GROUPS)):
+        keys = (fold_tr(name), fold_tr(group))
+        if any(key.startswith(folded) if prefix else folded in key for key in keys):
+            hits.append(row)
+    return hits
+
+
+def test_fold_tr_treats_dotted_and_dotless_i_alike():
+    assert fold_tr("İZMİR") == fold_tr("izmir") == fold_tr("IZMIR") == "izmir"
+    assert fold_tr("ısparta") == "isparta"
+
+
+def test_search_matches_brute_force():
+    index = SearchIndex(NAMES, GROUPS)
+    for query in ["izmir", "İzmir", "tv", "t", "hd", "trt 1", "ulusal", "ıs", "yok", "kanal d", "a"]:
+        assert index.search(query).tolist() == _brute_force(query), query
+        assert index.search(query, prefix=True).tolist() == _brute_force(query, prefix=True), query
+
+
+def test_search_empty_query_returns_all_rows():
+    index = SearchIndex(NAMES, GROUPS)
+    assert index.search("  ").tolist() == list(range(len(NAMES)))
+    assert index.mask("zzz").sum() == 0
+
+
+def test_from_frame_uses_categorical_groups():
+    df = pd.DataFrame({"Kanal Adı": NAMES, "Grup": pd.Categorical(GROUPS)})
+    index = SearchIndex.from_frame(df)
+    assert index.search("radyo").tolist() == [3]
+
+
+def test_filter_channels_keyword_is_turkish_case_insensitive():
+    channels = [{"Grup": group, "Kanal Adı": name} for name, group in zip(NAMES, GROUPS)]
+    assert [ch["Kanal Adı"] for ch in filter_channels(channels, keyword="izmir")] == ["İZMİR TV"]
+    assert [ch["Kanal Adı"] for ch in filter_channels(channels, keyword="istanbul")] == ["ISTANBUL FM"]
+
+
+def test_filter_channels_reuses_prebuilt_index():
+    channels = [{"Grup": group, "Kanal Adı": name} for name, group in zip(NAMES, GROUPS)]
+    index = SearchIndex(NAMES, GROUPS)
+    for query in ["izmir", "tv", "ulusal", "ıs", "yok"]:
+        expected = [ch["Kanal Adı"] for ch in filter_channels(channels, keyword=query)]
+        assert [ch["Kanal Adı"] for ch in filter_channels(channels, keyword=query, index=index)] == expected, query
+    assert [ch["Kanal Adı"] for ch in filter_channels(channels, keyword="tv", group_filter="Ulusal", index=index)] == [
+        "Show TV"
+    ]
+
+
+def test_short_queries_handle_trailing_empty_and_short_names():
+    index = SearchIndex(["abc", ""], ["g", "h"])
+    assert index.search("ab").tolist() == [0]
+    assert index.search("a", prefix=True).tolist() == [0]
+
+    index = SearchIndex(["abc", "x"], ["g", "h"])
+    assert index.search("bc").tolist() == [0]
+    assert index.search("x").tolist() == [1]
+    assert index.search("xy", prefix=True).tolist() == []
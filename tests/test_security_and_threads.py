@@ -119,3 +119,30 @@ def test_proxy_server_local_playlist():
     finally:
         proxy.stop()
 
+
+
+def test_proxy_write_playlist_is_memoised_by_fingerprint():
+    """Aynı parmak iziyle çalma listesi yeniden üretilmemelidir."""
+    proxy = LocalProxyServer()
+    proxy.playlist_file = os.path.join(tempfile.mkdtemp(), "playlist.m3u")
+    calls = []
+
+    def writer(f):
+        calls.append(1)
+        f.write(b"#EXTM3U\n")
+
+    try:
+        assert proxy.write_playlist(writer, "v1")
+        assert proxy.write_playlist(writer, "v1")
+        assert len(calls) == 1
+        assert proxy.write_playlist(writer, "v2")
+        assert len(calls) == 2
+        with open(proxy.playlist_file, "rb") as f:
+            assert f.read() == b"#EXTM3U\n"
+
+        # Düz içerik yazımı parmak izini geçersiz kılar
+        proxy.set_m3u_content("#EXTM3U\n#EXTINF:-1,A\nhttp://a\n")
+        assert proxy.playlist_fingerprint is None
+    finally:
+        if os.path.exists(proxy.playlist_file):
+            os.remove(proxy.playlist_file)
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from utils import parser as parser_utils
+from utils import store
+
+
+SAMPLE = [
+    "#EXTM3U",
+    '#EXTINF:-1 tvg-logo="http://logo/1.png" group-title="TR | Spor",Spor 1',
+    "http://example.com/live/spor1.m3u8",
+    '#EXTINF:-1 group-title="UK | News",News',
+    "#EXTVLCOPT:http-user-agent=VLC",
+    "http://example.com/news.mpd",
+    '#EXTINF:-1 group-title="TR | Spor",Spor 2',
+    "http://example.com/spor2.ts",
+]
+
+
+def _frame(only_tr=False):
+    return parser_utils.build_channel_frame(parser_utils._iter_records(SAMPLE), only_tr=only_tr)
+
+
+def test_build_channel_frame_uses_categorical_columns():
+    df = _frame()
+    assert len(df) == 3
+    for column in ("Grup", "Tür", "Durum"):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert list(df["Grup"].cat.categories) == ["TR | Spor", "UK | News"]
+    assert df["Tür"].tolist() == ["HLS", "DASH", "Diğer"]
+    assert (df["Durum"] == store.STATUS_PENDING).all()
+    assert df.loc[1, "Seçenekler"] == ["#EXTVLCOPT:http-user-agent=VLC"]
+    assert df.loc[0, "LogoURL"] == "http://logo/1.png"
+
+
+def test_build_channel_frame_matches_dict_parser():
+    df = _frame()
+    channels = parser_utils.parse_m3u_lines(SAMPLE)
+    for column in ("Grup", "Kanal Adı", "URL", "LogoURL", "Tür", "Öznitelikler"):
+        assert df[column].astype(object).tolist() == [ch[column] for ch in channels]
+
+
+def test_build_channel_frame_only_tr():
+    assert _frame(only_tr=True)["Kanal Adı"].tolist() == ["Spor 1", "Spor 2"]
+
+
+def test_filter_frame_by_category_codes():
+    df = _frame()
+    assert len(store.filter_frame(df, groups=["TR | Spor"])) == 2
+    assert len(store.filter_frame(df, groups=["TR | Spor"], types=["HLS"])) == 1
+    assert len(store.filter_frame(df, groups=["Yok"])) == 0
+    assert store.filter_frame(df) is df
+
+
+def test_set_statuses_adds_unknown_categories():
+    df = _frame()
+    store.set_statuses(df, {"http://example.com/news.mpd": "⚠️ HTTP 500", "http://example.com/spor2.ts": "✅ Aktif"})
+    assert df["Durum"].tolist() == [store.STATUS_PENDING, "⚠️ HTTP 500", "✅ Aktif"]
+    assert isinstance(df["Durum"].dtype, pd.CategoricalDtype)
+    assert store.category_options(df, "Durum") == sorted([store.STATUS_PENDING, "⚠️ HTTP 500", "✅ Aktif"])
+
+
+def test_filter_frame_by_region():
+    df = _frame()
+    assert store.filter_frame(df, regions=["TR"])["Kanal Adı"].tolist() == ["Spor 1", "Spor 2"]
+
+
+def test_set_probe_metrics_writes_measurement_columns():
+    from utils.health import DeepProbeResult
+
+    df = _frame()
+    store.set_probe_metrics(df, {"http://example.com/live/spor1.m3u8": DeepProbeResult("✅ Aktif", 200, 0.5, 0.1234, 2500.4, 2560.0, "1280x720")})
+    store.set_probe_metrics(df, {"http://example.com/spor2.ts": DeepProbeResult("⏱️ Zaman Aşımı")})
+
+    assert df["TTFB (ms)"].iloc[0] == 123
+    assert df["Hız (kbit/s)"].iloc[0] == 2500
+    assert df["Bant Genişliği (kbit/s)"].iloc[0] == 2560
+    assert df["Çözünürlük"].iloc[0] == "1280x720"
+    assert df["Çözünürlük"].isna().tolist() == [False, True, True]
+    assert df["TTFB (ms)"].isna().tolist() == [False, True, True]
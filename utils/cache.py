@@ -0,0 +1,189 @@
+"""Parse edilmiş kanal tabloları için disk önbelleği.
+
+Tablolar Arrow IPC dosyası olarak yazılır ve bellek eşlemeli (mmap) okunur;
+sıcak yükleme, metin sütunları kopyalanmadan disk okuma hızında tamamlanır.
+pyarrow yoksa pickle (protokol 5) kullanılır. Kayıtlar ``CACHE_TTL``
+saniye geçerlidir; toplam boyut ``CACHE_MAX_MB``'ı aşınca en uzun süredir
+okunmayan dosyalar silinir. Yazma işlemi geçici dosya + ``os.replace`` ile
+atomik yapıldığından birden fazla Streamlit oturumu aynı dizini güvenle
+paylaşabilir.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.store import _string_dtype
+from utils.visitor_counter import data_path
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - Streamlit ile birlikte kurulu gelir
+    pa = None
+
+try:
+    from utils.config import CACHE_TTL, CACHE_MAX_MB
+except ImportError:
+    CACHE_TTL = 300
+    CACHE_MAX_MB = 256
+
+_SUFFIX = ".arrow" if pa is not None else ".pkl"
+# Arrow'da liste olarak saklanıp okumada numpy dizisine dönen sütunlar
+_LIST_COLUMNS = ("Seçenekler", "Alternatifler")
+
+
+def content_key(data) -> str:
+    """Bellekteki içerik (bytes/memoryview) için önbellek anahtarı üretir."""
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+
+def file_key(path) -> str:
+    """Yerel dosya için yol + değişiklik zamanı + boyuttan önbellek anahtarı üretir."""
+    stat = os.stat(path)
+    return f"file:{os.path.abspath(os.fspath(path))}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class PlaylistCache:
+    """Anahtar (URL veya içerik hash'i) → kanal tablosu disk önbelleği.
+
+    Args:
+        directory: Önbellek dizini (varsayılan: yazılabilir geçici dizinde ``m3u_cache``)
+        ttl: Kaydın geçerlilik süresi (saniye, 0 = önbellek kapalı)
+        max_bytes: Dizindeki dosyaların toplam boyut sınırı
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: int = CACHE_TTL, max_bytes: Optional[int] = None):
+        self.directory = directory or data_path("m3u_cache")
+        self.ttl = ttl
+        self.max_bytes = CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + _SUFFIX)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Geçerli kayıt varsa tabloyu, yoksa None döndürür."""
+        if self.ttl <= 0:
+            return None
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if time.time() - stat.st_mtime > self.ttl:
+            self._remove(path)
+            return None
+        try:
+            df = _read_frame(path)
+        except Exception as e:
+            logger.warning(f"Önbellek dosyası okunamadı, siliniyor ({path}): {e}")
+            self._remove(path)
+            return None
+        try:
+            # LRU için erişim zamanı güncellenir; TTL'in dayandığı mtime korunur
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """Tabloyu atomik olarak yazar ve gerekirse eski kayıtları siler."""
+        if self.ttl <= 0:
+            return False
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            _write_frame(df, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Önbelleğe yazılamadı: {e}")
+            self._remove(tmp_path)
+            return False
+        self._evict()
+        return True
+
+    def clear(self) -> None:
+        """Tüm önbellek dosyalarını siler."""
+        for entry in self._entries():
+            self._remove(entry.path)
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return [entry for entry in it if entry.is_file() and entry.name.endswith(_SUFFIX)]
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        with self._lock:
+            now = time.time()
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.ttl:
+                    self._remove(entry.path)
+                else:
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _write_frame(df: pd.DataFrame, path: str) -> None:
+    if pa is None:
+        with open(path, "wb") as f:
+            pickle.dump(df, f, protocol=5)
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_frame(path: str) -> pd.DataFrame:
+    if pa is None:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    # Bellek eşlemeli okuma: metin sütunları, taze parse ile aynı Arrow tabanlı
+    # string dtype'ına eşlenir ve Python nesnelerine dönüştürülmeden dosya
+    # sayfalarını doğrudan kullanır
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    string_dtype = _string_dtype()
+    df = table.to_pandas(
+        types_mapper=lambda arrow_type: string_dtype
+        if arrow_type in (pa.string(), pa.large_string())
+        else None
+    )
+    for column in _LIST_COLUMNS:
+        if column in df.columns:
+            values = np.array(df[column], dtype=object)
+            for row in np.flatnonzero(pd.notna(values)):
+                values[row] = list(values[row])
+            df[column] = values
+    return df
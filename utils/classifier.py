@@ -0,0 +1,140 @@
+"""Kanal bölge sınıflandırıcısı.
+
+Yapılandırmadaki anahtar kelimeler (``REGION_KEYWORDS`` / ``TR_KEYWORDS``)
+tek bir çoklu-desen eşleyicide birleştirilir: kelimeler bir önek ağacına
+(trie) dizilip iç içe alternasyonlu tek bir regex'e derlenir, böylece metin
+her kelime için ayrı ayrı değil tek geçişte taranır. Eşleşmeler kelime
+sınırına bağlıdır (``TR`` → ``TR | Spor``, ``[TR]``, ``TR_HD`` eşleşir;
+``TRT``, ``4TR`` eşleşmez) ve Türkçe harf katlaması (İ/I/ı ≡ i) ile
+büyük/küçük harf duyarsızdır.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from utils.search import fold_tr
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - Streamlit ile birlikte kurulu gelir
+    pa = pc = None
+
+try:
+    from utils.config import TR_KEYWORDS
+except ImportError:
+    TR_KEYWORDS = ["TR", "TURK", "TÜRK", "TURKIYE", "TÜRKİYE", "YERLI", "ULUSAL", "ISTANBUL"]
+
+try:
+    from utils.config import REGION_KEYWORDS
+except ImportError:
+    REGION_KEYWORDS = {"TR": TR_KEYWORDS}
+
+REGION_TR = "TR"
+REGION_OTHER = "Diğer"
+
+# Anahtar kelimenin solunda/sağında harf veya rakam olmamalı ("_" ayraç sayılır)
+_LEFT_BOUNDARY = r"(?<![^\W_])"
+_RIGHT_BOUNDARY = r"(?![^\W_])"
+# Arrow'un RE2 motoru çevre denetimini desteklemez; sınır karakteri eşleşmeye dahil edilir
+_RE2_LEFT_BOUNDARY = r"(?:^|[^\p{L}\p{N}])"
+_RE2_RIGHT_BOUNDARY = r"(?:[^\p{L}\p{N}]|$)"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Kelimeleri ortak önekleri paylaşan tek bir regex alternasyonuna derler."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            # Uzun eşleşme önce denenir; sınır tutmazsa kısa kelimeye geri dönülür
+            return "(?:" + body + ")?" if len(branches) > 1 or len(branches[0]) > 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+def keyword_pattern(words: Iterable[str], flags: int = 0) -> "re.Pattern[str]":
+    """Kelime listesinden kelime sınırlı, tek geçişli arama deseni derler."""
+    words = sorted({word for word in words if word})
+    if not words:
+        return re.compile(r"(?!x)x")
+    return re.compile(_LEFT_BOUNDARY + "(" + _trie_pattern(words) + ")" + _RIGHT_BOUNDARY, flags)
+
+
+class RegionClassifier:
+    """Grup/kanal adını ``{bölge: anahtar kelimeler}`` kurallarına göre etiketler.
+
+    Tüm bölgelerin kelimeleri tek bir desende birleştirilir; metindeki en
+    soldaki eşleşmenin ait olduğu bölge döndürülür. Grup adları kanallar
+    arasında tekrarlandığı için grup sonuçları önbelleklenir.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]], default: str = REGION_OTHER) -> None:
+        self.default = default
+        self.regions = list(rules)
+        self._keyword_regions: Dict[str, str] = {}
+        for region, words in rules.items():
+            for word in words:
+                # Aynı kelime birden çok bölgede varsa ilk tanımlanan geçerlidir
+                self._keyword_regions.setdefault(fold_tr(word), region)
+        self.pattern = keyword_pattern(self._keyword_regions)
+        self._match_group = lru_cache(maxsize=4096)(self.match)
+        words = sorted(word for word in self._keyword_regions if word)
+        self._re2_pattern = (
+            _RE2_LEFT_BOUNDARY + "(?P<word>" + _trie_pattern(words) + ")" + _RE2_RIGHT_BOUNDARY if words else None
+        )
+
+    def match(self, text: str) -> Optional[str]:
+        """Metindeki ilk anahtar kelimenin bölgesini, eşleşme yoksa None döndürür."""
+        if not text:
+            return None
+        found = self.pattern.search(fold_tr(text))
+        return self._keyword_regions[found.group(1)] if found else None
+
+    def match_many(self, texts) -> np.ndarray:
+        """``match``'in toplu karşılığı: her metnin bölgesini (yoksa None) içeren nesne dizisi.
+
+        ``texts`` bir Arrow string dizisiyse katlama ve arama Arrow'da tek
+        geçişte yapılır; eşleşme kuralları ``match`` ile aynıdır (en soldaki
+        kelime, aynı noktada önce uzun kelime).
+        """
+        if pa is None or not isinstance(texts, (pa.Array, pa.ChunkedArray)):
+            return np.array([self.match(text) for text in texts] or [], dtype=object)
+        result = np.full(len(texts), None, dtype=object)
+        if self._re2_pattern is None or not len(texts):
+            return result
+        folded = texts
+        for src in ("İ", "I", "ı"):
+            folded = pc.replace_substring(folded, src, "i")
+        found = pc.struct_field(pc.extract_regex(pc.utf8_lower(folded), self._re2_pattern), [0])
+        encoded = pc.dictionary_encode(found)
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+        codes = encoded.indices.to_numpy(zero_copy_only=False)
+        matched = encoded.indices.is_valid().to_numpy(zero_copy_only=False)
+        regions = np.array([self._keyword_regions[word] for word in encoded.dictionary.to_pylist()], dtype=object)
+        result[matched] = regions[codes[matched].astype(np.int64)]
+        return result
+
+    def classify(self, group: str, name: str) -> str:
+        """Kanalın bölgesini önce grup adından, bulunamazsa kanal adından belirler."""
+        return self._match_group(group) or self.match(name) or self.default
+
+
+DEFAULT_CLASSIFIER = RegionClassifier(REGION_KEYWORDS)
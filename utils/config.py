@@ -21,6 +21,21 @@ DISABLE_SSL_VERIFY = True
 # User-Agent header (bazı sunucular bot tespiti yapar)
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
+# Bu boyutun (MB) üzerindeki listeler, sunucu "Accept-Ranges: bytes" destekliyorsa
+# birden fazla bağlantıyla paralel bayt aralıkları halinde indirilir (0 = kapalı)
+RANGED_DOWNLOAD_MIN_MB = 8
+
+# Paralel indirmede eşzamanlı aralık (bağlantı) sayısı
+RANGED_DOWNLOAD_PARTS = 4
+
+# Başarısız bir aralık için yeniden deneme sayısı (sonra tek akışa dönülür)
+RANGED_DOWNLOAD_RETRIES = 2
+
+# Paralel indirmede tek aralığın en büyük boyutu (MB). Büyük listeler bu boyutta
+# aralıklara bölünür ve sırayla indirilir; bellekte en fazla RANGED_DOWNLOAD_PARTS
+# aralık (yaklaşık PARTS × BLOCK_MB) tutulur
+RANGED_DOWNLOAD_BLOCK_MB = 4
+
 # === FİLTRELEME AYARLARI ===
 
 # TR kanal tespiti için anahtar kelimeler
@@ -31,6 +46,12 @@ TR_KEYWORDS = [
     "ISTANBUL"
 ]
 
+# Bölge sınıflandırma kuralları: {bölge etiketi: anahtar kelimeler}
+# Kanallar parse sırasında etiketlenir ("Bölge" sütunu); eşleşmeyenler "Diğer" olur.
+REGION_KEYWORDS = {
+    "TR": TR_KEYWORDS,
+}
+
 # Varsayılan olarak TR filtresi aktif mi?
 DEFAULT_TR_FILTER = True
 
@@ -59,9 +80,30 @@ DEBUG_MODE = False
 # Cache süresi (saniye, 0 = cache yok)
 CACHE_TTL = 300
 
+# Parse edilmiş listelerin disk önbelleği için toplam boyut sınırı (MB);
+# aşılınca en uzun süredir kullanılmayan kayıtlar silinir
+CACHE_MAX_MB = 256
+
 # Maksimum dosya boyutu (MB, dosya yükleme için)
 MAX_FILE_SIZE_MB = 50
 
+# Bu boyutun (MB) üzerindeki listeler birden fazla çekirdekte parse edilir
+# (altında süreç havuzu başlatma maliyeti kazancı aşar)
+PARALLEL_PARSE_MIN_MB = 8
+
+# Paralel parse için süreç sayısı (0 = CPU çekirdek sayısı)
+PARALLEL_PARSE_WORKERS = 0
+
+# Çoklu kaynak yüklemede aynı anda indirilen kaynak sayısı
+INGEST_MAX_WORKERS = 8
+
+# Değişmemiş listeleri yeniden parse etmemek için bellekte tutulan kaynak sayısı
+# (URL başına son tablo + ETag/Last-Modified/içerik hash'i)
+SOURCE_CACHE_ENTRIES = 4
+# Bu tabloların bellekte kaplayabileceği toplam boyut (MB); sınırı tek başına
+# aşan tablolar hiç tutulmaz
+SOURCE_CACHE_MAX_MB = 256
+
 # === URL SAĞLIK KONTROLÜ ===
 
 # Paralel kontrol için maksimum iş parçacığı sayısı
@@ -70,8 +112,79 @@ HEALTH_CHECK_MAX_WORKERS = 30
 # Sağlık kontrolü zaman aşımı (saniye)
 HEALTH_CHECK_TIMEOUT = 3
 
-# Varsayılan kontrol edilecek maksimum kanal sayısı
-HEALTH_CHECK_MAX_CHANNELS = 50
+# Varsayılan kontrol edilecek maksimum kanal sayısı (0 = sınırsız)
+HEALTH_CHECK_MAX_CHANNELS = 20000
+
+# Bir sağlık taramasının toplam süre sınırı (saniye, 0 = sınırsız). Tarama önce
+# görünen (filtrelenmiş) satırları, sonra hiç kontrol edilmemiş, sonra en eski
+# kontrol edilmiş URL'leri yoklar; süre dolunca kalanlar "❔ Bekliyor" kalır.
+# Duraklatılan tarama için de süre işlemeye devam eder
+HEALTH_CHECK_DEADLINE = 60
+
+# Sağlık kontrolü motoru: "async" (tek olay döngüsünde binlerce eşzamanlı yoklama)
+# veya "thread" (HEALTH_CHECK_MAX_WORKERS iş parçacığıyla urllib)
+HEALTH_CHECK_ENGINE = "async"
+
+# Async motorda eşzamanlı yoklama sayısı (açık dosya sınırına göre kısıtlanır)
+HEALTH_CHECK_CONCURRENCY = 500
+
+# Sunucu başına açık tutulan keep-alive bağlantı sayısı; aynı panele giden
+# yoklamalar TCP/TLS bağlantısını paylaşır (0 = her yoklamada yeni bağlantı)
+HEALTH_CHECK_POOL_SIZE = 8
+
+# Aynı host'a (panel sunucusu) aynı anda gönderilebilecek en fazla yoklama (0 = sınırsız)
+HEALTH_CHECK_PER_HOST = 8
+
+# Host başına saniyede başlatılabilecek en fazla yoklama; panellerin hız
+# sınırlayıcısına takılıp 403 dönmesini önler (0 = sınırsız)
+HEALTH_CHECK_HOST_RATE = 100
+
+# Host adı çözümlemelerinin (DNS) önbellekte tutulma süresi (saniye)
+HEALTH_DNS_TTL = 300
+
+# Tarama öncesi host'ları paralel çözmek için iş parçacığı sayısı
+HEALTH_DNS_WORKERS = 32
+
+# Bir host'ta art arda bu kadar bağlantı hatası/zaman aşımı olursa devre açılır ve
+# host'un kalan URL'leri yoklanmadan "❌ Sunucu Yanıt Vermiyor" olarak işaretlenir (0 = kapalı)
+HEALTH_CIRCUIT_FAILURES = 5
+
+# Host başına zaman aşımını gözlenen gecikmelerden uyarla (p95 × 4, en az 1 sn,
+# en fazla HEALTH_CHECK_TIMEOUT); hızlı host'lardaki ölü URL'ler erken elenir
+HEALTH_ADAPTIVE_TIMEOUT = True
+
+# Sağlıklı ama yavaş host'larda p95 süresini aşan yoklamaya yedek istek gönderilir;
+# yedekler host'un yoklamalarının bu oranını geçmez (0 = kapalı)
+HEALTH_HEDGE_RATIO = 0.1
+
+# Sağlık sonucunun taze sayıldığı süre (saniye). Sonuçlar tüm oturumların
+# paylaştığı bir veritabanında saklanır; "Sağlık Kontrolü" yalnızca bu süreden
+# eski veya hiç kontrol edilmemiş URL'leri yeniden yoklar
+HEALTH_RESULT_MAX_AGE = 3600
+
+# Varsayılan yoklama kademesi:
+#   "connect" → yalnızca sunucuya TCP/TLS bağlantısı (en ucuz; rtmp/rtsp/udp dahil)
+#   "head"    → HEAD, gerekirse ilk 1KB için GET
+#   "get"     → derin HLS testi: liste → ilk varyant → ilk segment indirilir; gerçek
+#               oynatılabilirlik, ilk bayt süresi (TTFB), segment hızı, bant genişliği
+#               ve çözünürlük ölçülür
+HEALTH_CHECK_TIER = "head"
+
+# Önce her sunucuya (şema://host:port) bir kez bağlantı denensin mi? Yalnızca
+# bağlantı kabul eden sunuculardaki URL'ler seçilen HTTP kademesiyle yoklanır
+HEALTH_CHECK_ESCALATE = True
+
+# Derin testte kanal başına indirilecek en fazla veri (KB; liste + varyant + segment)
+HEALTH_DEEP_PROBE_MAX_KB = 512
+
+# Derin testte kanal başına toplam süre sınırı (saniye)
+HEALTH_DEEP_PROBE_BUDGET = 10
+
+# Arka planda aynı anda çalışan sağlık kontrolü işi sayısı (fazlası sırada bekler)
+HEALTH_JOB_WORKERS = 1
+
+# İlerlemesi/sonuçları sorgulanabilir tutulan en fazla iş (bitenler önce silinir)
+HEALTH_JOB_HISTORY = 20
 
 # === FAVORİ & GEÇMİŞ ===
 
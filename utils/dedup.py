@@ -0,0 +1,197 @@
+"""Yinelenen ve benzer kanal tespiti.
+
+Kanal adları (kalite ekleri, ülke önekleri ve noktalama atılarak) ve URL'ler
+(izleme parametreleri atılarak) normalleştirilir, her iki anahtar da hash
+tablosuyla tamsayı kodlara çevrilir. Aynı ad anahtarını veya aynı URL
+anahtarını paylaşan satırlar aynı kümeye düşer; kümeler, satırlar ile
+anahtar kodları arasındaki bağlantılar üzerinden en küçük etiket yayılımıyla
+(vektörel bağlı bileşen) bulunur. Her küme, ilk satırının konumuyla etiketlenir.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.search import _fold_series
+
+KEEP_FIRST = "keep-first"
+KEEP_HEALTHIEST = "keep-healthiest"
+MERGE = "merge"
+POLICIES = (KEEP_FIRST, KEEP_HEALTHIEST, MERGE)
+
+# Ad başındaki ülke/sağlayıcı öneki: "TR:", "TR |", "[TR]", "(UK)", "DE -"
+_PREFIX_RE = re.compile(r"^\s*(?:[\[(]\s*[a-z]{2,3}\s*[\])]\s*[:|\-]?|[a-z]{2,3}\s*[:|])\s*")
+# Kalite / codec / yedek ekleri
+_QUALITY_RE = re.compile(
+    r"(?<![^\W_])(?:u?hd|fhd|sd|hq|lq|[48]k|hevc|h\.?26[45]|\d{3,4}[pi]|50fps|60fps|raw|backup|yedek)(?![^\W_])"
+)
+# Harf/rakam dışındaki her şey (boşluklar dahil): "TRT 1" ≡ "TRT1"
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+# URL'den atılan izleme parametreleri
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "yclid", "mc_cid", "mc_eid", "_", "ts", "timestamp", "cb", "nocache"})
+# Sorgu dizesinde izleme parametresi var mı? (yoksa sorgu hiç ayrıştırılmaz)
+_TRACKING_RE = re.compile(
+    r"(?:^|&)(?:utm_[^=&]*|" + "|".join(re.escape(name) for name in sorted(_TRACKING_PARAMS)) + r")(?:=|&|$)",
+    re.IGNORECASE,
+)
+
+# Sağlık durumlarının tercih sırası (küçük olan daha sağlıklı)
+_STATUS_RANK = (("✅", 0), ("🔀", 1), ("⚠", 2), ("❔", 3), ("🔑", 4), ("🔒", 5), ("⏱", 6), ("❌", 7))
+
+
+def normalize_name(name: str) -> str:
+    """Kanal adını karşılaştırma anahtarına çevirir (``TR: TRT 1 HD`` → ``trt1``)."""
+    return _normalize_folded(_fold_series(pd.Series([name])).iloc[0])
+
+
+def _normalize_folded(folded: str) -> str:
+    key = _NON_ALNUM_RE.sub("", _QUALITY_RE.sub(" ", _PREFIX_RE.sub("", folded)))
+    # Ad yalnızca önek/ekten ibaretse ("HD", "TR: ") önek atılmadan denenir
+    return key or _NON_ALNUM_RE.sub("", folded)
+
+
+def _is_tracking_param(pair: str) -> bool:
+    key = pair.partition("=")[0].lower()
+    return key in _TRACKING_PARAMS or key.startswith("utm_")
+
+
+def normalize_url(url: str) -> str:
+    """URL'yi karşılaştırma anahtarına çevirir: şema/host küçük harf, parça ve izleme parametreleri atılır."""
+    url, _, _ = url.strip().partition("#")
+    url, sep, query = url.partition("?")
+    if query and _TRACKING_RE.search(query):
+        query = "&".join(pair for pair in query.split("&") if pair and not _is_tracking_param(pair))
+    scheme, sep_scheme, rest = url.partition("://")
+    if sep_scheme:
+        host, slash, path = rest.partition("/")
+        url = f"{scheme.lower()}://{host.lower()}{slash}{path}"
+    return f"{url}?{query}" if query else url
+
+
+def _name_codes(names: pd.Series) -> np.ndarray:
+    folded = _fold_series(names)
+    codes, uniques = pd.factorize(folded)
+    # Benzersiz adlar bir kez normalleştirilir, sonra kodlar üzerinden yayılır
+    keys = [_normalize_folded(value) for value in np.asarray(uniques, dtype=object)]
+    key_codes, _ = pd.factorize(pd.Series(keys, dtype=object))
+    empty = np.array([not key for key in keys], dtype=bool)
+    result = key_codes[codes]
+    # Boş anahtarlar (ör. adsız kanallar) birbirine bağlanmaz
+    result[empty[codes]] = -1
+    return result
+
+
+def _url_codes(urls: pd.Series) -> np.ndarray:
+    codes, uniques = pd.factorize(urls.astype(str))
+    uniques = np.asarray(uniques, dtype=object)
+    key_codes, _ = pd.factorize(pd.Series([normalize_url(value) for value in uniques], dtype=object))
+    result = key_codes[codes]
+    result[np.asarray([not value.strip() for value in uniques], dtype=bool)[codes]] = -1
+    return result
+
+
+def _propagate(labels: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Aynı kodu paylaşan satırların etiketini, grubun en küçük etiketine indirir."""
+    linked = codes >= 0
+    if not linked.any():
+        return labels
+    group_min = np.full(int(codes.max()) + 1, len(labels), dtype=labels.dtype)
+    np.minimum.at(group_min, codes[linked], labels[linked])
+    result = labels.copy()
+    result[linked] = np.minimum(labels[linked], group_min[codes[linked]])
+    return result
+
+
+def cluster_labels(df: pd.DataFrame) -> np.ndarray:
+    """Her satır için yinelenen kümesinin etiketini (kümedeki ilk satırın konumu) döndürür."""
+    size = len(df)
+    labels = np.arange(size, dtype=np.int64)
+    if not size:
+        return labels
+    name_codes = _name_codes(df["Kanal Adı"])
+    url_codes = _url_codes(df["URL"])
+    while True:
+        updated = _propagate(_propagate(labels, name_codes), url_codes)
+        # Etiketler zincir boyunca köke kadar sıkıştırılır (union-find'daki yol sıkıştırma gibi)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _health_rank(df: pd.DataFrame) -> np.ndarray:
+    if "Durum" not in df.columns:
+        return np.zeros(len(df), dtype=np.int8)
+    statuses = df["Durum"].astype("category")
+    category_rank = np.array(
+        [next((rank for marker, rank in _STATUS_RANK if marker in str(value)), 3) for value in statuses.cat.categories],
+        dtype=np.int8,
+    )
+    codes = statuses.cat.codes.to_numpy()
+    return np.where(codes >= 0, category_rank[codes] if len(category_rank) else 3, 3)
+
+
+def representative_mask(df: pd.DataFrame, labels: np.ndarray, policy: str = KEEP_FIRST) -> np.ndarray:
+    """Her kümeden tutulacak satırın maskesini döndürür."""
+    if policy not in POLICIES:
+        raise ValueError(f"Bilinmeyen politika: {policy}")
+    mask = np.zeros(len(labels), dtype=bool)
+    if policy == KEEP_FIRST:
+        mask[labels] = True
+        return mask
+    # En sağlıklı satır; eşitlikte listedeki ilk satır
+    order = np.lexsort((np.arange(len(labels)), _health_rank(df), labels))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = labels[order][1:] != labels[order][:-1]
+    mask[order[first]] = True
+    return mask
+
+
+def deduplicate(df: pd.DataFrame, policy: str = KEEP_FIRST, labels: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Yinelenen kanalları seçilen politikaya göre ayıklar.
+
+    Args:
+        df: Kanal tablosu
+        policy: ``keep-first`` (ilk satır), ``keep-healthiest`` (en sağlıklı durum)
+            veya ``merge`` (en sağlıklı satır kalır, diğer URL'ler ``Alternatifler`` sütununa yazılır)
+        labels: Önceden hesaplanmış ``cluster_labels`` sonucu
+
+    Returns:
+        Ayıklanmış tablo (satır etiketleri korunur)
+    """
+    if labels is None:
+        labels = cluster_labels(df)
+    mask = representative_mask(df, labels, policy)
+    if mask.all():
+        return df
+    result = df[mask]
+    if policy != MERGE:
+        return result
+
+    alternates = np.full(len(result), None, dtype=object)
+    duplicated = np.flatnonzero(~mask)
+    if len(duplicated):
+        # Temsilci olmayan satırların URL'leri, kümelerinin temsilcisine eklenir
+        keeper_of_label = np.zeros(len(labels), dtype=np.int64)
+        keeper_of_label[labels[mask]] = np.flatnonzero(mask)
+        keeper_rows = keeper_of_label[labels[duplicated]]
+        order = np.argsort(keeper_rows, kind="stable")
+        keepers, starts = np.unique(keeper_rows[order], return_index=True)
+        urls = df["URL"].to_numpy(dtype=object)[duplicated[order]]
+        position_in_result = np.cumsum(mask) - 1
+        for keeper, group_urls in zip(keepers, np.split(urls, starts[1:])):
+            alternates[position_in_result[keeper]] = group_urls.tolist()
+    result = result.copy()
+    result["Alternatifler"] = alternates
+    return result
+
+
+def duplicate_count(labels: np.ndarray) -> int:
+    """Kümelerde fazladan bulunan (ayıklanacak) satır sayısı."""
+    return int(len(labels) - len(np.unique(labels)))
+
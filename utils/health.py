@@ -0,0 +1,1516 @@
+"""Asenkron kanal sağlık kontrolü motoru.
+
+Her URL için engelleyici bir ``urllib`` isteği ve iş parçacığı yerine tek
+bir asyncio döngüsünde bloklamayan soketler üzerinden çalışan küçük bir
+HTTP/1.1 istemcisi kullanılır. Sabit sayıda işçi görev, URL'leri ortak bir
+sıradan çeker; böylece binlerce eşzamanlı yoklama tek çekirdekte ve URL
+sayısından bağımsız bellekle yürür. Durum metinleri ``parser._check_single_url``
+ile aynıdır (``✅ Aktif``, ``🔒 Yasaklı``, ``⏱️ Zaman Aşımı`` ...).
+
+Aynı sunucuya giden yoklamalar ``ConnectionPool`` üzerinden keep-alive
+bağlantıları paylaşır; yeni TLS bağlantıları da önceki oturumu yeniden
+kullanarak (session resumption) tam el sıkışmayı atlar.
+
+Yoklama sırasını ``HostScheduler`` belirler: yinelenen URL'ler bir kez
+kontrol edilir, URL'ler host'a göre kovalanır ve host'lar sırayla (round
+robin) işlenir; her host için eşzamanlı yoklama ve saniyedeki istek sayısı
+sınırlanır, böylece tek bir panel hız sınırlayıcısına takılmaz.
+
+Host adları süreç genelindeki ``DNS_CACHE``'te TTL ile saklanır; tarama
+başlamadan önce tüm benzersiz host'lar paralel çözülür ve çözülemeyen
+host'ların URL'leri yoklanmadan ``❌ DNS Hatası`` olarak işaretlenir.
+
+İsteğe bağlı derin HLS yoklaması (``deep_probe_url``) listeyi indirip ana
+listeden ilk varyanta geçer ve ilk segmenti bayt sınırıyla indirir; 200
+dönen ama boş/bayat liste sunan panelleri ayırır ve ilk bayt süresi,
+segment indirme hızı ile ilan edilen bant genişliği/çözünürlüğü ölçer.
+
+Yoklama kademeleri (``TIER_*``) maliyete göre sıralıdır: ``connect`` yalnızca
+sunucuya TCP/TLS bağlantısı açar (rtmp/rtsp/udp gibi HTTP dışı akışları da
+kapsar ve her ``şema://host:port`` için bir kez yapılır), ``head`` HEAD ve
+gerekirse kısa GET, ``get`` ise derin HLS yoklamasıdır. Yükseltmeli
+(``escalate``) taramada önce bağlantı kademesi çalışır; yalnızca bağlantı
+kabul eden sunuculardaki URL'ler pahalı HTTP yoklamasına geçer.
+
+``CircuitBreaker`` host başına sonuçları izler: art arda bağlantı hatası
+veren host'un devresi açılır ve kalan URL'leri yoklanmadan işaretlenir;
+zaman aşımı host'un gözlenen gecikme yüzdeliklerinden uyarlanır ve sağlıklı
+ama yavaş host'larda gecikmiş yoklamaya yedek (hedged) istek gönderilir.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import heapq
+import ipaddress
+import logging
+import re
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+try:
+    from utils.config import USER_AGENT
+except ImportError:
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+try:
+    from utils.config import HEALTH_CHECK_TIMEOUT, HEALTH_CHECK_CONCURRENCY
+except ImportError:
+    HEALTH_CHECK_TIMEOUT = 3
+    HEALTH_CHECK_CONCURRENCY = 500
+
+try:
+    from utils.config import HEALTH_CHECK_POOL_SIZE
+except ImportError:
+    HEALTH_CHECK_POOL_SIZE = 8
+
+try:
+    from utils.config import HEALTH_CHECK_PER_HOST, HEALTH_CHECK_HOST_RATE
+except ImportError:
+    HEALTH_CHECK_PER_HOST = 8
+    HEALTH_CHECK_HOST_RATE = 100
+
+try:
+    from utils.config import HEALTH_DNS_TTL, HEALTH_DNS_WORKERS
+except ImportError:
+    HEALTH_DNS_TTL = 300
+    HEALTH_DNS_WORKERS = 32
+
+try:
+    from utils.config import HEALTH_CIRCUIT_FAILURES, HEALTH_ADAPTIVE_TIMEOUT, HEALTH_HEDGE_RATIO
+except ImportError:
+    HEALTH_CIRCUIT_FAILURES = 5
+    HEALTH_ADAPTIVE_TIMEOUT = True
+    HEALTH_HEDGE_RATIO = 0.1
+
+try:
+    from utils.config import HEALTH_DEEP_PROBE_MAX_KB, HEALTH_DEEP_PROBE_BUDGET
+except ImportError:
+    HEALTH_DEEP_PROBE_MAX_KB = 512
+    HEALTH_DEEP_PROBE_BUDGET = 10
+
+STATUS_PENDING = "❔ Bekliyor"
+STATUS_ACTIVE = "✅ Aktif"
+STATUS_WEB_PAGE = "⚠️ Web Sayfası"
+STATUS_REDIRECT = "🔀 Yönlendirme"
+STATUS_FORBIDDEN = "🔒 Yasaklı"
+STATUS_CORS_FORBIDDEN = "🔒 CORS/Yasaklı"
+STATUS_NOT_FOUND = "❌ Bulunamadı"
+STATUS_AUTH = "🔑 Yetki Gerekli"
+STATUS_TIMEOUT = "⏱️ Zaman Aşımı"
+STATUS_SSL = "🔒 SSL Hatası"
+STATUS_CONNECTION = "❌ Bağlantı Hatası"
+STATUS_DNS = "❌ DNS Hatası"
+STATUS_REACHABLE = "🔌 Erişilebilir"
+STATUS_HOST_DOWN = "❌ Sunucu Yanıt Vermiyor"
+STATUS_EMPTY_PLAYLIST = "⚠️ Boş Liste"
+STATUS_NO_SEGMENT = "⚠️ Segment Yok"
+STATUS_INVALID = "❌ Geçersiz"
+STATUS_ERROR = "❌ Hata"
+
+TIER_CONNECT = "connect"
+TIER_HEAD = "head"
+TIER_GET = "get"
+TIERS = (TIER_CONNECT, TIER_HEAD, TIER_GET)
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+# urllib'in HTTPRedirectHandler sınırıyla aynı
+_MAX_REDIRECTS = 10
+# Yanıt başlıkları için üst sınır (bozuk/kötü niyetli sunuculara karşı)
+_HEADER_LIMIT = 64 * 1024
+# Kısa GET'te okunan gövde miktarı
+_GET_BYTES = 1024
+# Bağlantıyı yeniden kullanabilmek için sonuna kadar okunan en büyük gövde
+_DRAIN_LIMIT = 64 * 1024
+# Boşta bekleyen keep-alive bağlantısının atılma süresi (saniye)
+_IDLE_TIMEOUT = 10.0
+# Açık dosya sınırından ayrılan pay (Streamlit, proxy, log dosyaları)
+_RESERVED_FDS = 64
+# Çözülemeyen host'ların önbellekte kalma süresi (saniye)
+_DNS_NEGATIVE_TTL = 60
+# Gövde okuma parça boyutu
+_READ_CHUNK = 64 * 1024
+# Derin yoklamada izlenen en fazla iç içe liste (ana liste → varyant)
+_MAX_PLAYLIST_DEPTH = 3
+# Host'un çalışmadığını gösteren sonuçlar (HTTP hata kodları host'un ayakta olduğunu gösterir)
+_HOST_FAILURES = frozenset((STATUS_TIMEOUT, STATUS_CONNECTION, STATUS_SSL, STATUS_DNS))
+# Uyarlanan zaman aşımı: p95 gecikmesinin katı, alt sınırı ve gereken en az örnek
+_ADAPTIVE_FACTOR = 4.0
+_ADAPTIVE_FLOOR = 1.0
+_ADAPTIVE_MIN_SAMPLES = 8
+# Host başına saklanan son başarılı gecikmeler
+_LATENCY_WINDOW = 64
+# Bağlantı yoklamasında şemaların varsayılan portları
+_SCHEME_PORTS = {
+    "http": 80,
+    "https": 443,
+    "rtmp": 1935,
+    "rtmpt": 80,
+    "rtmps": 443,
+    "rtsp": 554,
+    "rtsps": 322,
+    "mms": 1755,
+    "mmsh": 80,
+}
+_TLS_SCHEMES = ("https", "rtmps", "rtsps")
+# Bağlantısız akışlar: sunucuya bağlanılamaz, ilk datagram beklenir (port zorunlu)
+_UDP_SCHEMES = ("udp", "rtp")
+
+_HLS_ATTR_RE = {
+    "bandwidth": re.compile(r"(?:^|,)BANDWIDTH=(\d+)"),
+    "resolution": re.compile(r"(?:^|,)RESOLUTION=(\d+x\d+)"),
+}
+
+
+class ProbeResult(NamedTuple):
+    """Tek bir URL yoklamasının sonucu."""
+
+    status: str
+    code: Optional[int] = None
+    latency: Optional[float] = None
+
+
+class DeepProbeResult(NamedTuple):
+    """Derin HLS yoklamasının sonucu (ölçülemeyen alanlar None).
+
+    ``ttfb`` ilk listenin ilk yanıt baytına kadar geçen süre (saniye),
+    ``throughput`` segment indirme hızı (kbit/s), ``bandwidth`` ana listede
+    ilan edilen varyant bant genişliği (kbit/s), ``resolution`` ``"1920x1080"``
+    biçiminde çözünürlüktür.
+    """
+
+    status: str
+    code: Optional[int] = None
+    latency: Optional[float] = None
+    ttfb: Optional[float] = None
+    throughput: Optional[float] = None
+    bandwidth: Optional[float] = None
+    resolution: Optional[str] = None
+
+
+class _Response(NamedTuple):
+    code: int
+    headers: Dict[str, str]
+    keep_alive: bool = False
+    url: str = ""
+    # Başlıkların alındığı an (time.perf_counter)
+    received_at: float = 0.0
+    # body="keep"/"count" ile okunan gövde ve okunan bayt sayısı
+    body: bytes = b""
+    body_size: int = 0
+
+
+def _head_status(code: int, content_type: str) -> str:
+    if code == 200:
+        return STATUS_WEB_PAGE if "text/html" in content_type else STATUS_ACTIVE
+    if code in _REDIRECT_CODES:
+        return STATUS_REDIRECT
+    if code == 403:
+        return STATUS_FORBIDDEN
+    if code == 404:
+        return STATUS_NOT_FOUND
+    if code == 401:
+        return STATUS_AUTH
+    return f"⚠️ HTTP {code}"
+
+
+def _get_status(code: int) -> str:
+    if code in (200, 206):
+        return STATUS_ACTIVE
+    if code == 403:
+        return STATUS_CORS_FORBIDDEN
+    return f"⚠️ HTTP {code}"
+
+
+def _error_status(error: BaseException) -> str:
+    if isinstance(error, socket.gaierror):
+        return STATUS_DNS
+    if isinstance(error, TimeoutError):
+        return STATUS_TIMEOUT
+    if isinstance(error, ssl.SSLError) or "certificate" in str(error).lower():
+        return STATUS_SSL
+    if isinstance(error, OSError):
+        return STATUS_CONNECTION
+    return STATUS_ERROR
+
+
+def _request_target(parts: urllib.parse.SplitResult) -> str:
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return target.replace(" ", "%20")
+
+
+def _parse_head(head: bytes) -> _Response:
+    lines = head.decode("latin-1").split("\r\n")
+    version, _, rest = lines[0].partition(" ")
+    if not version.startswith("HTTP/"):
+        raise ValueError(f"Geçersiz HTTP yanıtı: {lines[0][:80]!r}")
+    code = int(rest.split(" ", 1)[0])
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    connection = headers.get("connection", "").lower()
+    keep_alive = "keep-alive" in connection if version == "HTTP/1.0" else "close" not in connection
+    return _Response(code, headers, keep_alive)
+
+
+def _body_length(method: str, response: _Response) -> Optional[int]:
+    """Yanıt gövdesinin bayt sayısı; sınırsız/bilinmiyorsa None."""
+    if method == "HEAD" or response.code in (204, 304) or response.code < 200:
+        return 0
+    if "chunked" in response.headers.get("transfer-encoding", "").lower():
+        return None
+    try:
+        return int(response.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _read_body(
+    reader: asyncio.StreamReader, method: str, response: _Response, limit: int, keep: bool
+) -> Tuple[bytes, int, bool]:
+    """Gövdeden en fazla ``limit`` bayt okur: ``(gövde, okunan bayt, gövde tamamen okundu mu)``.
+
+    ``keep=False`` ise okunan veri saklanmadan sayılır (segment indirme).
+    """
+    parts: List[bytes] = []
+    size = 0
+
+    async def take(count: int) -> bool:
+        # ``count`` bayt okur; sınır aşılırsa kalanını okumadan False döndürür
+        nonlocal size
+        while count:
+            piece = await reader.read(min(count, limit - size, _READ_CHUNK))
+            if not piece:
+                raise asyncio.IncompleteReadError(b"", count)
+            size += len(piece)
+            count -= len(piece)
+            if keep:
+                parts.append(piece)
+            if size >= limit and count:
+                return False
+        return True
+
+    length = _body_length(method, response)
+    if length is not None:
+        complete = await take(min(length, limit)) and length <= limit
+    elif "chunked" in response.headers.get("transfer-encoding", "").lower():
+        complete = False
+        while size < limit:
+            chunk_size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if chunk_size == 0:
+                # Son parça: trailer başlıkları boş satıra kadar atlanır
+                while (await reader.readline()).strip():
+                    pass
+                complete = True
+                break
+            if not await take(chunk_size):
+                break
+            await reader.readexactly(2)
+    else:
+        # Uzunluk bildirilmemiş: bağlantı kapanana (veya sınıra) kadar okunur
+        while size < limit:
+            piece = await reader.read(min(limit - size, _READ_CHUNK))
+            if not piece:
+                break
+            size += len(piece)
+            if keep:
+                parts.append(piece)
+        complete = False
+    return b"".join(parts), size, complete
+
+
+def endpoint(url: str) -> Optional[Tuple[str, str, int]]:
+    """Bağlantı yoklamasının hedefi ``(şema, host, port)``; desteklenmeyen URL'de None."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme in _UDP_SCHEMES:
+        # udp://@:1234 → yerel portu dinle, udp://@239.0.0.1:1234 → çoklu yayın grubuna katıl
+        return (scheme, host, port) if port else None
+    default_port = _SCHEME_PORTS.get(scheme)
+    if not host or default_port is None:
+        return None
+    return scheme, host, port or default_port
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """Süreç genelinde paylaşılan, TTL'li host adı → IP adresleri önbelleği.
+
+    Çözümleme ayrı bir iş parçacığı havuzunda ``getaddrinfo`` ile yapılır;
+    aynı host için eşzamanlı istekler tek bir çözümlemeyi bekler. Başarısız
+    çözümlemeler de kısa bir süre önbellekte tutulur. Farklı olay
+    döngülerinden (ör. art arda ``check_urls`` çağrıları) güvenle kullanılabilir.
+
+    Args:
+        ttl: Başarılı çözümlemenin geçerlilik süresi (saniye)
+        workers: Paralel çözümleme için iş parçacığı sayısı
+    """
+
+    def __init__(self, ttl: float = HEALTH_DNS_TTL, workers: int = HEALTH_DNS_WORKERS) -> None:
+        self.ttl = ttl
+        self.workers = workers
+        self._entries: Dict[str, Tuple[float, object]] = {}
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _getaddrinfo(host: str) -> List[str]:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def _finish(self, host: str, future: concurrent.futures.Future) -> None:
+        if future.cancelled():
+            # Havuz kapatılırken iptal edilen çözümleme önbelleğe yazılmaz
+            with self._lock:
+                self._inflight.pop(host, None)
+            return
+        error = future.exception()
+        if error is None:
+            entry = (time.monotonic() + self.ttl, future.result())
+        elif isinstance(error, socket.gaierror):
+            entry = (time.monotonic() + _DNS_NEGATIVE_TTL, error)
+        else:
+            entry = None
+        with self._lock:
+            self._inflight.pop(host, None)
+            if entry is not None and self.ttl > 0:
+                self._entries[host] = entry
+
+    def _lookup(self, host: str):
+        """Önbellekteki sonuç (adres listesi veya hata) ya da süren çözümlemenin Future'ı."""
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    return entry[1]
+                del self._entries[host]
+            future = self._inflight.get(host)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix="dns")
+            future = self._executor.submit(self._getaddrinfo, host)
+            self._inflight[host] = future
+        # Kilit dışında: çözümleme çoktan bittiyse geri çağrı hemen bu iş parçacığında çalışır
+        future.add_done_callback(lambda done: self._finish(host, done))
+        return future
+
+    async def resolve(self, host: str) -> List[str]:
+        """Host'un IP adreslerini döndürür; çözülemezse ``socket.gaierror`` yükseltir."""
+        if _is_ip_address(host):
+            return [host]
+        result = self._lookup(host)
+        if isinstance(result, concurrent.futures.Future):
+            # Bekleyenin iptali paylaşılan çözümlemeyi iptal etmez; diğer
+            # bekleyenler ve sonraki taramalar aynı sonucu kullanır
+            result = await asyncio.shield(asyncio.wrap_future(result))
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def prefetch(self, hosts: Iterable[str], timeout: Optional[float] = None) -> Set[str]:
+        """Host'ları paralel çözer ve çözülemeyenlerin kümesini döndürür.
+
+        ``timeout`` içinde bitmeyen çözümlemeler başarısız sayılmaz; arka
+        planda sürer ve ilgili yoklamalar sonucu bekler. Süre dolunca yalnızca
+        bekleme bırakılır, çözümlemeler iptal edilmez.
+        """
+        tasks = {
+            asyncio.ensure_future(self.resolve(host)): host
+            for host in dict.fromkeys(hosts)
+            if host and not _is_ip_address(host)
+        }
+        if not tasks:
+            return set()
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        return {tasks[task] for task in done if isinstance(task.exception(), socket.gaierror)}
+
+    def clear(self) -> None:
+        """Önbelleği boşaltır."""
+        with self._lock:
+            self._entries.clear()
+
+
+DNS_CACHE = DNSCache()
+
+
+class _ResumingContext(ssl.SSLContext):
+    """Aynı sunucuya açılan yeni TLS bağlantılarına son oturumu veren SSL bağlamı.
+
+    asyncio, TLS nesnesini ``wrap_bio`` ile oluşturur ve oturum parametresi
+    geçmez; burada sunucu adına göre saklanan oturum eklenir.
+    """
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and server_hostname:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+
+def _resuming_context() -> _ResumingContext:
+    # Sertifika doğrulaması parser'daki kontrolle aynı şekilde kapalıdır
+    context = _ResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.sessions = {}
+    return context
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "idle_since")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+    def usable(self) -> bool:
+        return (
+            not self.writer.is_closing()
+            and not self.reader.at_eof()
+            and time.monotonic() - self.idle_since < _IDLE_TIMEOUT
+        )
+
+    def close(self) -> None:
+        # Yoklama bağlantısı hemen kapatılır; TLS kapanış el sıkışması beklenmez
+        self.writer.transport.abort()
+
+
+class ConnectionPool:
+    """Sunucu (şema, host, port) başına keep-alive bağlantı havuzu.
+
+    Yanıtı tamamen okunan bağlantılar havuza geri konur ve aynı sunucuya
+    giden sonraki yoklamada yeniden kullanılır. Yeni TLS bağlantıları,
+    sunucunun son oturum biletini kullanarak kısaltılmış el sıkışma yapar.
+
+    Args:
+        max_per_host: Sunucu başına boşta tutulan en fazla bağlantı
+            (0 = her istekte yeni bağlantı, ``Connection: close``)
+        dns: Host adlarını çözen önbellek (varsayılan: ``DNS_CACHE``)
+    """
+
+    def __init__(self, max_per_host: int = HEALTH_CHECK_POOL_SIZE, dns: Optional[DNSCache] = None) -> None:
+        self.max_per_host = max_per_host
+        self.dns = dns or DNS_CACHE
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = {}
+        self._ssl_context = _resuming_context()
+        self.stats = {"opened": 0, "reused": 0, "tls_resumed": 0}
+
+    async def _connect(self, key: Tuple[str, str, int]) -> _Connection:
+        scheme, host, port = key
+        secure = scheme in _TLS_SCHEMES
+        addresses = await self.dns.resolve(host)
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"Adres bulunamadı: {host}")
+        for position, address in enumerate(addresses):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    address,
+                    port,
+                    ssl=self._ssl_context if secure else None,
+                    server_hostname=host if secure else None,
+                    limit=_HEADER_LIMIT,
+                )
+                break
+            except OSError:
+                # Sıradaki adres denenir (ör. IPv6 erişilemiyorsa IPv4)
+                if position == len(addresses) - 1:
+                    raise
+        self.stats["opened"] += 1
+        if secure:
+            ssl_object = writer.get_extra_info("ssl_object")
+            if ssl_object is not None and ssl_object.session_reused:
+                self.stats["tls_resumed"] += 1
+        return _Connection(reader, writer)
+
+    def _take_idle(self, key: Tuple[str, str, int]) -> Optional[_Connection]:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn.usable():
+                return conn
+            conn.close()
+        return None
+
+    def _release(self, key: Tuple[str, str, int], conn: _Connection, reusable: bool) -> None:
+        if key[0] in _TLS_SCHEMES:
+            ssl_object = conn.writer.get_extra_info("ssl_object")
+            # TLS 1.3'te oturum bileti el sıkışmadan sonra gelir; bu yüzden yanıttan sonra saklanır
+            if ssl_object is not None and ssl_object.session is not None:
+                self._ssl_context.sessions[key[1]] = ssl_object.session
+        idle = self._idle.setdefault(key, [])
+        if reusable and len(idle) < self.max_per_host:
+            conn.idle_since = time.monotonic()
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def request(
+        self,
+        url: str,
+        method: str,
+        *,
+        timeout: float,
+        user_agent: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        body_bytes: int = 0,
+        body: str = "skip",
+    ) -> _Response:
+        """Tek bir HTTP/1.1 isteği gönderir; yanıt başlıklarını (ve en fazla ``body_bytes`` gövde baytını) okur.
+
+        ``body="keep"`` ise gövdenin ilk ``body_bytes`` baytı yanıtın ``body``
+        alanında döndürülür; ``body="count"`` ise okunup yalnızca sayılır
+        (``body_size``).
+        """
+        parts = urllib.parse.urlsplit(url)
+        host = parts.hostname
+        if not host:
+            raise ValueError(f"Geçersiz URL: {url}")
+        key = (parts.scheme, host, parts.port or (443 if parts.scheme == "https" else 80))
+        host_header = host if parts.port is None else f"{host}:{parts.port}"
+        lines = [
+            f"{method} {_request_target(parts)} HTTP/1.1",
+            f"Host: {host_header}",
+            f"User-Agent: {user_agent}",
+            "Accept: */*",
+            "Connection: keep-alive" if self.max_per_host > 0 else "Connection: close",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", "replace")
+
+        async with asyncio.timeout(timeout):
+            conn = self._take_idle(key)
+            if conn is not None:
+                self.stats["reused"] += 1
+                try:
+                    return await self._exchange(key, conn, url, method, payload, body_bytes, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # Sunucu boştaki bağlantıyı kapatmış; yeni bağlantıyla bir kez daha denenir
+                    pass
+            conn = await self._connect(key)
+            return await self._exchange(key, conn, url, method, payload, body_bytes, body)
+
+    async def _exchange(
+        self,
+        key: Tuple[str, str, int],
+        conn: _Connection,
+        url: str,
+        method: str,
+        payload: bytes,
+        body_bytes: int,
+        body: str = "skip",
+    ) -> _Response:
+        reusable = False
+        try:
+            conn.writer.write(payload)
+            await conn.writer.drain()
+            response = _parse_head(await conn.reader.readuntil(b"\r\n\r\n"))
+            response = response._replace(url=url, received_at=time.perf_counter())
+            if body != "skip":
+                data, size, complete = await _read_body(conn.reader, method, response, body_bytes, keep=body == "keep")
+                reusable = complete and response.keep_alive and self.max_per_host > 0
+                return response._replace(body=data, body_size=size)
+            length = _body_length(method, response)
+            if length is not None and length <= max(body_bytes, _DRAIN_LIMIT):
+                # Gövde sonuna kadar okunursa bağlantı sonraki yoklamaya hazırdır
+                if length:
+                    await conn.reader.readexactly(length)
+                reusable = response.keep_alive and self.max_per_host > 0
+            elif body_bytes:
+                await conn.reader.read(body_bytes)
+            return response
+        finally:
+            self._release(key, conn, reusable)
+
+    async def connect(self, key: Tuple[str, str, int], *, timeout: float) -> None:
+        """``(şema, host, port)`` sunucusuna TCP (TLS şemalarında TLS) bağlantısı açıp kapatır.
+
+        Bağlantı havuzda tutulmaz (binlerce sunucuda dosya tanımlayıcısı
+        tüketmemek için); TLS oturumu ise sonraki HTTP yoklaması için saklanır.
+        """
+        async with asyncio.timeout(timeout):
+            conn = await self._connect(key)
+        self._release(key, conn, reusable=False)
+
+    def close(self) -> None:
+        """Boşta bekleyen tüm bağlantıları kapatır."""
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+
+async def _request_following_redirects(pool: ConnectionPool, url: str, method: str, **options) -> _Response:
+    for _ in range(_MAX_REDIRECTS):
+        response = await pool.request(url, method, **options)
+        location = response.headers.get("location")
+        if response.code not in _REDIRECT_CODES or not location:
+            return response
+        url = urllib.parse.urljoin(url, location)
+        if not url.startswith(("http://", "https://")):
+            return response
+    return response
+
+
+async def probe_url(
+    url: str,
+    *,
+    pool: Optional[ConnectionPool] = None,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
+    user_agent: Optional[str] = None,
+) -> ProbeResult:
+    """URL'yi ``_check_single_url`` ile aynı stratejiyle yoklar: önce HEAD, gerekirse 1KB'lık GET."""
+    if not url or not url.startswith(("http://", "https://")):
+        return ProbeResult(STATUS_INVALID)
+    if pool is None:
+        pool = ConnectionPool(max_per_host=0)
+    options = {"timeout": timeout, "user_agent": user_agent or USER_AGENT}
+    start = time.perf_counter()
+
+    # ── 1. HEAD (gövde indirilmez) ──
+    try:
+        response = await _request_following_redirects(pool, url, "HEAD", **options)
+        if response.code != 405:
+            status = _head_status(response.code, response.headers.get("content-type", "").lower())
+            return ProbeResult(status, response.code, time.perf_counter() - start)
+    except socket.gaierror:
+        # Host çözülemiyorsa GET de başarısız olur
+        return ProbeResult(STATUS_DNS, None, time.perf_counter() - start)
+    except Exception:
+        # HEAD başarısız → GET denenir
+        pass
+
+    # ── 2. Kısa GET (yalnızca ilk 1KB) ──
+    try:
+        response = await _request_following_redirects(
+            pool, url, "GET", extra_headers={"Range": f"bytes=0-{_GET_BYTES - 1}"}, body_bytes=_GET_BYTES, **options
+        )
+    except Exception as e:
+        return ProbeResult(_error_status(e), None, time.perf_counter() - start)
+    return ProbeResult(_get_status(response.code), response.code, time.perf_counter() - start)
+
+
+async def _receive_datagram(host: str, port: int, dns: DNSCache, timeout: float) -> None:
+    """``port``'a (çoklu yayın adresinde gruba katılarak) gelen ilk UDP datagramını bekler."""
+    address = (await dns.resolve(host))[0] if host else ""
+    multicast = bool(address) and ipaddress.ip_address(address).is_multicast
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    try:
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("", port))
+        if multicast and family == socket.AF_INET:
+            membership = socket.inet_aton(address) + socket.inet_aton("0.0.0.0")
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        elif multicast:
+            membership = socket.inet_pton(family, address) + (0).to_bytes(4, "little")
+            sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_JOIN_GROUP, membership)
+        async with asyncio.timeout(timeout):
+            await asyncio.get_running_loop().sock_recv(sock, 2048)
+    finally:
+        sock.close()
+
+
+async def connect_probe_url(
+    url: str,
+    *,
+    pool: Optional[ConnectionPool] = None,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
+) -> ProbeResult:
+    """En ucuz yoklama: URL'nin sunucusunun bağlantı kabul edip etmediğine bakar.
+
+    TCP tabanlı şemalarda (http, rtmp, rtsp ...) yalnızca bağlantı (TLS
+    şemalarında el sıkışma) yapılır ve istek gönderilmez; başarılıysa
+    ``🔌 Erişilebilir`` döner. ``udp://``/``rtp://`` akışlarında ilk datagram
+    beklenir; gelirse ``✅ Aktif`` döner.
+    """
+    target = endpoint(url)
+    if target is None:
+        return ProbeResult(STATUS_INVALID)
+    if pool is None:
+        pool = ConnectionPool(max_per_host=0)
+    scheme, host, port = target
+    start = time.perf_counter()
+    try:
+        if scheme in _UDP_SCHEMES:
+            await _receive_datagram(host, port, pool.dns, timeout)
+            return ProbeResult(STATUS_ACTIVE, None, time.perf_counter() - start)
+        await pool.connect(target, timeout=timeout)
+    except Exception as e:
+        return ProbeResult(_error_status(e), None, time.perf_counter() - start)
+    return ProbeResult(STATUS_REACHABLE, None, time.perf_counter() - start)
+
+
+def _parse_hls(text: str) -> Tuple[List[Tuple[str, Optional[float], Optional[str]]], List[str]]:
+    """HLS listesini ``([(varyant URI, bant genişliği kbit/s, çözünürlük)], [segment URI])`` olarak ayırır."""
+    variants: List[Tuple[str, Optional[float], Optional[str]]] = []
+    segments: List[str] = []
+    stream_info: Optional[str] = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if line.startswith("#EXT-X-STREAM-INF:"):
+                stream_info = line[len("#EXT-X-STREAM-INF:"):]
+            continue
+        if stream_info is not None:
+            bandwidth = _HLS_ATTR_RE["bandwidth"].search(stream_info)
+            resolution = _HLS_ATTR_RE["resolution"].search(stream_info)
+            variants.append((
+                line,
+                int(bandwidth.group(1)) / 1000 if bandwidth else None,
+                resolution.group(1) if resolution else None,
+            ))
+            stream_info = None
+        else:
+            segments.append(line)
+    return variants, segments
+
+
+def _is_playlist(response: _Response) -> bool:
+    content_type = response.headers.get("content-type", "").lower()
+    return "mpegurl" in content_type or response.body.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"#EXTM3U")
+
+
+async def deep_probe_url(
+    url: str,
+    *,
+    pool: Optional[ConnectionPool] = None,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
+    user_agent: Optional[str] = None,
+    max_bytes: int = HEALTH_DEEP_PROBE_MAX_KB * 1024,
+    budget: float = HEALTH_DEEP_PROBE_BUDGET,
+) -> DeepProbeResult:
+    """URL'yi bir oynatıcı gibi açar: liste → (ana listeyse) ilk varyant → ilk segment.
+
+    Yoklama boyunca en fazla ``max_bytes`` bayt indirilir ve toplam süre
+    ``budget`` saniyeyi geçmez; her istek ayrıca ``timeout`` ile sınırlıdır.
+    Liste olmayan yanıtlar (doğrudan TS/MP4 akışı) segment gibi ölçülür.
+    Segmenti indirilebilen kanal ``✅ Aktif``; segmentsiz liste
+    ``⚠️ Boş Liste``, indirilemeyen segment ``⚠️ Segment Yok`` olur.
+    """
+    if not url or not url.startswith(("http://", "https://")):
+        return DeepProbeResult(STATUS_INVALID)
+    if pool is None:
+        pool = ConnectionPool(max_per_host=0)
+    options = {"timeout": timeout, "user_agent": user_agent or USER_AGENT}
+    start = time.perf_counter()
+    result = DeepProbeResult(STATUS_PENDING)
+    remaining = max_bytes
+
+    try:
+        async with asyncio.timeout(budget):
+            # ── 1. Liste (ana liste ise ilk varyanta geçilir) ──
+            playlist_url = url
+            for depth in range(_MAX_PLAYLIST_DEPTH):
+                limit = remaining
+                response = await _request_following_redirects(
+                    pool, playlist_url, "GET", body="keep", body_bytes=limit, **options
+                )
+                if depth == 0:
+                    result = result._replace(code=response.code, ttfb=response.received_at - start)
+                remaining -= response.body_size
+                if response.code not in (200, 206):
+                    return result._replace(status=_get_status(response.code), latency=time.perf_counter() - start)
+                if "text/html" in response.headers.get("content-type", "").lower():
+                    return result._replace(status=STATUS_WEB_PAGE, latency=time.perf_counter() - start)
+                if not _is_playlist(response):
+                    # Doğrudan akış: listenin kendisi segment gibi ölçülür
+                    elapsed = time.perf_counter() - response.received_at
+                    return result._replace(
+                        status=STATUS_ACTIVE if response.body_size else STATUS_NO_SEGMENT,
+                        latency=time.perf_counter() - start,
+                        throughput=response.body_size * 8 / 1000 / max(elapsed, 1e-6) if response.body_size else None,
+                    )
+                text = response.body.decode("utf-8", "replace")
+                if response.body_size >= limit:
+                    # Bayt sınırında kesilen son satır eksik olabilir
+                    text = text.rsplit("\n", 1)[0]
+                variants, segments = _parse_hls(text)
+                if not variants:
+                    break
+                # Oynatıcılar gibi ilk listelenen varyantla başlanır
+                variant, bandwidth, resolution = variants[0]
+                result = result._replace(bandwidth=bandwidth, resolution=resolution)
+                playlist_url = urllib.parse.urljoin(response.url, variant)
+                if remaining <= 0:
+                    return result._replace(status=STATUS_NO_SEGMENT, latency=time.perf_counter() - start)
+            else:
+                return result._replace(status=STATUS_EMPTY_PLAYLIST, latency=time.perf_counter() - start)
+
+            if not segments:
+                return result._replace(status=STATUS_EMPTY_PLAYLIST, latency=time.perf_counter() - start)
+
+            # ── 2. İlk segment (kalan bayt bütçesiyle) ──
+            if remaining <= 0:
+                return result._replace(status=STATUS_NO_SEGMENT, latency=time.perf_counter() - start)
+            segment = await _request_following_redirects(
+                pool, urllib.parse.urljoin(response.url, segments[0]), "GET",
+                extra_headers={"Range": f"bytes=0-{remaining - 1}"}, body="count", body_bytes=remaining, **options
+            )
+            elapsed = time.perf_counter() - segment.received_at
+            if segment.code not in (200, 206) or not segment.body_size:
+                return result._replace(status=STATUS_NO_SEGMENT, latency=time.perf_counter() - start)
+            return result._replace(
+                status=STATUS_ACTIVE,
+                latency=time.perf_counter() - start,
+                throughput=segment.body_size * 8 / 1000 / max(elapsed, 1e-6),
+            )
+    except TimeoutError:
+        return result._replace(status=STATUS_TIMEOUT, latency=time.perf_counter() - start)
+    except Exception as e:
+        return result._replace(status=_error_status(e), latency=time.perf_counter() - start)
+
+
+def max_concurrency(requested: int) -> int:
+    """Eşzamanlı yoklama sayısını açık dosya sınırına göre kısıtlar."""
+    if resource is None:
+        return max(1, requested)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < requested + _RESERVED_FDS and hard != soft:
+        # Yumuşak sınır, izin verilen ölçüde yükseltilir
+        target = requested + _RESERVED_FDS if hard == resource.RLIM_INFINITY else min(hard, requested + _RESERVED_FDS)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return max(1, requested)
+    return max(1, min(requested, soft - _RESERVED_FDS))
+
+
+def host_key(url: str) -> str:
+    """URL'nin zamanlama kovası (küçük harfli host adı)."""
+    try:
+        return (urllib.parse.urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class HostScheduler:
+    """Yinelenenleri ayıklanmış URL'leri host'lar arasında sırayla dağıtan zamanlayıcı.
+
+    Her host en fazla ``per_host`` eşzamanlı yoklama alır ve ardışık iki
+    yoklamanın başlangıcı arasında en az ``1 / rate`` saniye bırakılır.
+    Sınırına takılan host, uygun olana kadar hazır kuyruğundan çıkarılır;
+    seçim host sayısından bağımsız sabit zamanda yapılır ve bir host hazır
+    olduğunda yalnızca bir bekleyen işçi uyandırılır.
+
+    ``ordered=True`` ise host'lar sırayla değil öncelikle seçilir: hazır
+    host'lardan sıradaki URL'si listede en önde olan alınır; böylece öncelik
+    sırasına dizilmiş liste, host sınırları korunarak baştan sona işlenir.
+
+    Args:
+        urls: Kontrol edilecek URL'ler (yinelenebilir)
+        per_host: Host başına eşzamanlı yoklama sınırı (0 = sınırsız)
+        rate: Host başına saniyedeki yoklama başlangıcı sınırı (0 = sınırsız)
+        ordered: URL'leri liste (öncelik) sırasıyla dağıt
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        per_host: int = HEALTH_CHECK_PER_HOST,
+        rate: float = HEALTH_CHECK_HOST_RATE,
+        ordered: bool = False,
+    ) -> None:
+        ids: Dict[str, int] = {}
+        # Her satırın benzersiz URL numarası; sonuçlar bunun üzerinden satırlara yayılır
+        self.row_ids = [ids.setdefault(url, len(ids)) for url in urls]
+        self.urls = list(ids)
+        self.multiplicity = [0] * len(self.urls)
+        for uid in self.row_ids:
+            self.multiplicity[uid] += 1
+
+        self.per_host = per_host if per_host > 0 else max(1, len(self.urls))
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._queues: Dict[str, Deque[int]] = {}
+        for uid, url in enumerate(self.urls):
+            self._queues.setdefault(host_key(url), deque()).append(uid)
+        self._active: Dict[str, int] = dict.fromkeys(self._queues, 0)
+        self._next_start: Dict[str, float] = dict.fromkeys(self._queues, 0.0)
+        self.ordered = ordered
+        # Hazır host'lar: sıralı kipte (sıradaki URL numarası, host) yığını, aksi halde FIFO
+        if ordered:
+            self._ready = [(queue[0], host) for host, queue in self._queues.items()]
+            heapq.heapify(self._ready)
+        else:
+            self._ready = deque(self._queues)
+        # Hazır kuyruğundaki veya zamanlayıcı bekleyen host'lar
+        self._queued: Set[str] = set(self._queues)
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._remaining = len(self.urls)
+
+    def _wake(self, count: int = 1) -> None:
+        while count and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    def _make_ready(self, host: str) -> None:
+        if self.ordered:
+            if self._queues[host]:
+                heapq.heappush(self._ready, (self._queues[host][0], host))
+        else:
+            self._ready.append(host)
+        self._wake()
+
+    def _requeue(self, host: str) -> None:
+        if host in self._queued or not self._queues[host] or self._active[host] >= self.per_host:
+            return
+        self._queued.add(host)
+        loop = asyncio.get_running_loop()
+        if self._next_start[host] > loop.time():
+            loop.call_at(self._next_start[host], self._make_ready, host)
+        else:
+            self._make_ready(host)
+
+    async def next(self) -> Optional[Tuple[int, str, str]]:
+        """Sıradaki ``(benzersiz numara, URL, host)``; iş kalmadıysa None."""
+        loop = asyncio.get_running_loop()
+        while self._remaining:
+            if not self._ready:
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+                await waiter
+                continue
+            host = heapq.heappop(self._ready)[1] if self.ordered else self._ready.popleft()
+            self._queued.discard(host)
+            if not self._queues[host]:
+                # skip_host ile boşaltılmış host
+                continue
+            uid = self._queues[host].popleft()
+            self._remaining -= 1
+            self._active[host] += 1
+            self._next_start[host] = loop.time() + self.interval
+            if not self._remaining:
+                # Bekleyen işçiler iş kalmadığını görüp çıkar
+                self._wake(len(self._waiters))
+            # Host kuyruğun sonuna döner: diğer host'lar araya girer
+            self._requeue(host)
+            return uid, self.urls[uid], host
+        return None
+
+    @property
+    def hosts(self) -> List[str]:
+        """Kuyruktaki benzersiz host'lar."""
+        return list(self._queues)
+
+    def skip_host(self, host: str) -> List[int]:
+        """Host'un bekleyen tüm URL'lerini kuyruktan çıkarır ve numaralarını döndürür."""
+        skipped = list(self._queues.get(host, ()))
+        if skipped:
+            self._queues[host].clear()
+            self._remaining -= len(skipped)
+            if not self._remaining:
+                self._wake(len(self._waiters))
+        return skipped
+
+    def acquire_spare(self, host: str) -> bool:
+        """Yedek istek için host'ta yer ayırır; sınırlar doluysa False.
+
+        Yer yalnızca host'ta bekleyen URL kalmadıysa, eşzamanlılık sınırının
+        altındaysa ve hız sınırı izin veriyorsa verilir; yedek istekler
+        gerçek yoklamaların önüne geçmez. Ayrılan yer ``done`` ile bırakılır.
+        """
+        loop = asyncio.get_running_loop()
+        if self._queues[host] or self._active[host] >= self.per_host or self._next_start[host] > loop.time():
+            return False
+        self._active[host] += 1
+        self._next_start[host] = loop.time() + self.interval
+        return True
+
+    def done(self, host: str) -> None:
+        """Host'taki bir yoklamanın bittiğini bildirir."""
+        self._active[host] -= 1
+        self._requeue(host)
+
+
+class SweepControl:
+    """Süren bir taramayı başka bir iş parçacığından duraklatma/iptal etme anahtarı.
+
+    İşçiler her yeni URL'den önce anahtara bakar: duraklatılmışsa devam
+    edilene kadar bekler, iptal edilmişse durur. Süren yoklamalar tamamlanır;
+    hiç başlamayan URL'ler ``❔ Bekliyor`` kalır.
+
+    Duraklatma taramanın süre sınırını durdurmaz: duraklatılan sürede de
+    sınır işler ve sınır dolunca bekleyen işçiler uyanıp çıkar.
+    """
+
+    def __init__(self) -> None:
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self) -> None:
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def proceed(self, timeout: Optional[float] = None) -> bool:
+        """Duraklatılmışsa bekler (iş parçacığını bloklar); taramaya devam edilecekse True.
+
+        ``timeout`` (taramanın kalan süresi) dolduğunda hâlâ duraklatılmışsa False.
+        """
+        if not self._running.wait(timeout):
+            return False
+        return not self.cancelled
+
+    async def proceed_async(self) -> bool:
+        """``proceed``'in olay döngüsünü bloklamayan sürümü."""
+        while not self._running.is_set():
+            await asyncio.sleep(0.1)
+        return not self.cancelled
+
+
+class _HostState:
+    __slots__ = ("failures", "latencies", "probes", "hedges", "open")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.probes = 0
+        self.hedges = 0
+        self.open = False
+
+
+class CircuitBreaker:
+    """Host başına devre kesici, uyarlanır zaman aşımı ve yedek istek bütçesi.
+
+    Bir host'ta art arda ``failures`` bağlantı hatası/zaman aşımı görülürse
+    devre açılır. Host'un zaman aşımı, son başarılı yoklamaların p95
+    gecikmesinin ``_ADAPTIVE_FACTOR`` katıdır (``timeout`` ile sınırlı).
+    Hatasız bir host'ta p95'i aşan yoklamaya yedek istek gönderilebilir;
+    yedekler host'un yoklamalarının ``hedge_ratio`` oranını geçmez.
+
+    Args:
+        failures: Devrenin açılması için art arda hata sayısı (0 = kapalı)
+        timeout: Temel (en uzun) zaman aşımı (saniye)
+        adaptive: Zaman aşımı gecikmelerden uyarlansın mı
+        hedge_ratio: Yedek isteklerin yoklamalara oranı üst sınırı (0 = kapalı)
+    """
+
+    def __init__(
+        self,
+        failures: int = HEALTH_CIRCUIT_FAILURES,
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+        adaptive: bool = HEALTH_ADAPTIVE_TIMEOUT,
+        hedge_ratio: float = HEALTH_HEDGE_RATIO,
+    ) -> None:
+        self.failures = failures
+        self.base_timeout = timeout
+        self.adaptive = adaptive
+        self.hedge_ratio = hedge_ratio
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def _p95(self, state: _HostState) -> Optional[float]:
+        if len(state.latencies) < _ADAPTIVE_MIN_SAMPLES:
+            return None
+        ordered = sorted(state.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def is_open(self, host: str) -> bool:
+        state = self._hosts.get(host)
+        return state is not None and state.open
+
+    def timeout(self, host: str) -> float:
+        """Host için kullanılacak istek zaman aşımı."""
+        p95 = self._p95(self._state(host)) if self.adaptive else None
+        if p95 is None:
+            return self.base_timeout
+        return min(self.base_timeout, max(_ADAPTIVE_FLOOR, p95 * _ADAPTIVE_FACTOR))
+
+    def _hedge_allowed(self, state: _HostState) -> bool:
+        return self.hedge_ratio > 0 and not state.failures and state.hedges < self.hedge_ratio * state.probes
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Yedek isteğin gönderileceği gecikme; host uygun değilse None."""
+        state = self._state(host)
+        state.probes += 1
+        if not self._hedge_allowed(state):
+            return None
+        return self._p95(state)
+
+    def start_hedge(self, host: str) -> bool:
+        """Bütçe hâlâ izin veriyorsa yedek isteği sayar ve True döndürür.
+
+        Yedek, gönderildiği anda sayılır; aynı anda gecikmesi dolan
+        yoklamalar bütçeyi birlikte aşamaz.
+        """
+        state = self._state(host)
+        if not self._hedge_allowed(state):
+            return False
+        state.hedges += 1
+        return True
+
+    def record(self, host: str, result: Optional[ProbeResult]) -> bool:
+        """Sonucu işler; devre bu sonuçla açıldıysa True döndürür."""
+        if result is None:
+            return False
+        state = self._state(host)
+        if result.status in _HOST_FAILURES:
+            state.failures += 1
+            if self.failures > 0 and not state.open and state.failures >= self.failures:
+                state.open = True
+                return True
+            return False
+        state.failures = 0
+        if result.latency is not None:
+            state.latencies.append(result.latency)
+        return False
+
+
+async def _hedged_probe(
+    probe: Callable[[str, float], "asyncio.Future"],
+    url: str,
+    host: str,
+    breaker: CircuitBreaker,
+    scheduler: HostScheduler,
+) -> ProbeResult:
+    """Yoklamayı host zaman aşımıyla yürütür; p95'i aşarsa yedek istek gönderip ilk sağlıklı sonucu alır.
+
+    Yedek istek zamanlayıcıdan host yeri alır (``acquire_spare``); host'un
+    eşzamanlılık/hız sınırı doluysa veya bekleyen URL'si varsa gönderilmez.
+    """
+    timeout = breaker.timeout(host)
+    delay = breaker.hedge_delay(host)
+    first = asyncio.ensure_future(probe(url, timeout))
+    if delay is None:
+        return await first
+    try:
+        return await asyncio.wait_for(asyncio.shield(first), delay)
+    except TimeoutError:
+        pass
+    if not scheduler.acquire_spare(host):
+        return await first
+    if not breaker.start_hedge(host):
+        scheduler.done(host)
+        return await first
+    backup = asyncio.ensure_future(probe(url, timeout))
+    # Yedeğin yeri iptal edilse de bittiğinde bırakılır
+    backup.add_done_callback(lambda _: scheduler.done(host))
+    pending = {first, backup}
+    try:
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # Hata veren kopya yerine diğerinin sonucu beklenir
+                if not pending or (task.exception() is None and task.result().status not in _HOST_FAILURES):
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _drain(
+    scheduler: HostScheduler,
+    concurrency: int,
+    probe: Callable[[str, float], "asyncio.Future"],
+    on_result: Callable[[int, Optional[ProbeResult]], None],
+    breaker: Optional[CircuitBreaker] = None,
+    control: Optional[SweepControl] = None,
+) -> None:
+    """Zamanlayıcıdaki URL'leri en fazla ``concurrency`` işçiyle ``probe(url, zaman aşımı)`` eder.
+
+    Sonuçlar ``on_result(numara, sonuç)`` ile bildirilir. ``breaker``
+    verilirse devresi açılan host'un kalan URL'leri yoklanmadan
+    ``❌ Sunucu Yanıt Vermiyor`` olur.
+    """
+
+    async def worker() -> None:
+        while True:
+            if control is not None and not await control.proceed_async():
+                return
+            item = await scheduler.next()
+            if item is None:
+                return
+            uid, url, host = item
+            result = None
+            try:
+                if breaker is None:
+                    result = await probe(url, None)
+                else:
+                    result = await _hedged_probe(probe, url, host, breaker, scheduler)
+            except Exception as e:
+                logger.debug(f"Yoklama hatası ({url}): {e}")
+            finally:
+                scheduler.done(host)
+            on_result(uid, result)
+            if breaker is not None and breaker.record(host, result):
+                skipped = scheduler.skip_host(host)
+                logger.info(f"{host}: art arda {breaker.failures} hata, {len(skipped)} URL yoklanmadan atlandı")
+                for skipped_uid in skipped:
+                    on_result(skipped_uid, ProbeResult(STATUS_HOST_DOWN))
+
+    workers = min(max_concurrency(concurrency), len(scheduler.urls))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+async def check_urls_async(
+    urls: List[str],
+    *,
+    concurrency: int = HEALTH_CHECK_CONCURRENCY,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
+    user_agent: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    progress_interval: float = 0.1,
+    pool_size: int = HEALTH_CHECK_POOL_SIZE,
+    pool: Optional[ConnectionPool] = None,
+    per_host: int = HEALTH_CHECK_PER_HOST,
+    host_rate: float = HEALTH_CHECK_HOST_RATE,
+    dns: Optional[DNSCache] = None,
+    tier: str = TIER_HEAD,
+    escalate: bool = False,
+    deep_max_bytes: int = HEALTH_DEEP_PROBE_MAX_KB * 1024,
+    deep_budget: float = HEALTH_DEEP_PROBE_BUDGET,
+    breaker: Optional[CircuitBreaker] = None,
+    result_callback: Optional[Callable[[str, ProbeResult], None]] = None,
+    control: Optional[SweepControl] = None,
+    ordered: bool = False,
+    deadline: Optional[float] = None,
+) -> List[ProbeResult]:
+    """URL'leri en fazla ``concurrency`` eşzamanlı yoklamayla kontrol eder (liste sırasıyla sonuç).
+
+    Aynı URL bir kez yoklanır ve sonucu tüm satırlarına yazılır. Yoklamalar
+    host'lar arasında sırayla dağıtılır; host başına ``per_host`` eşzamanlı
+    yoklama ve saniyede ``host_rate`` başlangıç sınırı uygulanır. Bağlantılar
+    ``pool`` (verilmezse sunucu başına ``pool_size`` bağlantılık yeni bir
+    havuz) üzerinden paylaşılır.
+
+    Yoklamadan önce tüm host'lar ``dns`` (varsayılan: ``DNS_CACHE``) ile
+    paralel çözülür; çözülemeyen host'ların URL'leri yoklanmadan
+    ``❌ DNS Hatası`` olur.
+
+    ``tier`` yoklama kademesidir (``TIER_CONNECT``, ``TIER_HEAD``,
+    ``TIER_GET``); ``TIER_GET`` derin HLS yoklamasıdır (``deep_max_bytes`` /
+    ``deep_budget`` sınırlarıyla) ve ``DeepProbeResult`` döndürür.
+    ``TIER_CONNECT`` ya da ``escalate=True`` ile her ``şema://host:port``
+    bir kez bağlantı yoklamasından geçer; yükseltmede yalnızca bağlantı
+    kabul eden sunuculardaki http(s) URL'leri ``tier`` yoklamasına geçer,
+    diğerleri bağlantı sonucunu alır.
+
+    Host sonuçları ``breaker`` (verilmezse ayarlardaki değerlerle yeni bir
+    ``CircuitBreaker``) ile izlenir: devresi açılan host'un kalan URL'leri
+    ``❌ Sunucu Yanıt Vermiyor`` olur, zaman aşımları host'a göre kısalır.
+
+    ``result_callback(url, sonuç)`` her benzersiz URL'nin sonucu çıktıkça
+    çağrılır (kısmi sonuçların akışı). ``control`` ile tarama başka bir iş
+    parçacığından duraklatılıp iptal edilebilir; iptalde yoklanmamış URL'ler
+    ``❔ Bekliyor`` döner.
+
+    ``ordered=True`` URL'leri liste sırasıyla (öncelik sırası) dağıtır.
+    ``deadline`` (saniye) toplam süre sınırıdır: süre dolunca süren
+    yoklamalar kesilir, o ana kadar biten sonuçlar döner ve kalan URL'ler
+    ``❔ Bekliyor`` kalır.
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Bilinmeyen yoklama kademesi: {tier}")
+    expires = time.monotonic() + deadline if deadline else None
+    total = len(urls)
+    result_type = DeepProbeResult if tier == TIER_GET else ProbeResult
+    results: List[ProbeResult] = [result_type(STATUS_PENDING)] * total
+    if not total:
+        return results
+
+    connect_first = tier == TIER_CONNECT or escalate
+    scheduler = HostScheduler(urls, per_host=per_host, rate=host_rate, ordered=ordered)
+    unique_results: List[ProbeResult] = [result_type(STATUS_PENDING)] * len(scheduler.urls)
+    completed = 0
+    last_report = 0.0
+
+    def report() -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        # Streamlit ilerleme çubuğu her yoklamada değil, aralıklarla güncellenir
+        if completed == total or now - last_report >= progress_interval:
+            last_report = now
+            try:
+                progress_callback(completed, total)
+            except Exception:
+                pass
+
+    def finish(uid: int, result: Optional[ProbeResult]) -> None:
+        nonlocal completed
+        unique_results[uid] = result_type(*result) if result is not None else result_type(STATUS_ERROR)
+        completed += scheduler.multiplicity[uid]
+        if result_callback:
+            try:
+                result_callback(scheduler.urls[uid], unique_results[uid])
+            except Exception:
+                logger.exception("Sonuç geri çağrısı başarısız")
+        if progress_callback:
+            report()
+
+    def probeable(url: str) -> bool:
+        if connect_first:
+            return endpoint(url) is not None
+        return url.startswith(("http://", "https://"))
+
+    owns_pool = pool is None
+    if owns_pool:
+        pool = ConnectionPool(pool_size, dns=dns)
+    if breaker is None:
+        breaker = CircuitBreaker(timeout=timeout)
+
+    async def probe(url: str, host_timeout: Optional[float]) -> ProbeResult:
+        host_timeout = host_timeout or timeout
+        if tier == TIER_GET:
+            return await deep_probe_url(
+                url, pool=pool, timeout=host_timeout, user_agent=user_agent, max_bytes=deep_max_bytes, budget=deep_budget
+            )
+        return await probe_url(url, pool=pool, timeout=host_timeout, user_agent=user_agent)
+
+    async def sweep() -> None:
+        skipped: Set[int] = set()
+        for host in await pool.dns.prefetch(scheduler.hosts, timeout=timeout):
+            for uid in scheduler.skip_host(host):
+                skipped.add(uid)
+                finish(uid, ProbeResult(STATUS_DNS if probeable(scheduler.urls[uid]) else STATUS_INVALID))
+
+        if not connect_first:
+            await _drain(scheduler, concurrency, probe, finish, breaker, control)
+            return
+
+        # ── 1. Bağlantı kademesi: her şema://host:port bir kez ──
+        targets: Dict[Tuple[str, str, int], List[int]] = {}
+        for uid, url in enumerate(scheduler.urls):
+            if uid in skipped:
+                continue
+            target = endpoint(url)
+            if target is None:
+                finish(uid, ProbeResult(STATUS_INVALID))
+            else:
+                targets.setdefault(target, []).append(uid)
+        groups = list(targets.values())
+        escalated: List[int] = []
+
+        def connected(group: int, result: Optional[ProbeResult]) -> None:
+            for uid in groups[group]:
+                url = scheduler.urls[uid]
+                if (
+                    tier != TIER_CONNECT
+                    and result is not None
+                    and result.status == STATUS_REACHABLE
+                    and url.startswith(("http://", "https://"))
+                ):
+                    escalated.append(uid)
+                else:
+                    finish(uid, result)
+
+        await _drain(
+            HostScheduler([scheduler.urls[uids[0]] for uids in groups], per_host=per_host, rate=host_rate, ordered=ordered),
+            concurrency,
+            lambda url, host_timeout: connect_probe_url(url, pool=pool, timeout=host_timeout or timeout),
+            connected,
+            # Bağlantı gecikmeleri HTTP yoklamalarının zaman aşımını kısaltmasın diye ayrı izlenir
+            CircuitBreaker(breaker.failures, timeout, adaptive=False, hedge_ratio=0),
+            control,
+        )
+
+        # ── 2. Yalnızca bağlantı kabul eden sunuculardaki URL'ler ──
+        # (bağlantı sonuçlarının geliş sırası değil, liste sırası korunur)
+        escalated.sort()
+        if escalated:
+            await _drain(
+                HostScheduler([scheduler.urls[uid] for uid in escalated], per_host=per_host, rate=host_rate, ordered=ordered),
+                concurrency,
+                probe,
+                lambda index, result: finish(escalated[index], result),
+                breaker,
+                control,
+            )
+
+    try:
+        async with asyncio.timeout_at(expires):
+            await sweep()
+    except TimeoutError:
+        if expires is None or time.monotonic() < expires:
+            raise
+        logger.info(f"Tarama süre sınırında durduruldu: {completed}/{total} satır tamamlandı")
+    finally:
+        if owns_pool:
+            pool.close()
+    return [unique_results[uid] for uid in scheduler.row_ids]
+
+
+def check_urls(urls: List[str], **options) -> List[ProbeResult]:
+    """``check_urls_async``'in eşzamanlı (senkron) sarmalayıcısı.
+
+    Çağıran iş parçacığında çalışan bir olay döngüsü varsa yoklamalar ayrı
+    bir iş parçacığındaki yeni döngüde yürütülür.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(check_urls_async(urls, **options))
+
+    outcome: Dict[str, object] = {}
+
+    def run() -> None:
+        try:
+            outcome["results"] = asyncio.run(check_urls_async(urls, **options))
+        except BaseException as e:  # pragma: no cover - çağırana aktarılır
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, name="health-check", daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["results"]
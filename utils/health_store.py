@@ -0,0 +1,152 @@
+"""Sağlık kontrolü sonuçlarının kalıcı deposu.
+
+Her URL'nin son durumu, HTTP kodu, gecikmesi ve kontrol zamanı bir SQLite
+veritabanında tutulur. Aynı listeyi yükleyen her oturum kanalları son
+bilinen durumlarıyla görür; "Sağlık Kontrolü" yalnızca sonucu
+``HEALTH_RESULT_MAX_AGE`` saniyeden eski (veya hiç kontrol edilmemiş)
+URL'leri yoklar. Veritabanı WAL kipinde açıldığından birden fazla süreç
+aynı dosyayı okuyup yazabilir.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from utils.health import STATUS_DNS, STATUS_HOST_DOWN, STATUS_PENDING, ProbeResult
+from utils.visitor_counter import data_path
+
+logger = logging.getLogger(__name__)
+
+try:
+    from utils.config import HEALTH_RESULT_MAX_AGE
+except ImportError:
+    HEALTH_RESULT_MAX_AGE = 3600
+
+# Bu süreden (saniye) eski kayıtlar silinir
+_RETENTION = 30 * 24 * 3600
+# Yoklama sonucu olmayan durumlar yazılmaz: bekleyenler ve devresi açık
+# host'ta yoklanmadan atlanan URL'ler (depodaki önceki sonuçları korunur)
+_NOT_STORED = frozenset((STATUS_PENDING, STATUS_HOST_DOWN))
+# Yazılır ama hiç taze sayılmaz: DNS hatası geçicidir ve ön çözümlemede
+# host'un tüm URL'lerine yoklanmadan verilebilir
+_NEVER_FRESH = frozenset((STATUS_DNS,))
+# Tek sorguda IN (...) listesine konan URL sayısı (SQLite parametre sınırının altında)
+_QUERY_CHUNK = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS health (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    code INTEGER,
+    latency REAL,
+    checked_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class StoredResult(NamedTuple):
+    """Depodaki bir URL'nin son kontrol sonucu."""
+
+    status: str
+    code: Optional[int]
+    latency: Optional[float]
+    checked_at: float
+
+
+class HealthStore:
+    """URL → son sağlık sonucu deposu.
+
+    Args:
+        path: Veritabanı dosyası (varsayılan: yazılabilir geçici dizinde ``health_results.sqlite3``)
+        max_age: Sonucun taze sayıldığı süre (saniye); daha eski sonuçlar yeniden yoklanır
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: float = HEALTH_RESULT_MAX_AGE) -> None:
+        self.path = path or data_path("health_results.sqlite3")
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def get(self, urls: Iterable[str]) -> Dict[str, StoredResult]:
+        """Depoda sonucu bulunan URL'lerin son sonuçlarını döndürür."""
+        urls = list(dict.fromkeys(urls))
+        found: Dict[str, StoredResult] = {}
+        with self._lock:
+            for start in range(0, len(urls), _QUERY_CHUNK):
+                chunk = urls[start:start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT url, status, code, latency, checked_at FROM health "
+                    f"WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for url, *fields in rows:
+                    found[url] = StoredResult(*fields)
+        return found
+
+    def statuses(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Bilinen URL'lerin son durumları (yaşına bakılmaksızın); yeni yüklenen listeyi doldurmak için."""
+        return {url: result.status for url, result in self.get(urls).items()}
+
+    def split_fresh(self, urls: Iterable[str], max_age: Optional[float] = None) -> Tuple[Dict[str, str], List[str]]:
+        """URL'leri ``({taze URL: durum}, [yeniden yoklanacak URL'ler])`` olarak ayırır."""
+        urls = list(dict.fromkeys(urls))
+        cutoff = time.time() - (self.max_age if max_age is None else max_age)
+        fresh = {
+            url: result.status
+            for url, result in self.get(urls).items()
+            if result.checked_at >= cutoff and result.status not in _NEVER_FRESH
+        }
+        return fresh, [url for url in urls if url not in fresh]
+
+    def record(self, results: Mapping[str, Union[ProbeResult, str]], checked_at: Optional[float] = None) -> int:
+        """Yoklama sonuçlarını yazar; yazılan kayıt sayısını döndürür.
+
+        ``❔ Bekliyor`` ve yoklanmadan verilen ``❌ Sunucu Yanıt Vermiyor``
+        sonuçları atlanır.
+        """
+        checked_at = time.time() if checked_at is None else checked_at
+        rows = []
+        for url, result in results.items():
+            probe = ProbeResult(result) if isinstance(result, str) else result
+            if probe.status not in _NOT_STORED:
+                rows.append((url, probe.status, probe.code, probe.latency, checked_at))
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO health (url, status, code, latency, checked_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET status=excluded.status, code=excluded.code, "
+                    "latency=excluded.latency, checked_at=excluded.checked_at",
+                    rows,
+                )
+                if checked_at - self._pruned_at > 3600:
+                    # Eski kayıtlar saatte en fazla bir kez temizlenir (tam tablo taraması)
+                    self._conn.execute("DELETE FROM health WHERE checked_at < ?", (checked_at - _RETENTION,))
+                    self._pruned_at = checked_at
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.error(f"Sağlık sonuçları kaydedilemedi: {e}")
+                return 0
+        return len(rows)
+
+    def clear(self) -> None:
+        """Tüm kayıtları siler."""
+        with self._lock:
+            self._conn.execute("DELETE FROM health")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
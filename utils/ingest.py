@@ -0,0 +1,125 @@
+"""Çoklu kaynaktan eşzamanlı liste yükleme.
+
+Her kaynak (URL, dosya yolu veya bellekteki içerik) ayrı bir iş parçacığında
+indirilip akış halinde parse edilir; bir kaynağın yavaşlığı veya hatası
+diğerlerini bekletmez. Sonuçlar kaynak sırasıyla tek bir kanal tablosunda
+birleştirilir ve her satıra ``Kaynak`` etiketi yazılır.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import time
+import urllib.parse
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import dedup
+from utils.cache import PlaylistCache
+from utils.parser import load_channel_frame
+from utils.store import concat_frames
+
+logger = logging.getLogger(__name__)
+
+try:
+    from utils.config import INGEST_MAX_WORKERS
+except ImportError:
+    INGEST_MAX_WORKERS = 8
+
+
+def source_label(source, position: int) -> str:
+    """Kaynak için kısa, okunabilir bir etiket üretir (``1. example.com``)."""
+    if isinstance(source, str) and source.startswith(("http://", "https://")):
+        name = urllib.parse.urlsplit(source).netloc or source
+    elif isinstance(source, (str, os.PathLike)):
+        name = os.path.basename(os.fspath(source)) or os.fspath(source)
+    else:
+        name = getattr(source, "name", None) or "Yükleme"
+    return f"{position + 1}. {name}"
+
+
+def _load_source(source, label: str, options: Dict) -> Tuple[Optional[pd.DataFrame], Dict]:
+    start = time.perf_counter()
+    report = {"source": label, "channels": 0, "seconds": 0.0, "error": None}
+    frame = None
+    try:
+        frame = load_channel_frame(source, **options)
+        report["channels"] = len(frame)
+    except Exception as e:
+        logger.warning(f"Kaynak yüklenemedi ({label}): {e}")
+        report["error"] = e
+    report["seconds"] = round(time.perf_counter() - start, 2)
+    return frame, report
+
+
+def ingest_sources(
+    sources: Sequence,
+    *,
+    labels: Optional[Sequence[str]] = None,
+    only_tr: bool = False,
+    user_agent: Optional[str] = None,
+    timeout: Optional[int] = None,
+    disable_ssl_verify: Optional[bool] = None,
+    dedup_policy: Optional[str] = None,
+    cache: Optional[PlaylistCache] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int, Dict], None]] = None,
+) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Birden fazla M3U kaynağını paralel indirip tek bir kanal tablosunda birleştirir.
+
+    Args:
+        sources: URL'ler, dosya yolları veya bytes/memoryview içerikler
+        labels: Kaynak etiketleri (verilmezse ``source_label`` ile üretilir)
+        only_tr: Sadece Türk kanallarını al
+        dedup_policy: Verilirse kaynaklar arası yinelenenler bu politikayla ayıklanır
+            (``dedup.POLICIES``)
+        cache: Parse edilmiş tablolar için disk önbelleği (``PlaylistCache``)
+        max_workers: Aynı anda indirilen kaynak sayısı (varsayılan ``INGEST_MAX_WORKERS``)
+        progress_callback: Her kaynak bittiğinde ``(biten, toplam, rapor)`` ile çağrılır
+
+    Returns:
+        ``(kanal tablosu, kaynak raporları)``; raporlar kaynak sırasıyla
+        ``source``, ``channels``, ``seconds`` ve ``error`` (istisna veya None) içerir.
+    """
+    if labels is None:
+        labels = [source_label(source, i) for i, source in enumerate(sources)]
+    options = {
+        "only_tr": only_tr,
+        "user_agent": user_agent,
+        "timeout": timeout,
+        "disable_ssl_verify": disable_ssl_verify,
+        "cache": cache,
+    }
+    frames: List[Optional[pd.DataFrame]] = [None] * len(sources)
+    reports: List[Optional[Dict]] = [None] * len(sources)
+    if not sources:
+        return concat_frames([]), []
+
+    workers = max(1, min(len(sources), max_workers or INGEST_MAX_WORKERS))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_load_source, source, label, options): i
+            for i, (source, label) in enumerate(zip(sources, labels))
+        }
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            i = futures[future]
+            frames[i], reports[i] = future.result()
+            if progress_callback:
+                progress_callback(done, len(sources), reports[i])
+
+    tagged = []
+    for frame, label in zip(frames, labels):
+        if frame is None:
+            continue
+        frame["Kaynak"] = pd.Categorical.from_codes(np.zeros(len(frame), dtype=np.int8), categories=[label])
+        tagged.append(frame)
+    merged = concat_frames(tagged)
+    if "Kaynak" not in merged.columns:
+        merged["Kaynak"] = pd.Categorical([], categories=list(labels))
+    if dedup_policy and len(merged):
+        merged = dedup.deduplicate(merged, dedup_policy).reset_index(drop=True)
+    return merged, reports
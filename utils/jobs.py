@@ -0,0 +1,235 @@
+"""Arka planda çalışan sağlık kontrolü işleri.
+
+"Sağlık Kontrolü" taraması Streamlit betiğinin içinde değil, süreç genelinde
+tek bir ``HealthJobManager``'ın iş parçacığında yürür; bu yüzden rerun,
+sayfa etkileşimi veya oturum kapanması taramayı kesmez. Her iş bir kimlikle
+(``job_id``) izlenir: ilerleme ve sonuçlar çıktıkça işte birikir, herhangi
+bir oturum ``results_since`` ile yalnızca yeni sonuçları çekip tablosuna
+uygulayabilir. İşler duraklatılabilir, sürdürülebilir ve iptal edilebilir;
+aynı listeyi aynı ayarlarla isteyen ikinci oturum çalışan işe bağlanır.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils import health as health_utils
+from utils import parser as parser_utils
+
+logger = logging.getLogger(__name__)
+
+try:
+    from utils.config import HEALTH_JOB_WORKERS, HEALTH_JOB_HISTORY
+except ImportError:
+    HEALTH_JOB_WORKERS = 1
+    HEALTH_JOB_HISTORY = 20
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING, JOB_PAUSED)
+
+
+class HealthJob:
+    """Tek bir arka plan taraması: ilerleme, kısmi sonuçlar ve kontrol anahtarı."""
+
+    def __init__(self, job_id: str, urls: Sequence[str], options: Dict[str, object], key: str) -> None:
+        self.id = job_id
+        self.urls = list(urls)
+        self.options = options
+        self.key = key
+        self.total = len(self.urls)
+        self.control = health_utils.SweepControl()
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._state = JOB_QUEUED
+        self._completed = 0
+        # İşi izleyen oturum sayısı (``submit`` artırır, ``release`` azaltır)
+        self._readers = 0
+        # Sonuçlar geliş sırasıyla tutulur; okuyucular kendi imleçleriyle yeni olanları alır
+        self._results: List[Tuple[str, health_utils.ProbeResult]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._state == JOB_RUNNING and self.control.paused:
+            return JOB_PAUSED
+        return self._state
+
+    @property
+    def active(self) -> bool:
+        return self.state in ACTIVE_STATES
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """``(tamamlanan satır, toplam satır)``."""
+        return self._completed, self.total
+
+    @property
+    def expired(self) -> bool:
+        """İş süre sınırı dolduğu için bazı satırları yoklamadan bitti mi?"""
+        return self._state == JOB_DONE and self._completed < self.total
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def results_since(self, cursor: int = 0) -> Tuple[Dict[str, health_utils.ProbeResult], int]:
+        """``cursor``'dan sonra gelen ``{URL: sonuç}`` ve yeni imleç."""
+        with self._lock:
+            fresh = self._results[cursor:]
+            cursor = len(self._results)
+        return dict(fresh), cursor
+
+    def _on_progress(self, completed: int, total: int) -> None:
+        self._completed = completed
+
+    def _on_result(self, url: str, probe: health_utils.ProbeResult) -> None:
+        with self._lock:
+            self._results.append((url, probe))
+
+    def _run(self) -> None:
+        if self.control.cancelled:
+            self._state = JOB_CANCELLED
+            self.finished_at = time.time()
+            return
+        self._state = JOB_RUNNING
+        self.started_at = time.time()
+        try:
+            probes = parser_utils.batch_probe(
+                self.urls,
+                progress_callback=self._on_progress,
+                result_callback=self._on_result,
+                control=self.control,
+                **self.options,
+            )
+            self._state = JOB_CANCELLED if self.control.cancelled else JOB_DONE
+            if self._state == JOB_DONE:
+                # Süre sınırında biten taramada yoklanamayan satırlar tamamlanmış sayılmaz
+                self._completed = sum(probe.status != health_utils.STATUS_PENDING for probe in probes)
+        except Exception as e:
+            logger.exception(f"Sağlık kontrolü işi başarısız ({self.id})")
+            self.error = str(e)
+            self._state = JOB_FAILED
+        finally:
+            self.finished_at = time.time()
+
+
+class HealthJobManager:
+    """Süreç genelinde sağlık kontrolü iş kuyruğu.
+
+    İşler ``workers`` iş parçacığında sırayla çalışır; sıradakiler
+    ``queued`` durumunda bekler. Bitmiş ve izleyen oturumların hepsinin
+    ``release`` ile bıraktığı işler (sonuçlarıyla birlikte) silinir;
+    bırakılmamış biten işlerden de en fazla son ``history`` tanesi tutulur.
+
+    Args:
+        workers: Aynı anda çalışan en fazla tarama
+        history: Saklanan en fazla iş (biten işler önce silinir)
+    """
+
+    def __init__(self, workers: int = HEALTH_JOB_WORKERS, history: int = HEALTH_JOB_HISTORY) -> None:
+        self.history = max(1, history)
+        self._jobs: "OrderedDict[str, HealthJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max(1, workers), thread_name_prefix="health-job")
+
+    @staticmethod
+    def _key(urls: Sequence[str], options: Dict[str, object]) -> str:
+        digest = hashlib.sha1()
+        for url in urls:
+            digest.update(url.encode("utf-8", "surrogatepass"))
+            digest.update(b"\n")
+        settings = {name: value for name, value in options.items() if name != "store"}
+        digest.update(repr(sorted(settings.items())).encode("utf-8"))
+        return digest.hexdigest()
+
+    def submit(self, urls: Sequence[str], **options) -> str:
+        """Taramayı kuyruğa ekler ve iş kimliğini döndürür.
+
+        ``options`` ``parser.batch_probe``'a aktarılır. Aynı URL'ler ve
+        ayarlarla süren bir iş varsa yenisi açılmaz, onun kimliği döner.
+        Her çağrı işi izleyen bir oturum sayılır; sonuçları alan oturum işi
+        ``release`` ile bırakmalıdır.
+        """
+        key = self._key(urls, options)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and job.active:
+                    job._readers += 1
+                    return job.id
+            job = HealthJob(uuid.uuid4().hex[:12], urls, options, key)
+            job._readers = 1
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(job._run)
+        return job.id
+
+    def release(self, job_id: Optional[str]) -> None:
+        """Oturumun işi izlemeyi bıraktığını bildirir; biten ve izleyeni kalmayan işler silinir."""
+        with self._lock:
+            job = self._jobs.get(job_id) if job_id else None
+            if job is not None:
+                job._readers = max(0, job._readers - 1)
+            self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished:
+            if self._jobs[job_id]._readers <= 0:
+                del self._jobs[job_id]
+        finished = [job_id for job_id in finished if job_id in self._jobs]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: Optional[str]) -> Optional[HealthJob]:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[HealthJob]:
+        """Tüm işler (en yenisi sonda)."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.control.cancel()
+        return True
+
+    def pause(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.control.pause()
+        return True
+
+    def resume(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.control.resume()
+        return True
+
+    def shutdown(self) -> None:
+        """Tüm işleri iptal eder ve iş parçacıklarının bitmesini bekler."""
+        for job in self.jobs():
+            job.control.cancel()
+        self._executor.shutdown(wait=True)
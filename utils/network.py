@@ -2,9 +2,30 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import hashlib
+import io
+import logging
 import ssl
+import threading
+import zlib
+import urllib.error
 import urllib.parse
 import urllib.request
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
 
 
 def create_ssl_context(disable_ssl_verify: bool) -> ssl.SSLContext:
@@ -16,55 +37,559 @@ def create_ssl_context(disable_ssl_verify: bool) -> ssl.SSLContext:
     return context
 
 
+CHUNK_SIZE = 64 * 1024
+
+
+def _size_limit() -> tuple[int, int]:
+    """Return the configured playlist size limit as ``(megabytes, bytes)``."""
+    try:
+        from utils.config import MAX_FILE_SIZE_MB
+    except Exception:
+        MAX_FILE_SIZE_MB = 50
+    return MAX_FILE_SIZE_MB, MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+def _size_error(limit_mb: int) -> ValueError:
+    return ValueError(f"Dosya boyutu sınırı aşıldı (Maks: {limit_mb}MB)")
+
+
+def ensure_within_size_limit(size: int) -> None:
+    """Raise ``ValueError`` when ``size`` bytes exceed ``MAX_FILE_SIZE_MB``."""
+    limit_mb, max_bytes = _size_limit()
+    if size > max_bytes:
+        raise _size_error(limit_mb)
+
+
+class NotModified(Exception):
+    """Raised when the server reports that a playlist is unchanged (HTTP 304)."""
+
+
+def _response_header(response, name: str) -> Optional[str]:
+    if hasattr(response, "getheader"):
+        return response.getheader(name)
+    if getattr(response, "headers", None) is not None:
+        return response.headers.get(name)
+    return None
+
+
+def _check_content_length(response, max_bytes: int, limit_mb: int) -> None:
+    """Reject oversized downloads early when the server announces a Content-Length."""
+    cl = _response_header(response, "Content-Length")
+
+    if cl:
+        try:
+            if int(cl) > max_bytes:
+                raise _size_error(limit_mb)
+        except ValueError as e:
+            raise e
+        except Exception:
+            pass
+
+
+def iter_chunks(stream, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a binary stream in fixed-size chunks until EOF."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def accept_encoding() -> str:
+    """Return the ``Accept-Encoding`` value for the decoders available here."""
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """Detect gzip/zstd content from its magic bytes (``.m3u.gz``, ``.m3u.zst``)."""
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def _iter_zlib(chunks: Iterable[bytes], wbits: int, chunk_size: int) -> Iterator[bytes]:
+    """Inflate gzip/deflate chunks with bounded output per step (no zip-bomb spikes)."""
+    decoder = zlib.decompressobj(wbits)
+    for chunk in chunks:
+        data = chunk
+        while data:
+            out = decoder.decompress(data, chunk_size)
+            if out:
+                yield out
+            if decoder.eof:
+                # Concatenated gzip members: continue with a fresh decoder
+                data = decoder.unused_data
+                decoder = zlib.decompressobj(wbits)
+            else:
+                data = decoder.unconsumed_tail
+    tail = decoder.flush()
+    if tail:
+        yield tail
+
+
+def _iter_deflate(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Inflate HTTP ``deflate`` bodies, which servers send zlib-wrapped or raw."""
+    chunks = iter(chunks)
+    first = next(chunks, b"")
+    wrapped = len(first) >= 2 and (first[0] & 0x0F) == 8 and (first[0] << 8 | first[1]) % 31 == 0
+
+    def replay():
+        yield first
+        yield from chunks
+
+    yield from _iter_zlib(replay(), zlib.MAX_WBITS if wrapped else -zlib.MAX_WBITS, chunk_size)
+
+
+def decode_chunks(
+    chunks: Iterable[bytes],
+    encoding: Optional[str] = None,
+    *,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Decode a (possibly) compressed chunk stream, enforcing ``max_bytes`` on the output.
+
+    ``encoding`` is an HTTP ``Content-Encoding`` value; when it is missing the
+    stream is sniffed for gzip/zstd magic bytes. Plain streams pass through.
+    """
+    if max_bytes is None:
+        limit_mb, max_bytes = _size_limit()
+    else:
+        limit_mb = max_bytes // (1024 * 1024)
+
+    chunks = iter(chunks)
+    head = b""
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        # Enough bytes to recognise the magic numbers
+        while len(head) < 4:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            head += chunk
+        encoding = sniff_encoding(head) or "identity"
+
+    def replay():
+        if head:
+            yield head
+        yield from chunks
+
+    if encoding in ("gzip", "x-gzip"):
+        decoded = _iter_zlib(replay(), 16 + zlib.MAX_WBITS, chunk_size)
+    elif encoding == "deflate":
+        decoded = _iter_deflate(replay(), chunk_size)
+    elif encoding == "br" and brotli is not None:
+        decoder = brotli.Decompressor()
+        decoded = (decoder.process(chunk) for chunk in replay())
+    elif encoding == "zstd" and zstandard is not None:
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+        decoded = (decoder.decompress(chunk) for chunk in replay())
+    elif encoding == "identity":
+        decoded = replay()
+    else:
+        raise ValueError(f"Desteklenmeyen sıkıştırma biçimi: {encoding}")
+
+    bytes_out = 0
+    for chunk in decoded:
+        bytes_out += len(chunk)
+        if bytes_out > max_bytes:
+            raise _size_error(limit_mb)
+        if chunk:
+            yield chunk
+
+
+def iter_byte_lines(chunks: Iterable[bytes], max_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """Split a chunk stream into lines incrementally, enforcing ``max_bytes``.
+
+    Only the unfinished tail of the previous chunk is kept between reads, so
+    memory use stays bounded by ``chunk_size`` plus one line.
+    """
+    if max_bytes is None:
+        limit_mb, max_bytes = _size_limit()
+    else:
+        limit_mb = max_bytes // (1024 * 1024)
+
+    pending = b""
+    bytes_read = 0
+    for chunk in chunks:
+        bytes_read += len(chunk)
+        if bytes_read > max_bytes:
+            raise _size_error(limit_mb)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Build ``If-None-Match``/``If-Modified-Since`` headers from stored validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _open_playlist(url: str, user_agent: str, timeout: int, disable_ssl_verify: bool, validators):
+    """Open ``url``, sending conditional headers; raise ``NotModified`` on HTTP 304."""
+    headers = {"User-Agent": user_agent, "Accept-Encoding": accept_encoding(), **conditional_headers(validators)}
+    request = urllib.request.Request(url, headers=headers)
+    context = create_ssl_context(disable_ssl_verify)
+    try:
+        return urllib.request.urlopen(request, timeout=timeout, context=context)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            raise NotModified(url) from None
+        raise
+
+
+def _ranged_settings() -> Tuple[int, int, int]:
+    """Return ``(min_bytes, parts, retries)`` for parallel ranged downloads."""
+    try:
+        from utils.config import RANGED_DOWNLOAD_MIN_MB, RANGED_DOWNLOAD_PARTS, RANGED_DOWNLOAD_RETRIES
+    except Exception:
+        RANGED_DOWNLOAD_MIN_MB, RANGED_DOWNLOAD_PARTS, RANGED_DOWNLOAD_RETRIES = 8, 4, 2
+    return RANGED_DOWNLOAD_MIN_MB * 1024 * 1024, RANGED_DOWNLOAD_PARTS, RANGED_DOWNLOAD_RETRIES
+
+
+def _range_block_bytes() -> int:
+    """Return the largest byte range fetched (and buffered) per request."""
+    try:
+        from utils.config import RANGED_DOWNLOAD_BLOCK_MB
+    except Exception:
+        RANGED_DOWNLOAD_BLOCK_MB = 4
+    return max(1, int(RANGED_DOWNLOAD_BLOCK_MB * 1024 * 1024))
+
+
+class RangeNotSupported(Exception):
+    """Raised when a server answers a ``Range`` request with anything but a matching 206."""
+
+
+def _ranged_size(response, min_bytes: int) -> Optional[int]:
+    """Return the body size when ``response`` can be fetched in parallel byte ranges."""
+    if min_bytes <= 0:
+        return None
+    if (_response_header(response, "Accept-Ranges") or "").strip().lower() != "bytes":
+        return None
+    # Ranges address the encoded bytes; compressed bodies are streamed instead
+    if (_response_header(response, "Content-Encoding") or "identity").strip().lower() != "identity":
+        return None
+    try:
+        size = int(_response_header(response, "Content-Length") or "")
+    except ValueError:
+        return None
+    return size if size >= min_bytes else None
+
+
+def range_bounds(size: int, parts: int, max_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split ``size`` bytes into ``parts`` contiguous ``(start, end)`` ranges.
+
+    With ``max_bytes`` no range is longer than that, so large bodies are split
+    into more than ``parts`` ranges.
+    """
+    parts = max(1, min(parts, size))
+    step = -(-size // parts)
+    if max_bytes:
+        step = min(step, max_bytes)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _check_content_range(response, start: int, end: int, size: int) -> None:
+    status = getattr(response, "status", None)
+    content_range = (_response_header(response, "Content-Range") or "").strip()
+    if status != 206 or content_range != f"bytes {start}-{end - 1}/{size}":
+        raise RangeNotSupported(f"{status} {content_range}")
+
+
+def _fetch_range(
+    url: str,
+    start: int,
+    view: memoryview,
+    size: int,
+    *,
+    user_agent: str,
+    timeout: int,
+    disable_ssl_verify: bool,
+    validator: str,
+    retries: int,
+    abort: threading.Event,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """Download ``bytes start..start+len(view)`` into ``view``, resuming on retry."""
+    end = start + len(view)
+    done = 0
+    attempt = 0
+    context = create_ssl_context(disable_ssl_verify)
+    while True:
+        headers = {
+            "User-Agent": user_agent,
+            "Accept-Encoding": "identity",
+            "Range": f"bytes={start + done}-{end - 1}",
+        }
+        if validator:
+            # The server sends the full (changed) body instead of a 206 if the version differs
+            headers["If-Range"] = validator
+        try:
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=timeout, context=context) as response:
+                _check_content_range(response, start + done, end, size)
+                while done < len(view):
+                    if abort.is_set():
+                        return
+                    read = response.readinto(view[done:done + chunk_size])
+                    if not read:
+                        raise ConnectionError(f"Aralık eksik indirildi: {start + done}/{end}")
+                    done += read
+            return
+        except RangeNotSupported:
+            raise
+        except Exception:
+            if attempt >= retries or abort.is_set():
+                raise
+            attempt += 1
+            abort.wait(0.25 * 2 ** (attempt - 1))
+
+
+def _iter_ranged_chunks(
+    response,
+    url: str,
+    size: int,
+    *,
+    parts: int,
+    retries: int,
+    user_agent: str,
+    timeout: int,
+    disable_ssl_verify: bool,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the body of ``response`` in order while the next ranges download concurrently.
+
+    The body is split into ranges of at most ``RANGED_DOWNLOAD_BLOCK_MB``. The
+    first is read from the already open ``response``. The following ones are
+    requested in order on separate connections, at most ``parts - 1`` ahead
+    of the range being yielded. Each one gets its own buffer, released once
+    it has been yielded, so memory stays bounded by ``parts`` ranges whatever
+    the body size. If any range fails after its retries, the rest of the
+    body is read from ``response`` instead (single-stream fallback).
+    """
+    bounds = range_bounds(size, parts, _range_block_bytes())
+    first_end = bounds[0][1]
+    later = iter(bounds[1:])
+    window = max(1, parts - 1)
+    validator = _response_header(response, "ETag") or _response_header(response, "Last-Modified") or ""
+    abort = threading.Event()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=window)
+    pending: Deque[Tuple[int, int, bytearray, concurrent.futures.Future]] = collections.deque()
+
+    def schedule() -> None:
+        while len(pending) < window:
+            bound = next(later, None)
+            if bound is None:
+                return
+            start, end = bound
+            buffer = bytearray(end - start)
+            future = pool.submit(
+                _fetch_range,
+                url,
+                start,
+                memoryview(buffer),
+                size,
+                user_agent=user_agent,
+                timeout=timeout,
+                disable_ssl_verify=disable_ssl_verify,
+                validator=validator,
+                retries=retries,
+                abort=abort,
+                chunk_size=chunk_size,
+            )
+            pending.append((start, end, buffer, future))
+
+    try:
+        schedule()
+        offset = 0
+        while offset < first_end:
+            chunk = response.read(min(chunk_size, first_end - offset))
+            if not chunk:
+                raise ConnectionError(f"Aralık eksik indirildi: {offset}/{first_end}")
+            offset += len(chunk)
+            yield chunk
+
+        while pending:
+            start, end, buffer, future = pending.popleft()
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f"Paralel indirme başarısız, tek bağlantıya dönülüyor ({url}): {e}")
+                abort.set()
+                # ``response`` is still at the end of the first range: skip the
+                # ranges already yielded so the stream resumes exactly at ``start``
+                skip = start - first_end
+                while skip > 0:
+                    chunk = response.read(min(chunk_size, skip))
+                    if not chunk:
+                        raise ConnectionError(f"Aralık eksik indirildi: {start - skip}/{start}")
+                    skip -= len(chunk)
+                yield from iter_chunks(response, chunk_size)
+                return
+            schedule()
+            view = memoryview(buffer)
+            for pos in range(0, end - start, chunk_size):
+                yield view[pos:pos + chunk_size]
+            del view, buffer
+    finally:
+        abort.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_response_chunks(response, url: str, chunk_size: int, **options) -> Iterator[bytes]:
+    """Stream the raw body, switching to parallel ranges for large range-capable responses."""
+    min_bytes, parts, retries = _ranged_settings()
+    size = _ranged_size(response, min_bytes) if parts > 1 else None
+    if size is None:
+        return iter_chunks(response, chunk_size)
+    return _iter_ranged_chunks(response, url, size, parts=parts, retries=retries, chunk_size=chunk_size, **options)
+
+
+def _remember_validators(validators: Optional[Dict[str, str]], response) -> None:
+    if validators is None:
+        return
+    validators["etag"] = _response_header(response, "ETag") or ""
+    validators["last_modified"] = _response_header(response, "Last-Modified") or ""
+
+
+def iter_m3u_chunks(
+    url: str,
+    *,
+    user_agent: str,
+    timeout: int,
+    disable_ssl_verify: bool,
+    chunk_size: int = CHUNK_SIZE,
+    validators: Optional[Dict[str, str]] = None,
+) -> Iterator[bytes]:
+    """Stream a playlist as decoded chunks, enforcing ``MAX_FILE_SIZE_MB``.
+
+    Compressed transfers (``Content-Encoding`` gzip/deflate/br/zstd) and
+    ``.m3u.gz``/``.m3u.zst`` bodies are decompressed on the fly; the size
+    limit applies to the decompressed bytes.
+
+    When ``validators`` is given, its ``etag``/``last_modified`` entries are
+    sent as a conditional request and ``NotModified`` is raised on HTTP 304.
+    After a successful download the dict is updated in place with the new
+    ``etag``, ``last_modified`` and the SHA-256 ``content_hash`` of the
+    decoded body.
+    """
+    limit_mb, max_bytes = _size_limit()
+    with _open_playlist(url, user_agent, timeout, disable_ssl_verify, validators) as response:
+        _check_content_length(response, max_bytes, limit_mb)
+        digest = hashlib.sha256()
+        raw = _iter_response_chunks(
+            response,
+            url,
+            chunk_size,
+            user_agent=user_agent,
+            timeout=timeout,
+            disable_ssl_verify=disable_ssl_verify,
+        )
+        decoded = decode_chunks(
+            raw,
+            _response_header(response, "Content-Encoding"),
+            max_bytes=max_bytes,
+            chunk_size=chunk_size,
+        )
+        for chunk in decoded:
+            digest.update(chunk)
+            yield chunk
+        _remember_validators(validators, response)
+        if validators is not None:
+            validators["content_hash"] = digest.hexdigest()
+
+
+def iter_m3u_source(
+    url: str,
+    *,
+    user_agent: str,
+    timeout: int,
+    disable_ssl_verify: bool,
+    chunk_size: int = CHUNK_SIZE,
+    validators: Optional[Dict[str, str]] = None,
+) -> Iterator[bytes]:
+    """Stream a playlist and yield its raw lines while the download is still running.
+
+    ``validators`` works as in :func:`iter_m3u_chunks`.
+    """
+    _, max_bytes = _size_limit()
+    chunks = iter_m3u_chunks(
+        url,
+        user_agent=user_agent,
+        timeout=timeout,
+        disable_ssl_verify=disable_ssl_verify,
+        chunk_size=chunk_size,
+        validators=validators,
+    )
+    yield from iter_byte_lines(chunks, max_bytes)
+
+
 def fetch_m3u_source(
     url: str,
     *,
     user_agent: str,
     timeout: int,
     disable_ssl_verify: bool,
+    validators: Optional[Dict[str, str]] = None,
 ) -> list[bytes]:
-    """Download a playlist and return its raw lines, with size protection to avoid OOM."""
-    try:
-        from utils.config import MAX_FILE_SIZE_MB
-        max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
-    except Exception:
-        max_bytes = 50 * 1024 * 1024
-        MAX_FILE_SIZE_MB = 50
+    """Download a playlist and return its raw lines, with size protection to avoid OOM.
 
-    request = urllib.request.Request(url, headers={"User-Agent": user_agent})
-    context = create_ssl_context(disable_ssl_verify)
-    with urllib.request.urlopen(request, timeout=timeout, context=context) as response:
+    With ``validators`` the request is conditional: ``NotModified`` is raised
+    on HTTP 304, otherwise the dict is updated with the response's ``etag``,
+    ``last_modified`` and ``content_hash``.
+    """
+    limit_mb, max_bytes = _size_limit()
+
+    with _open_playlist(url, user_agent, timeout, disable_ssl_verify, validators) as response:
         # Content-Length kontrolü (eğer sunucu gönderdiyse hızlı kontrol)
-        cl = None
-        if hasattr(response, "getheader"):
-            cl = response.getheader("Content-Length")
-        elif hasattr(response, "headers") and response.headers is not None:
-            cl = response.headers.get("Content-Length")
+        _check_content_length(response, max_bytes, limit_mb)
 
-        if cl:
-            try:
-                if int(cl) > max_bytes:
-                    raise ValueError(f"Dosya boyutu sınırı aşıldı (Maks: {MAX_FILE_SIZE_MB}MB)")
-            except ValueError as e:
-                raise e
-            except Exception:
-                pass
-
-        # Satır satır okurken boyutu kontrol et (Content-Length gönderilmese bile korur)
-        lines = []
-        bytes_read = 0
-
-        # Testlerdeki Mock nesneleri her zaman iterable olmayabilir.
-        # Eğer iterable ise güvenli bir şekilde satır satır okuyup boyutu kontrol ederiz.
-        # Iterable değilse varsayılan readlines() yöntemine geri döneriz.
-        if hasattr(response, "__iter__"):
-            for line in response:
-                bytes_read += len(line)
-                if bytes_read > max_bytes:
-                    raise ValueError(f"Dosya boyutu sınırı aşıldı (Maks: {MAX_FILE_SIZE_MB}MB)")
-                lines.append(line)
+        # Gövde parça parça okunur ve decode_chunks'tan geçer: Content-Encoding ile
+        # ya da başlıksız gönderilen (.m3u.gz/.m3u.zst) sıkıştırılmış gövde açılır,
+        # boyut sınırı açılmış boyuta uygulanır (Content-Length gönderilmese bile korur).
+        # Büyük ve aralık destekli gövde birden fazla bağlantıyla paralel indirilir.
+        # Testlerdeki Mock nesneleri boyutlu read() desteklemeyebilir; iterable
+        # olmayan yanıtlar için readlines()'a geri dönülür.
+        encoding = _response_header(response, "Content-Encoding")
+        min_bytes, parts, _ = _ranged_settings()
+        if parts > 1 and _ranged_size(response, min_bytes) is not None:
+            raw = _iter_response_chunks(
+                response,
+                url,
+                CHUNK_SIZE,
+                user_agent=user_agent,
+                timeout=timeout,
+                disable_ssl_verify=disable_ssl_verify,
+            )
+        elif encoding or hasattr(response, "__iter__"):
+            raw = iter_chunks(response)
         else:
-            lines = response.readlines()
+            raw = response.readlines()
+        body = b"".join(decode_chunks(raw, encoding, max_bytes=max_bytes))
+        # Satırlar yalnızca \n'de bölünür (yanıt üzerinde satır satır yinelemeyle aynı)
+        lines = io.BytesIO(body).readlines()
+        _remember_validators(validators, response)
+        if validators is not None:
+            validators["content_hash"] = hashlib.sha256(body).hexdigest()
         return lines
 
 
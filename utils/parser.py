@@ -1,4 +1,6 @@
 import re
+import hashlib
+import numpy as np
 import pandas as pd
 import concurrent.futures
 import urllib.request
@@ -8,7 +10,19 @@ import ssl
 import time
 import logging
 import threading
-from typing import Iterable, List, Dict, Callable, Optional
+import os
+import multiprocessing
+import mmap
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Dict, Callable, NamedTuple, Optional, Union
+
+from utils import network as network_utils
+from utils.store import ChannelStoreBuilder, TYPE_CATEGORIES, channel_frame, concat_frames
+from utils.scanner import scan_m3u
+from utils.search import SearchIndex, fold_tr
+from utils import cache as cache_utils
+from utils import health as health_utils
+from utils.classifier import DEFAULT_CLASSIFIER, REGION_TR, TR_KEYWORDS, keyword_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +32,108 @@ try:
 except ImportError:
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
-# Türk kanallar için regex pattern
-TR_PATTERN = re.compile(
-    r"(\b|_|\[|\(|\|)(TR|TURK|TÜRK|TURKIYE|TÜRKİYE|YERLI|ULUSAL|ISTANBUL)(\b|_|\]|\)|\||:)",
-    re.IGNORECASE,
-)
+try:
+    from utils.config import REQUEST_TIMEOUT, DISABLE_SSL_VERIFY
+except ImportError:
+    REQUEST_TIMEOUT = 30
+    DISABLE_SSL_VERIFY = True
+
+try:
+    from utils.config import PARALLEL_PARSE_MIN_MB, PARALLEL_PARSE_WORKERS
+except ImportError:
+    PARALLEL_PARSE_MIN_MB = 8
+    PARALLEL_PARSE_WORKERS = 0
+
+try:
+    from utils.config import SOURCE_CACHE_ENTRIES, SOURCE_CACHE_MAX_MB
+except ImportError:
+    SOURCE_CACHE_ENTRIES = 4
+    SOURCE_CACHE_MAX_MB = 256
+
+try:
+    from utils.config import HEALTH_CHECK_DEADLINE, HEALTH_CHECK_MAX_CHANNELS
+except ImportError:
+    HEALTH_CHECK_DEADLINE = 60
+    HEALTH_CHECK_MAX_CHANNELS = 20000
+
+# Türk kanallar için regex pattern (config'deki TR_KEYWORDS'ten derlenir).
+# Parser ve filtreler bölge sınıflandırıcısını kullanır; bu desen geriye dönük uyumluluk içindir.
+TR_PATTERN = keyword_pattern(TR_KEYWORDS, re.IGNORECASE)
 
 # SSL - sertifika hatalarını atla
 _ssl_ctx = ssl.create_default_context()
 _ssl_ctx.check_hostname = False
 _ssl_ctx.verify_mode = ssl.CERT_NONE
 
-def parse_m3u_lines(iterator: Iterable) -> List[Dict[str, str]]:
-    """M3U satırlarını parse eder ve kanal listesi döndürür.
-    
+# key="value" öznitelikleri (tvg-id, tvg-name, tvg-logo, tvg-chno, group-title, catchup...)
+_EXTINF_ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+# Kanala bağlı olup URL'den önce gelen ek yönerge satırları
+_OPTION_PREFIXES = ("#EXTVLCOPT", "#KODIPROP")
+# Ham tamponda yalnızca parser'ın kullandığı satırları (EXTINF, seçenekler, URL) bulur;
+# boş satırlar ve diğer yorumlar için hiç nesne oluşturulmaz
+_KEPT_LINE_RE = re.compile(
+    rb"^[^\S\r\n]*(#EXTINF[^\r\n]*|#EXTVLCOPT[^\r\n]*|#KODIPROP[^\r\n]*|[^#\s][^\r\n]*)",
+    re.MULTILINE,
+)
+_EXTINF_BOUNDARY_RE = re.compile(rb"\n#EXTINF")
+# Satır sonu olmayan \r (satır içinde kalan satır başı karakteri)
+_INNER_CR_RE = re.compile(rb"\r[^\n]")
+# #EXTINF öznitelik bölümü: tırnak dışındaki virgüle kadar, tırnaklı değerler bütün olarak
+_EXTINF_HEAD_RE = re.compile(r'[^,"]*(?:"[^"]*"[^,"]*)*')
+# Akış halinde gelen içerik bu büyüklükteki bloklar halinde vektörel taranır
+_SCAN_BLOCK_BYTES = 8 * 1024 * 1024
+# Sağlık sonuçları depoya bu kadar satır birikince veya bu kadar saniyede bir yazılır
+_STORE_FLUSH_ROWS = 500
+_STORE_FLUSH_SECONDS = 2.0
+
+
+def parse_extinf(line: str) -> tuple:
+    """Bir #EXTINF satırını tek geçişte grup, logo, başlık ve ham özniteliklere ayırır.
+
+    Öznitelikler baştan sona taranır: tırnaklı değerler atlanır ve tırnak
+    dışındaki ilk virgül başlığı ayırır; böylece tırnak içindeki virgüller ve
+    kanal adındaki virgül veya ``="`` karakterleri korunur. Öznitelik
+    bölümü (süre + tüm ``key="value"`` çiftleri) ham metin olarak döndürülür,
+    sözlüğe yalnızca gerektiğinde ``parse_attributes`` ile çevrilir.
+
+    Returns:
+        (grup, logo, başlık, ham öznitelikler) dörtlüsü
+    """
+    # Kapanmayan tırnakta eşleşme tırnakta durur; başlık ondan sonraki ilk virgülden başlar
+    comma = line.find(",", _EXTINF_HEAD_RE.match(line, 8).end())
+    if comma < 0:
+        comma = len(line)
+
+    i = line.find('group-title="', 0, comma)
+    group = line[i + 13:line.find('"', i + 13)] if i >= 0 else ""
+    i = line.find('tvg-logo="', 0, comma)
+    logo = line[i + 10:line.find('"', i + 10)] if i >= 0 else ""
+    return group, logo, line[comma + 1:].strip(), line[8:comma].strip()
+
+
+def parse_attributes(raw: str) -> Dict[str, str]:
+    """Ham EXTINF öznitelik metnini ``{anahtar: değer}`` sözlüğüne çevirir.
+
     Args:
-        iterator: M3U dosyasının satırları (str veya bytes)
-        
+        raw: ``parse_extinf`` tarafından saklanan öznitelik bölümü
+
     Returns:
-        Kanal bilgilerini içeren dict listesi
+        Sıralı öznitelik sözlüğü (tvg-id, tvg-name, tvg-chno, catchup...)
+    """
+    if not raw:
+        return {}
+    return dict(_EXTINF_ATTR_RE.findall(raw))
+
+
+def _iter_records(iterator: Iterable) -> Iterator[tuple]:
+    """M3U satırlarını tek tek işler ve her kanal tamamlandığında onu üretir.
+
+    Kayıtlar ``store.RECORD_FIELDS`` sırasındaki demetlerdir; yalnızca o an
+    işlenen kanalın alanları bellekte tutulur.
     """
-    channels: List[Dict[str, str]] = []
-    current_info: Optional[Dict[str, str]] = None
+    pending = False
+    group = title = logo = attrs = ""
+    options: Optional[List[str]] = None
     for line in iterator:
         if isinstance(line, bytes):
             try:
@@ -52,68 +146,671 @@ def parse_m3u_lines(iterator: Iterable) -> List[Dict[str, str]]:
         if not line:
             continue
             
-        if line.startswith("#EXTINF"):
-            info = {"Grup": "Genel", "Kanal Adı": "Bilinmeyen", "URL": "", "LogoURL": ""}
-            
-            # Logo tespiti
-            logo = re.search(r'tvg-logo="([^"]*)"', line)
-            if logo:
-                info["LogoURL"] = logo.group(1)
-                
-            # Grup tespiti
-            grp = re.search(r'group-title="([^"]*)"', line)
-            if grp:
-                info["Grup"] = grp.group(1)
-                
-            # Kanal adı tespiti
-            parts = line.split(",")
-            if len(parts) > 1:
-                info["Kanal Adı"] = parts[-1].strip()
-                
-            current_info = info
-        elif not line.startswith("#"):
-            if current_info:
-                current_info["URL"] = line
-                lower = line.lower()
-                
-                # Tür tespiti
-                if ".m3u8" in lower or "/live/" in lower:
-                    current_info["Tür"] = "HLS"
-                elif ".mpd" in lower:
-                    current_info["Tür"] = "DASH"
+        if line[0] == "#":
+            if line.startswith("#EXTINF"):
+                group, logo, title, attrs = parse_extinf(line)
+                options = None
+                pending = True
+            elif pending and line.startswith(_OPTION_PREFIXES):
+                # #EXTVLCOPT / #KODIPROP satırları kanalla birlikte saklanır
+                if options is None:
+                    options = [line]
                 else:
-                    current_info["Tür"] = "Diğer"
-                    
-                channels.append(current_info)
-                current_info = None
-    return channels
+                    options.append(line)
+        elif pending:
+            lower = line.lower()
+
+            # Tür tespiti
+            if ".m3u8" in lower or "/live/" in lower:
+                kind = "HLS"
+            elif ".mpd" in lower:
+                kind = "DASH"
+            else:
+                kind = "Diğer"
+
+            yield (group or "Genel", title or "Bilinmeyen", line, logo, kind, attrs, options)
+            pending = False
+
+
+def _iter_channels(iterator: Iterable) -> Iterator[Dict[str, str]]:
+    """``_iter_records`` çıktısını kanal dict'lerine çevirir."""
+    for group, title, url, logo, kind, attrs, options in _iter_records(iterator):
+        yield {
+            "Grup": group,
+            "Kanal Adı": title,
+            "URL": url,
+            "LogoURL": logo,
+            "Tür": kind,
+            "Öznitelikler": attrs,
+            "Seçenekler": options,
+        }
+
+
+def _join_lines(lines: List) -> Optional[bytes]:
+    """Satırları vektörel tarama için tek tampona birleştirir.
+
+    Satırların tümü aynı türde değilse ya da satır içinde ``\n``/``\r``
+    varsa (tarayıcı bunları satır satır parser'dan farklı bölerdi) None döner.
+    """
+    if not lines:
+        return None
+    try:
+        blob = b"\n".join(lines) if isinstance(lines[0], bytes) else "\n".join(lines).encode("utf-8")
+    except (TypeError, UnicodeEncodeError):
+        return None
+    if blob.count(b"\n") != len(lines) - 1 or _INNER_CR_RE.search(blob):
+        return None
+    return blob
+
+
+def parse_m3u_lines(iterator: Iterable) -> List[Dict[str, str]]:
+    """M3U satırlarını parse eder ve kanal listesi döndürür.
+
+    Satırlar birleştirilip ``scan_m3u`` ile vektörel taranır; taranamayan
+    girdilerde (karışık str/bytes, geçersiz UTF-8) satır satır parser kullanılır.
+    
+    Args:
+        iterator: M3U dosyasının satırları (str veya bytes)
+        
+    Returns:
+        Kanal bilgilerini içeren dict listesi
+    """
+    lines = list(iterator)
+    blob = _join_lines(lines)
+    columns = scan_m3u(blob) if blob is not None else None
+    if columns is None:
+        return list(_iter_channels(lines))
+
+    codes, groups = columns["Grup"]
+    options = columns["Seçenekler"]
+    values = zip(
+        np.array(groups, dtype=object)[codes].tolist(),
+        columns["Kanal Adı"].to_pylist(),
+        columns["URL"].to_pylist(),
+        columns["LogoURL"].to_pylist(),
+        np.array(TYPE_CATEGORIES, dtype=object)[columns["Tür"]].tolist(),
+        columns["Öznitelikler"].to_pylist(),
+    )
+    return [
+        {
+            "Grup": group,
+            "Kanal Adı": title,
+            "URL": url,
+            "LogoURL": logo,
+            "Tür": kind,
+            "Öznitelikler": attrs,
+            "Seçenekler": options.get(row),
+        }
+        for row, (group, title, url, logo, kind, attrs) in enumerate(values)
+    ]
+
+
+def _iter_source_lines(
+    source,
+    *,
+    user_agent: str,
+    timeout: int,
+    disable_ssl_verify: bool,
+) -> Iterator[bytes]:
+    """URL, dosya yolu, dosya nesnesi veya bytes kaynağını satır satır okur."""
+    if isinstance(source, str) and source.startswith(("http://", "https://")):
+        yield from network_utils.iter_m3u_source(
+            source,
+            user_agent=user_agent,
+            timeout=timeout,
+            disable_ssl_verify=disable_ssl_verify,
+        )
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_decoded_lines(network_utils.iter_chunks(f))
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        network_utils.ensure_within_size_limit(len(source))
+        if _buffer_encoding(source):
+            yield from _iter_decoded_lines(_iter_buffer_chunks(source))
+        else:
+            yield from _iter_buffer_lines(source)
+    elif hasattr(source, "read"):
+        yield from _iter_decoded_lines(network_utils.iter_chunks(source))
+    else:
+        raise TypeError(f"Desteklenmeyen M3U kaynağı: {type(source).__name__}")
+
+
+def iter_m3u_records(
+    url_or_file: Union[str, os.PathLike, bytes, object],
+    *,
+    user_agent: Optional[str] = None,
+    timeout: Optional[int] = None,
+    disable_ssl_verify: Optional[bool] = None,
+) -> Iterator[tuple]:
+    """``iter_m3u_channels`` ile aynı, ancak kanalları ``store.RECORD_FIELDS`` demetleri olarak üretir."""
+    lines = _iter_source_lines(
+        url_or_file,
+        user_agent=user_agent or USER_AGENT,
+        timeout=REQUEST_TIMEOUT if timeout is None else timeout,
+        disable_ssl_verify=DISABLE_SSL_VERIFY if disable_ssl_verify is None else disable_ssl_verify,
+    )
+    yield from _iter_records(lines)
+
+
+def iter_m3u_channels(
+    url_or_file: Union[str, os.PathLike, bytes, object],
+    *,
+    user_agent: Optional[str] = None,
+    timeout: Optional[int] = None,
+    disable_ssl_verify: Optional[bool] = None,
+) -> Iterator[Dict[str, str]]:
+    """M3U kaynağını parça parça okuyup kanalları indirme sürerken üretir.
+
+    Tüm listeyi satır listesi olarak belleğe almaz; ``MAX_FILE_SIZE_MB``
+    sınırı okunan bayt sayısı üzerinden uygulanır.
+
+    Args:
+        url_or_file: http(s) URL'si, dosya yolu, ikili dosya nesnesi veya bytes
+        user_agent: İndirme için User-Agent (varsayılan: config)
+        timeout: İndirme zaman aşımı, saniye (varsayılan: config)
+        disable_ssl_verify: SSL doğrulamasını kapat (varsayılan: config)
+
+    Yields:
+        Kanal bilgilerini içeren dict
+    """
+    lines = _iter_source_lines(
+        url_or_file,
+        user_agent=user_agent or USER_AGENT,
+        timeout=REQUEST_TIMEOUT if timeout is None else timeout,
+        disable_ssl_verify=DISABLE_SSL_VERIFY if disable_ssl_verify is None else disable_ssl_verify,
+    )
+    yield from _iter_channels(lines)
+
+
+def build_channel_frame(records: Iterable[tuple], only_tr: bool = False) -> pd.DataFrame:
+    """Kayıtları ara dict listesi oluşturmadan doğrudan sütunlu kanal tablosuna yazar.
+
+    Her kanal aynı geçişte bölge sınıflandırıcısıyla etiketlenir (``Bölge``
+    sütunu); ``only_tr`` yalnızca bu etikete bakar.
+
+    Args:
+        records: ``_iter_records`` / ``iter_m3u_records`` çıktısı
+        only_tr: Sadece Türk kanallarını al
+
+    Returns:
+        Kategorik ``Grup``/``Tür``/``Durum``/``Bölge`` sütunlu DataFrame
+    """
+    builder = ChannelStoreBuilder()
+    append = builder.append
+    classify = DEFAULT_CLASSIFIER.classify
+    for rec in records:
+        region = classify(rec[0], rec[1])
+        if only_tr and region != REGION_TR:
+            continue
+        append(rec, region)
+    return builder.to_frame()
+
+
+def load_channel_frame(
+    url_or_file: Union[str, os.PathLike, bytes, object],
+    *,
+    only_tr: bool = False,
+    user_agent: Optional[str] = None,
+    timeout: Optional[int] = None,
+    disable_ssl_verify: Optional[bool] = None,
+    cache: Optional["cache_utils.PlaylistCache"] = None,
+) -> pd.DataFrame:
+    """Kaynağı akış halinde okuyup doğrudan sütunlu kanal tablosuna parse eder.
+
+    Bellekteki içerik (bytes/memoryview) ``parse_m3u_bytes`` ile, yerel dosyalar
+    ``parse_m3u_file`` ile (mmap) gerekirse paralel parse edilir. ``cache``
+    verilirse tablo URL'ye / içerik hash'ine göre disk önbelleğinden okunur
+    ve yeni parse edilen tablolar önbelleğe yazılır.
+    """
+    cache_key = _cache_key(url_or_file, only_tr) if cache is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("Liste disk önbelleğinden yüklendi")
+            return cached
+    df = _load_frame(
+        url_or_file,
+        only_tr=only_tr,
+        user_agent=user_agent,
+        timeout=timeout,
+        disable_ssl_verify=disable_ssl_verify,
+    )
+    if cache_key is not None:
+        cache.put(cache_key, df)
+    return df
+
+
+def _cache_key(url_or_file, only_tr: bool) -> Optional[str]:
+    """Kaynak için disk önbelleği anahtarı; anahtarlanamayan kaynaklarda (dosya nesnesi) None."""
+    if isinstance(url_or_file, (bytes, bytearray, memoryview, mmap.mmap)):
+        key = cache_utils.content_key(url_or_file)
+    elif isinstance(url_or_file, str) and url_or_file.startswith(("http://", "https://")):
+        key = f"url:{url_or_file}"
+    elif isinstance(url_or_file, (str, os.PathLike)):
+        try:
+            key = cache_utils.file_key(url_or_file)
+        except OSError:
+            return None
+    else:
+        return None
+    return f"{key}|tr={int(only_tr)}"
+
+
+def _load_frame(
+    url_or_file,
+    *,
+    only_tr: bool,
+    user_agent: Optional[str],
+    timeout: Optional[int],
+    disable_ssl_verify: Optional[bool],
+) -> pd.DataFrame:
+    if isinstance(url_or_file, (bytes, bytearray, memoryview, mmap.mmap)):
+        return parse_m3u_bytes(url_or_file, only_tr=only_tr)
+    if isinstance(url_or_file, os.PathLike) or (
+        isinstance(url_or_file, str) and not url_or_file.startswith(("http://", "https://"))
+    ):
+        return parse_m3u_file(url_or_file, only_tr=only_tr)
+    if isinstance(url_or_file, str):
+        return _load_url_frame(
+            url_or_file,
+            only_tr=only_tr,
+            user_agent=user_agent,
+            timeout=timeout,
+            disable_ssl_verify=disable_ssl_verify,
+        )
+    if hasattr(url_or_file, "read"):
+        return _parse_stream(network_utils.decode_chunks(network_utils.iter_chunks(url_or_file)), only_tr)
+    records = iter_m3u_records(
+        url_or_file,
+        user_agent=user_agent,
+        timeout=timeout,
+        disable_ssl_verify=disable_ssl_verify,
+    )
+    return build_channel_frame(records, only_tr=only_tr)
+
+
+# URL başına son parse edilen tablo ve doğrulayıcıları (etag, last_modified, content_hash);
+# kayıt sayısı SOURCE_CACHE_ENTRIES, tabloların toplam boyutu SOURCE_CACHE_MAX_MB ile sınırlıdır
+_source_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_source_cache_bytes = 0
+_source_cache_lock = threading.Lock()
+
+
+def _cached_source(key: tuple) -> Optional[tuple]:
+    with _source_cache_lock:
+        entry = _source_cache.get(key)
+        if entry is None:
+            return None
+        _source_cache.move_to_end(key)
+        return entry[:2]
+
+
+def _remember_source(key: tuple, validators: Dict[str, str], frame: pd.DataFrame) -> None:
+    global _source_cache_bytes
+    size = int(frame.memory_usage(index=False, deep=True).sum())
+    budget = max(SOURCE_CACHE_MAX_MB, 0) * 1024 * 1024
+    with _source_cache_lock:
+        previous = _source_cache.pop(key, None)
+        if previous is not None:
+            _source_cache_bytes -= previous[2]
+        if size > budget:
+            return
+        _source_cache[key] = (dict(validators), frame.copy(deep=False), size)
+        _source_cache_bytes += size
+        while _source_cache and (
+            len(_source_cache) > max(SOURCE_CACHE_ENTRIES, 0) or _source_cache_bytes > budget
+        ):
+            _source_cache_bytes -= _source_cache.popitem(last=False)[1][2]
+
+
+def clear_source_cache() -> None:
+    """Koşullu yeniden indirme için tutulan tabloları bellekten atar."""
+    global _source_cache_bytes
+    with _source_cache_lock:
+        _source_cache.clear()
+        _source_cache_bytes = 0
+
+
+def _load_url_frame(
+    url: str,
+    *,
+    only_tr: bool,
+    user_agent: Optional[str],
+    timeout: Optional[int],
+    disable_ssl_verify: Optional[bool],
+) -> pd.DataFrame:
+    """URL'yi koşullu istekle indirir; liste değişmediyse önceki tabloyu parse etmeden döndürür.
+
+    Daha önce indirilmiş bir URL için ``If-None-Match``/``If-Modified-Since``
+    gönderilir. Sunucu 304 dönerse ya da doğrulayıcıları desteklemeyip aynı
+    içeriği (aynı SHA-256) gönderirse önbellekteki tablo kullanılır.
+    """
+    key = (url, only_tr)
+    cached = _cached_source(key)
+    validators = dict(cached[0]) if cached else {}
+    try:
+        chunks = network_utils.iter_m3u_chunks(
+            url,
+            user_agent=user_agent or USER_AGENT,
+            timeout=REQUEST_TIMEOUT if timeout is None else timeout,
+            disable_ssl_verify=DISABLE_SSL_VERIFY if disable_ssl_verify is None else disable_ssl_verify,
+            validators=validators,
+        )
+        if cached is None:
+            # İlk indirme: akış halinde parse edilir, hash indirme sırasında hesaplanır
+            frame = _parse_stream(chunks, only_tr)
+        else:
+            # İçerik daha önce görüldü: gövde tampona alınır, hash aynıysa parse edilmez
+            body = bytearray()
+            for chunk in chunks:
+                body += chunk
+            if validators.get("content_hash") == cached[0].get("content_hash"):
+                logger.info(f"Liste içeriği değişmemiş, önceki tablo kullanılıyor: {url}")
+                frame = cached[1]
+            else:
+                frame = parse_m3u_bytes(body, only_tr=only_tr)
+            del body
+    except network_utils.NotModified:
+        if cached is None:
+            raise
+        logger.info(f"Liste değişmemiş (304), önceki tablo kullanılıyor: {url}")
+        return cached[1].copy(deep=False)
+    _remember_source(key, validators, frame)
+    return frame.copy(deep=False)
+
+
+def _iter_buffer_lines(buf, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """bytes/memoryview/mmap tamponunda yalnızca parser'ın kullanacağı satırları üretir.
+
+    Satır sınırları tampon üzerinde bulunur; atlanan satırlar için ``str``
+    veya ``bytes`` nesnesi oluşturulmaz, tutulan satırlar da tek tek kopyalanır.
+    """
+    if end is None:
+        end = len(buf)
+    for match in _KEPT_LINE_RE.finditer(buf, start, end):
+        yield match.group(1)
+
+
+def _buffer_encoding(buf) -> Optional[str]:
+    """Tamponun sıkıştırma biçimini (gzip/zstd) sihirli baytlarından belirler."""
+    return network_utils.sniff_encoding(bytes(memoryview(buf)[:4]))
+
+
+def _iter_buffer_chunks(buf, chunk_size: int = network_utils.CHUNK_SIZE) -> Iterator[memoryview]:
+    """Tamponu kopyalamadan ``chunk_size`` büyüklüğünde dilimler halinde üretir."""
+    view = memoryview(buf)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def _iter_decoded_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Parça akışını (sıkıştırılmışsa açarak) satırlara böler; sınır açılmış boyuta uygulanır."""
+    return network_utils.iter_byte_lines(network_utils.decode_chunks(chunks))
+
+
+def _split_at_extinf(data, parts: int) -> List[tuple]:
+    """Tamponu yaklaşık eşit ``parts`` parçaya, yalnızca #EXTINF satır başlarından böler.
+
+    Parser durumu her #EXTINF satırında sıfırlandığı için parçalar birbirinden
+    bağımsız parse edilebilir ve sonuç seri parse ile aynı olur.
+    """
+    size = len(data)
+    bounds = [0]
+    for k in range(1, parts):
+        match = _EXTINF_BOUNDARY_RE.search(data, max(bounds[-1], size * k // parts))
+        if match is None:
+            break
+        if match.start() + 1 > bounds[-1]:
+            bounds.append(match.start() + 1)
+    bounds.append(size)
+    return [(bounds[k], bounds[k + 1]) for k in range(len(bounds) - 1)]
+
+
+def _first_seen(codes: np.ndarray, categories: List[str]) -> tuple:
+    """Kategorileri satırlarda ilk görülme sırasına dizer, kullanılmayanları atar."""
+    used, first = np.unique(codes, return_index=True)
+    order = used[np.argsort(first)]
+    remap = np.zeros(len(categories), dtype=codes.dtype)
+    remap[order] = np.arange(len(order), dtype=codes.dtype)
+    return remap[codes], [categories[code] for code in order]
+
+
+def _scanned_frame(columns: Dict[str, object], only_tr: bool) -> pd.DataFrame:
+    """``scan_m3u`` sütunlarını bölge etiketiyle (``build_channel_frame`` ile aynı) tabloya çevirir."""
+    group_codes, groups = columns["Grup"]
+    titles = columns["Kanal Adı"]
+    classifier = DEFAULT_CLASSIFIER
+
+    # Bölge önce grup adından (grup başına bir kez), bulunamazsa kanal adından belirlenir
+    region_index: Dict[str, int] = {}
+
+    def region_code(region: str) -> int:
+        return region_index.setdefault(region, len(region_index))
+
+    by_group = np.array(
+        [region_code(region) if region else -1 for region in map(classifier.match, groups)], dtype=np.int8
+    )
+    region_codes = by_group[group_codes] if len(by_group) else np.empty(0, dtype=np.int8)
+    unknown = np.flatnonzero(region_codes < 0)
+    if len(unknown):
+        codes, found = pd.factorize(classifier.match_many(titles.take(unknown)))
+        # Eşleşmeyen adlar (kod -1) tablonun son elemanına, varsayılan bölgeye düşer
+        table = np.array([region_code(region) for region in found] + [region_code(classifier.default)], dtype=np.int8)
+        region_codes[unknown] = table[codes]
+
+    kinds = columns["Tür"]
+    options = columns["Seçenekler"]
+    texts = {name: columns[name] for name in ("Kanal Adı", "URL", "LogoURL", "Öznitelikler")}
+    if only_tr:
+        keep = region_codes == region_index.get(REGION_TR, -1)
+        rows = np.cumsum(keep) - 1
+        options = {int(rows[row]): value for row, value in options.items() if keep[row]}
+        texts = {name: values.filter(keep) for name, values in texts.items()}
+        group_codes, region_codes, kinds = group_codes[keep], region_codes[keep], kinds[keep]
+    group_codes, groups = _first_seen(group_codes, groups)
+    region_codes, regions = _first_seen(region_codes, list(region_index))
+
+    return channel_frame(
+        group_codes=group_codes,
+        groups=groups,
+        titles=texts["Kanal Adı"],
+        urls=texts["URL"],
+        logos=texts["LogoURL"],
+        type_codes=kinds,
+        types=TYPE_CATEGORIES,
+        region_codes=region_codes,
+        regions=regions,
+        attrs=texts["Öznitelikler"],
+        options=options,
+    )
+
+
+def _parse_chunk(data, only_tr: bool, start: int = 0, end: Optional[int] = None) -> pd.DataFrame:
+    """Bir tamponu (veya ``start:end`` aralığını) sütunlu tabloya parse eder.
+
+    Tampon ``scan_m3u`` ile vektörel taranır; pyarrow yoksa veya içerik
+    geçerli UTF-8 değilse satır satır parser kullanılır.
+    """
+    columns = scan_m3u(data, start, end)
+    if columns is None:
+        return build_channel_frame(_iter_records(_iter_buffer_lines(data, start, end)), only_tr=only_tr)
+    return _scanned_frame(columns, only_tr)
+
+
+def _parse_stream(chunks: Iterable[bytes], only_tr: bool) -> pd.DataFrame:
+    """Açılmış parça akışını #EXTINF satır başlarından bloklara bölerek parse eder.
+
+    Bellekte en fazla bir blok (``_SCAN_BLOCK_BYTES`` ve bir kanal) tutulur;
+    bloklar ``_split_at_extinf`` parçaları gibi birbirinden bağımsızdır.
+    """
+    frames = []
+    pending = bytearray()
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) >= _SCAN_BLOCK_BYTES:
+            cut = pending.rfind(b"\n#EXTINF") + 1
+            if cut > 0:
+                frames.append(_parse_chunk(bytes(pending[:cut]), only_tr))
+                del pending[:cut]
+    frames.append(_parse_chunk(bytes(pending), only_tr))
+    return concat_frames(frames)
+
+
+def _parse_file_range(path: str, start: int, end: int, only_tr: bool) -> pd.DataFrame:
+    """Dosyanın bir aralığını kendi mmap'i üzerinden parse eder (süreç havuzunda çalışır)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _parse_chunk(mm, only_tr, start, end)
+
+
+_parse_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Paralel parse için süreç havuzunu tembel oluşturur ve sonraki yüklemelerde yeniden kullanır."""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            # Streamlit çok iş parçacıklı çalıştığından fork yerine spawn kullanılır
+            _parse_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _parse_pool_workers = workers
+        return _parse_pool
+
+
+def _resolve_parallelism(workers: Optional[int], min_parallel_bytes: Optional[int]) -> tuple:
+    if workers is None:
+        workers = PARALLEL_PARSE_WORKERS or os.cpu_count() or 1
+    if min_parallel_bytes is None:
+        min_parallel_bytes = PARALLEL_PARSE_MIN_MB * 1024 * 1024
+    return workers, min_parallel_bytes
+
+
+def parse_m3u_bytes(
+    data,
+    *,
+    only_tr: bool = False,
+    workers: Optional[int] = None,
+    min_parallel_bytes: Optional[int] = None,
+) -> pd.DataFrame:
+    """Bellekteki M3U içeriğini sütunlu kanal tablosuna parse eder.
+
+    İçerik kopyalanmadan doğrudan ``bytes``/``memoryview``/``mmap`` üzerinde
+    taranır; yalnızca tutulan alanlar decode edilir.
+
+    ``min_parallel_bytes`` üzerindeki içerik #EXTINF sınırlarından parçalara
+    bölünür, parçalar süreç havuzunda paralel parse edilir ve orijinal
+    sırayla birleştirilir. Sonuç seri parse ile birebir aynıdır.
+
+    Args:
+        data: Ham M3U içeriği (bytes, bytearray, memoryview veya mmap)
+        only_tr: Sadece Türk kanallarını al
+        workers: Süreç sayısı (varsayılan: ``PARALLEL_PARSE_WORKERS`` / CPU sayısı)
+        min_parallel_bytes: Paralel moda geçiş eşiği (varsayılan: ``PARALLEL_PARSE_MIN_MB``)
+
+    Returns:
+        Kategorik sütunlu kanal DataFrame'i
+    """
+    network_utils.ensure_within_size_limit(len(data))
+    if _buffer_encoding(data):
+        # .m3u.gz / .m3u.zst: akış halinde açılıp seri parse edilir
+        return _parse_stream(network_utils.decode_chunks(_iter_buffer_chunks(data)), only_tr)
+    workers, min_parallel_bytes = _resolve_parallelism(workers, min_parallel_bytes)
+    if workers <= 1 or len(data) < min_parallel_bytes:
+        return _parse_chunk(data, only_tr)
+
+    ranges = _split_at_extinf(data, workers)
+    if len(ranges) == 1:
+        return _parse_chunk(data, only_tr)
+
+    # Süreçler arası aktarım için yalnızca parça kopyalanır
+    view = memoryview(data)
+    pool = _get_parse_pool(workers)
+    futures = [pool.submit(_parse_chunk, bytes(view[start:end]), only_tr) for start, end in ranges]
+    return concat_frames([future.result() for future in futures])
+
+
+def parse_m3u_file(
+    path: Union[str, os.PathLike],
+    *,
+    only_tr: bool = False,
+    workers: Optional[int] = None,
+    min_parallel_bytes: Optional[int] = None,
+) -> pd.DataFrame:
+    """Yerel M3U dosyasını belleğe eşleyerek (mmap) sütunlu kanal tablosuna parse eder.
+
+    Dosya okunarak kopyalanmaz; paralel modda her süreç dosyayı kendisi
+    eşler ve yalnızca kendi aralığını tarar. Sıkıştırılmış dosyalar
+    (``.m3u.gz``/``.m3u.zst``) akış halinde açılarak parse edilir.
+    """
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+    network_utils.ensure_within_size_limit(size)
+    if size == 0:
+        return build_channel_frame(())
+
+    with open(path, "rb") as f:
+        if network_utils.sniff_encoding(f.read(4)):
+            f.seek(0)
+            return _parse_stream(network_utils.decode_chunks(network_utils.iter_chunks(f)), only_tr)
+
+    workers, min_parallel_bytes = _resolve_parallelism(workers, min_parallel_bytes)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if workers <= 1 or size < min_parallel_bytes:
+            return _parse_chunk(mm, only_tr)
+        ranges = _split_at_extinf(mm, workers)
+
+    pool = _get_parse_pool(workers)
+    futures = [pool.submit(_parse_file_range, path, start, end, only_tr) for start, end in ranges]
+    return concat_frames([future.result() for future in futures])
+
 
 def filter_channels(
-    channels: List[Dict[str, str]],
+    channels: Iterable[Dict[str, str]],
     only_tr: bool = False,
     keyword: str = "",
-    group_filter: str = ""
+    group_filter: str = "",
+    index: Optional[SearchIndex] = None,
 ) -> List[Dict[str, str]]:
     """Kanal listesini verilen kriterlere göre filtreler.
     
     Args:
-        channels: Filtrelenecek kanal listesi
+        channels: Filtrelenecek kanal listesi veya kanal üreteci (iter_m3u_channels)
         only_tr: Sadece Türk kanallarını filtrele
-        keyword: Kanal adı veya grup adında aranacak kelime
+        keyword: Kanal adı veya grup adında aranacak kelime (büyük/küçük harf ve İ/ı duyarsız)
         group_filter: Sadece belirtilen gruptaki kanalları göster
+        index: ``channels`` listesi (aynı sırayla) üzerine kurulmuş ``SearchIndex``;
+            aynı listede tekrarlanan aramalar için verilir, yoksa doğrusal tarama yapılır
         
     Returns:
         Filtrelenmiş kanal listesi
     """
-    result: List[Dict[str, str]] = channels
+    result: Iterable[Dict[str, str]] = channels
+    if keyword and index is not None:
+        # İndeks konumları özgün listeye göredir; diğer filtrelerden önce uygulanır
+        mask = index.mask(keyword)
+        result = (ch for ch, hit in zip(channels, mask) if hit)
+        keyword = ""
     if only_tr:
-        result = [ch for ch in result if TR_PATTERN.search(ch.get("Grup", "") + " " + ch.get("Kanal Adı", ""))]
+        classify = DEFAULT_CLASSIFIER.classify
+        result = (
+            ch for ch in result
+            if (ch.get("Bölge") or classify(ch.get("Grup", ""), ch.get("Kanal Adı", ""))) == REGION_TR
+        )
     if keyword:
-        kw = keyword.lower()
-        result = [ch for ch in result if kw in ch.get("Kanal Adı", "").lower() or kw in ch.get("Grup", "").lower()]
+        # Tek seferlik aramada indeks kurmak taramadan pahalıdır; SearchIndex ile aynı katlama
+        kw = fold_tr(keyword.strip())
+        result = (
+            ch for ch in result
+            if kw in fold_tr(ch.get("Kanal Adı", "")) or kw in fold_tr(ch.get("Grup", ""))
+        )
     if group_filter:
-        result = [ch for ch in result if ch.get("Grup", "") == group_filter]
-    return result
+        result = (ch for ch in result if ch.get("Grup", "") == group_filter)
+    return list(result)
 
 def _check_single_url(url: str, timeout: float = 3.0, user_agent: Optional[str] = None) -> str:
     """
@@ -210,24 +907,272 @@ def batch_check_health(
     timeout: float = 3.0,
     user_agent: Optional[str] = None,
     progress_callback: Optional[Callable[[int, int], None]] = None,
+    engine: str = "thread",
+    store=None,
+    tier: str = health_utils.TIER_HEAD,
+    escalate: bool = False,
+    ordered: bool = False,
+    deadline: Optional[float] = None,
 ) -> List[str]:
     """
     URL listesini paralel olarak kontrol eder.
+
+    ``engine="thread"`` her URL'yi iş parçacığı havuzunda ``_check_single_url``
+    ile, ``engine="async"`` ise tek olay döngüsünde ``utils.health`` motoruyla
+    kontrol eder (``max_workers`` eşzamanlı yoklama sayısı olur).
+
+    ``store`` (``health_store.HealthStore``) verilirse sonucu hâlâ taze olan
+    URL'ler yoklanmadan depodan alınır; yoklanan URL'lerin sonuçları depoya
+    yazılır.
+
+    ``tier`` yoklama kademesidir: ``"connect"`` yalnızca sunucuya bağlantı
+    açar (rtmp/rtsp/udp dahil), ``"head"`` HEAD + kısa GET, ``"get"`` derin
+    HLS yoklamasıdır. ``escalate=True`` ise önce bağlantı kademesi çalışır ve
+    yalnızca bağlantı kabul eden sunuculardaki URL'ler ``tier`` ile yoklanır.
+    ``"head"`` dışındaki kademeler ve yükseltme async motorda çalışır.
+
+    ``deadline`` (saniye) taramanın toplam süre sınırıdır; süre dolduğunda
+    yoklanamayan URL'ler "❔ Bekliyor" olarak döner. Duraklatılan süre de
+    sınırdan düşer. ``ordered=True`` ise
+    URL'ler liste sırasıyla (öncelik sırası) yoklanır.
+    """
+    probes = batch_probe(
+        urls,
+        max_workers=max_workers,
+        timeout=timeout,
+        user_agent=user_agent,
+        progress_callback=progress_callback,
+        engine=engine,
+        store=store,
+        tier=tier,
+        escalate=escalate,
+        ordered=ordered,
+        deadline=deadline,
+    )
+    return [probe.status for probe in probes]
+
+
+def batch_probe(
+    urls: List[str],
+    max_workers: int = 50,
+    timeout: float = 3.0,
+    user_agent: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    engine: str = "thread",
+    store=None,
+    tier: str = health_utils.TIER_HEAD,
+    escalate: bool = False,
+    result_callback: Optional[Callable[[str, health_utils.ProbeResult], None]] = None,
+    control: Optional[health_utils.SweepControl] = None,
+    ordered: bool = False,
+    deadline: Optional[float] = None,
+) -> List[health_utils.ProbeResult]:
+    """``batch_check_health`` gibi çalışır ancak durum metni yerine yoklama sonuçlarını döndürür.
+
+    ``tier="get"`` (derin HLS yoklaması) ``DeepProbeResult`` döndürür; derin
+    test ölçüm için istendiğinden depodaki taze sonuçlar atlanmaz, yalnızca
+    yeni sonuçlar depoya yazılır. ``tier="connect"`` sonuçları (yalnızca
+    bağlantı bilgisi) depoya yazılmaz.
+
+    ``result_callback(url, sonuç)`` sonuçlar çıktıkça (depodan gelenler
+    baştan) çağrılır; depo da tarama sürerken parça parça güncellenir, böylece
+    ``control`` ile iptal edilen taramanın sonuçları kaybolmaz.
     """
     total = len(urls)
     if total == 0:
         return []
+    # Depo okuma süresi de sınıra dahildir
+    expires = time.monotonic() + deadline if deadline else None
+    options = {
+        "max_workers": max_workers,
+        "timeout": timeout,
+        "user_agent": user_agent,
+        "engine": engine if tier == health_utils.TIER_HEAD and not escalate else "async",
+        "tier": tier,
+        "escalate": escalate,
+        "ordered": ordered,
+    }
+    if store is None or tier == health_utils.TIER_CONNECT:
+        return _probe_urls(
+            urls,
+            progress_callback=progress_callback,
+            result_callback=result_callback,
+            control=control,
+            deadline=_remaining(expires),
+            **options,
+        )
+
+    fresh = store.split_fresh(urls)[0] if tier == health_utils.TIER_HEAD else {}
+    pending = [url for url in urls if url not in fresh]
+    skipped = total - len(pending)
+    callback = progress_callback
+    if progress_callback and skipped:
+        # Depodan gelen satırlar baştan tamamlanmış sayılır
+        def callback(completed, _total):
+            progress_callback(skipped + completed, total)
+    if result_callback:
+        for url, status in fresh.items():
+            result_callback(url, health_utils.ProbeResult(status))
+
+    buffer: Dict[str, health_utils.ProbeResult] = {}
+    buffer_lock = threading.Lock()
+    flushed_at = time.monotonic()
+
+    def flush():
+        nonlocal flushed_at
+        with buffer_lock:
+            batch = dict(buffer)
+            buffer.clear()
+            flushed_at = time.monotonic()
+        store.record(batch)
+
+    def record(url, probe):
+        if result_callback:
+            result_callback(url, probe)
+        with buffer_lock:
+            buffer[url] = probe
+            due = len(buffer) >= _STORE_FLUSH_ROWS or time.monotonic() - flushed_at >= _STORE_FLUSH_SECONDS
+        if due:
+            flush()
+
+    try:
+        probes = (
+            _probe_urls(
+                pending,
+                progress_callback=callback,
+                result_callback=record,
+                control=control,
+                deadline=_remaining(expires),
+                **options,
+            )
+            if pending
+            else []
+        )
+    finally:
+        flush()
+    probed = dict(zip(pending, probes))
+    return [health_utils.ProbeResult(fresh[url]) if url in fresh else probed[url] for url in urls]
+
+
+def _remaining(expires: Optional[float]) -> Optional[float]:
+    """Mutlak süre sınırına kalan saniye (sınır yoksa ``None``)."""
+    if expires is None:
+        return None
+    # Sınır zaten dolduysa sıfır yerine çok kısa bir süre: 0 "sınırsız" demektir
+    return max(expires - time.monotonic(), 0.001)
+
+
+def prioritize_urls(urls: List[str], visible: Optional[List[str]] = None, store=None) -> List[str]:
+    """URL'leri tarama önceliğine göre sıralar (tekrarlar ayıklanır).
+
+    Önce ``visible`` (ekranda/filtrede görünen) URL'ler, sonra kalanlar gelir.
+    Her grubun içinde hiç kontrol edilmemiş URL'ler öne, depodaki sonucu en
+    eski olanlar onların arkasına, en yeni kontrol edilenler sona dizilir.
+    Eşitlikte listedeki ilk sıra korunur.
+    """
+    unique = list(dict.fromkeys(urls))
+    shown = set(visible or ())
+    checked: Dict[str, float] = {}
+    if store is not None and unique:
+        checked = {url: result.checked_at for url, result in store.get(unique).items()}
+    order = {url: i for i, url in enumerate(unique)}
+    return sorted(
+        unique,
+        key=lambda url: (url not in shown, url in checked, checked.get(url, 0.0), order[url]),
+    )
+
+
+class HealthSweep(NamedTuple):
+    """``plan_health_sweep`` sonucu: yoklanacak URL'ler ve iş ayarları."""
+
+    urls: List[str]
+    options: Dict[str, object]
+    skipped: int
+
+
+def plan_health_sweep(
+    urls: List[str],
+    *,
+    visible: Optional[List[str]] = None,
+    store=None,
+    limit: int = HEALTH_CHECK_MAX_CHANNELS,
+    deadline: Optional[float] = HEALTH_CHECK_DEADLINE,
+    **options,
+) -> HealthSweep:
+    """Süre sınırlı, öncelik sıralı sağlık taramasını hazırlar.
+
+    URL'ler ``prioritize_urls`` ile sıralanır ve ``limit`` (0 = sınırsız)
+    kadarıyla kesilir; ``skipped`` kesilen URL sayısıdır. ``options``
+    ``batch_probe`` ayarlarına sıralı yoklama ve ``deadline`` eklenerek
+    döner; sonuç doğrudan ``HealthJobManager.submit(sweep.urls, **sweep.options)``
+    ile çalıştırılır. Süre dolduğunda yoklanamayan satırlar "❔ Bekliyor"
+    kalır ve bir sonraki tarama onlara (hiç kontrol edilmemiş olduklarından)
+    önce gelir.
+    """
+    queue = prioritize_urls(urls, visible=visible, store=store)
+    skipped = 0
+    if 0 < limit < len(queue):
+        skipped = len(queue) - limit
+        queue = queue[:limit]
+    return HealthSweep(queue, dict(options, store=store, ordered=True, deadline=deadline or None), skipped)
+
+
+def _probe_urls(
+    urls: List[str],
+    *,
+    max_workers: int,
+    timeout: float,
+    user_agent: Optional[str],
+    progress_callback: Optional[Callable[[int, int], None]],
+    engine: str,
+    tier: str = health_utils.TIER_HEAD,
+    escalate: bool = False,
+    result_callback: Optional[Callable[[str, health_utils.ProbeResult], None]] = None,
+    control: Optional[health_utils.SweepControl] = None,
+    ordered: bool = False,
+    deadline: Optional[float] = None,
+) -> List[health_utils.ProbeResult]:
+    total = len(urls)
+    if engine == "async":
+        return health_utils.check_urls(
+            urls,
+            concurrency=max_workers,
+            timeout=timeout,
+            user_agent=user_agent,
+            progress_callback=progress_callback,
+            tier=tier,
+            escalate=escalate,
+            result_callback=result_callback,
+            control=control,
+            ordered=ordered,
+            deadline=deadline,
+        )
+    if engine != "thread":
+        raise ValueError(f"Bilinmeyen sağlık kontrolü motoru: {engine}")
 
     # Worker sayısını URL sayısına göre ayarla
     workers = min(max_workers, total)
     results = ["❔ Bekliyor"] * total
     completed = 0
     progress_lock = threading.Lock()
+    # Süre sınırı dolunca başlamamış işler atlanır, geç gelen sonuçlar bildirilmez
+    expired = threading.Event()
+    expires = time.monotonic() + deadline if deadline else None
 
     def check_with_index(args):
         nonlocal completed
         idx, url = args
+        # Duraklatılmış işçiler süre sınırında uyanır; aksi halde kapatılan havuzda asılı kalırdı
+        if expired.is_set() or (control is not None and not control.proceed(_remaining(expires))):
+            return idx, "❔ Bekliyor"
         result = _check_single_url(url, timeout=timeout, user_agent=user_agent)
+        if expired.is_set():
+            return idx, "❔ Bekliyor"
+        if result_callback:
+            try:
+                result_callback(url, health_utils.ProbeResult(result))
+            except Exception:
+                logger.exception("Sonuç geri çağrısı başarısız")
         if progress_callback:
             try:
                 with progress_lock:
@@ -241,13 +1186,14 @@ def batch_check_health(
                 completed += 1
         return idx, result
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    try:
         futures = {
             executor.submit(check_with_index, (i, url)): i 
             for i, url in enumerate(urls)
         }
 
-        for future in concurrent.futures.as_completed(futures):
+        for future in concurrent.futures.as_completed(futures, timeout=deadline):
             try:
                 idx, result = future.result(timeout=timeout + 5)
                 results[idx] = result
@@ -257,22 +1203,173 @@ def batch_check_health(
             except Exception as e:
                 idx = futures[future]
                 results[idx] = "❌ Hata"
+    except concurrent.futures.TimeoutError:
+        # Süre sınırı: biten sonuçlar döner, kalanlar "❔ Bekliyor" kalır
+        expired.set()
+        logger.info(f"Tarama süre sınırında durduruldu: {completed}/{total} satır tamamlandı")
+    finally:
+        # Süre dolduysa süren yoklamalar beklenmez (kendi zaman aşımlarıyla biterler)
+        executor.shutdown(wait=not expired.is_set(), cancel_futures=True)
+
+    return [health_utils.ProbeResult(result) for result in results]
+
+def set_attribute(raw: str, key: str, value: str) -> str:
+    """Ham EXTINF öznitelik metninde ``key`` değerini günceller, ekler veya siler.
+
+    Boş ``value`` özniteliği kaldırır; diğer öznitelikler ve sıraları korunur.
+    """
+    marker = f'{key}="'
+    i = raw.find(marker)
+    if i >= 0 and (i == 0 or raw[i - 1] == " "):
+        j = raw.find('"', i + len(marker))
+        if j < 0:
+            j = len(raw) - 1
+        if raw[i + len(marker):j] == value:
+            return raw
+        if not value:
+            return (raw[:i].rstrip() + raw[j + 1:]).strip()
+        return f"{raw[:i]}{marker}{value}{raw[j:]}"
+    if not value:
+        return raw
+    return f'{raw or "-1"} {marker}{value}"'
+
+
+def update_attributes(raw: str, group: str, logo: str) -> str:
+    """Ham öznitelik metnine güncel grup ve logo değerlerini işler."""
+    if not raw:
+        raw = "-1"
+    raw = set_attribute(raw, "tvg-logo", logo)
+    return set_attribute(raw, "group-title", group)
+
+
+def format_extinf(raw: str, group: str, logo: str, title: str) -> str:
+    """Ham öznitelikleri koruyarak güncel grup/logo/başlıkla #EXTINF satırı üretir."""
+    return f"#EXTINF:{update_attributes(raw, group, logo)},{title}"
+
+
+def _sanitize_values(values: pd.Series, quoted: bool) -> pd.Series:
+    """Satır sonlarını boşluğa çevirir; öznitelik değerlerinde çift tırnağı tek tırnağa çevirir."""
+    values = values.str.replace(r"[\r\n]+", " ", regex=True)
+    if quoted:
+        values = values.str.replace('"', "'", regex=False)
+    return values
+
+
+def _text_column(df: pd.DataFrame, column: str, quoted: bool = False) -> pd.Series:
+    """Sütunu temizlenmiş string Series olarak döndürür (kategorikler yalnızca kategori başına işlenir)."""
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = _sanitize_values(pd.Series(series.cat.categories.astype(str)), quoted)
+        values = categories.to_numpy(dtype=object)[series.cat.codes.to_numpy()]
+        return pd.Series(values, index=df.index, dtype=object)
+    return _sanitize_values(series.fillna("").astype(str), quoted)
+
+
+def _extinf_block(df: pd.DataFrame) -> pd.Series:
+    """Her satır için ``#EXTINF...\n[seçenekler\n]URL\n`` metnini sütun işlemleriyle üretir.
+
+    ``Alternatifler`` sütunu (birleştirilmiş yinelenenler) doluysa her
+    alternatif URL, aynı başlık ve seçeneklerle ayrı bir kayıt olarak
+    temsilci kaydın hemen arkasına yazılır.
+    """
+    group = _text_column(df, "Grup", quoted=True)
+    logo = _text_column(df, "LogoURL", quoted=True)
+    title = _text_column(df, "Kanal Adı")
+    url = _text_column(df, "URL")
+
+    # Ham öznitelik yoksa: -1 [tvg-logo="..."] group-title="..."
+    logo_attr = (' tvg-logo="' + logo + '"').where(logo != "", "")
+    header = "-1" + logo_attr + ' group-title="' + group + '"'
+
+    if "Öznitelikler" in df.columns:
+        raw = df["Öznitelikler"].fillna("").astype(str)
+        has_raw = raw != ""
+        # Grup/logo değişmemişse ham öznitelikler aynen yazılır
+        raw_group = raw.str.extract(r'(?:^|\s)group-title="([^"]*)"', expand=False)
+        raw_logo = raw.str.extract(r'(?:^|\s)tvg-logo="([^"]*)"', expand=False).fillna("")
+        unchanged = has_raw & (raw_group == group).fillna(False) & (raw_logo == logo)
+        header = header.where(~has_raw, raw)
+        changed = (has_raw & ~unchanged).to_numpy()
+        if changed.any():
+            header = header.astype(object)
+            header[changed] = [
+                update_attributes(r, g, l)
+                for r, g, l in zip(raw[changed], group[changed], logo[changed])
+            ]
+
+    lines = "#EXTINF:" + header.astype(object) + "," + title + "\n"
+
+    if "Seçenekler" in df.columns:
+        options = df["Seçenekler"].to_numpy(dtype=object)
+        has_options = np.fromiter((isinstance(o, (list, tuple)) and len(o) > 0 for o in options), bool, len(options))
+        if has_options.any():
+            extra = np.full(len(options), "", dtype=object)
+            extra[has_options] = ["\n".join(o) + "\n" for o in options[has_options]]
+            lines = lines + extra
+
+    block = lines + url + "\n"
+    if "Alternatifler" in df.columns:
+        alternates = df["Alternatifler"].to_numpy(dtype=object)
+        has_alternates = np.fromiter(
+            (isinstance(a, (list, tuple)) and len(a) > 0 for a in alternates), bool, len(alternates)
+        )
+        if has_alternates.any():
+            block = block.astype(object)
+            prefixes = lines.to_numpy(dtype=object)
+            block[has_alternates] = [
+                entry + "".join(prefix + re.sub(r"[\r\n]+", " ", str(alt)) + "\n" for alt in alts)
+                for entry, prefix, alts in zip(
+                    block[has_alternates], prefixes[has_alternates], alternates[has_alternates]
+                )
+            ]
+    return block
+
+
+def write_m3u(df: pd.DataFrame, fp=None, chunk_rows: int = 20000) -> Optional[bytes]:
+    """Kanal tablosunu M3U olarak yazar; satırlar sütun işlemleriyle parça parça üretilir.
+
+    Args:
+        df: Kanal bilgilerini içeren DataFrame
+        fp: ``write`` (dosya) veya ``sendall`` (soket) metodu olan hedef; verilmezse bytes döner
+        chunk_rows: Tek seferde üretilip yazılan satır sayısı
+
+    Returns:
+        ``fp`` verilmediyse UTF-8 M3U içeriği, verildiyse None
+    """
+    chunks: List[bytes] = []
+    if fp is None:
+        write = chunks.append
+    else:
+        write = getattr(fp, "write", None) or fp.sendall
+
+    write(b"#EXTM3U\n")
+    for start in range(0, len(df), chunk_rows):
+        block = _extinf_block(df.iloc[start:start + chunk_rows])
+        write("".join(block.tolist()).encode("utf-8"))
+
+    if fp is None:
+        return b"".join(chunks)
+    return None
+
+
+def export_fingerprint(dataset_version, *filters) -> str:
+    """Veri sürümü ve filtre durumundan dışa aktarım önbelleği için kararlı bir anahtar üretir."""
+    payload = repr((dataset_version, [sorted(f) if isinstance(f, (list, tuple, set)) else f for f in filters]))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-    return results
 
 def convert_df_to_m3u(df: pd.DataFrame) -> str:
     """Pandas DataFrame'i M3U formatına dönüştürür.
     
+    Parse sırasında saklanan öznitelikler (tvg-id, tvg-name, catchup...) ve
+    #EXTVLCOPT/#KODIPROP satırları varsa aynen geri yazılır.
+
     Args:
         df: Kanal bilgilerini içeren DataFrame
         
     Returns:
         M3U formatında string
     """
-    lines: List[str] = ["#EXTM3U"]
-    for _, row in df.iterrows():
-        logo = row.get("LogoURL", "")
-        logo_attr = f' tvg-logo="{logo}"' if logo else ""
-        lines.append(f'#EXTINF:-1{logo_attr} group-title="{row["Grup"]}",{row["Kanal Adı"]}')
-        lines.append(str(row["URL"]))
-    return "\n".join(lines) + "\n"
+    return write_m3u(df).decode("utf-8")
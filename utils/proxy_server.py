@@ -236,6 +236,8 @@ class LocalProxyServer:
         import os
         from utils.visitor_counter import VisitorCounter
         self.playlist_file = VisitorCounter._resolve_path("temp_playlist.m3u")
+        # Dosyadaki listenin hangi veri/filtre durumundan üretildiği (tembel dışa aktarım için)
+        self.playlist_fingerprint = None
 
     def start(self):
         # 🔄 AĞDAKİ DİĞER CİHAZLARIN ERİŞEBİLMESİ İÇİN:
@@ -266,8 +268,29 @@ class LocalProxyServer:
 
     def set_m3u_content(self, content: str):
         """Çalma listesi içeriğini RAM yerine geçici bir dosyaya yazar."""
+        self.write_playlist(lambda f: f.write(content.encode("utf-8")))
+
+    def write_playlist(self, writer, fingerprint=None) -> bool:
+        """Çalma listesini ``writer(dosya)`` ile doğrudan geçici dosyaya yazar.
+
+        İçerik önce yan dosyaya yazılıp atomik olarak yerine taşınır; böylece
+        o an sunulmakta olan liste yarım kalmaz. ``fingerprint`` verilirse
+        aynı parmak iziyle tekrar çağrıldığında dosya yeniden üretilmez.
+        """
+        if fingerprint is not None and fingerprint == self.playlist_fingerprint:
+            return True
+        import os
+        tmp_path = f"{self.playlist_file}.{threading.get_ident()}.tmp"
         try:
-            with open(self.playlist_file, "w", encoding="utf-8", newline="") as f:
-                f.write(content)
+            with open(tmp_path, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, self.playlist_file)
+            self.playlist_fingerprint = fingerprint
+            return True
         except OSError as e:
-            logger.error(f"Failed to write playlist to file: {e}")
\ No newline at end of file
+            logger.error(f"Failed to write playlist to file: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
@@ -0,0 +1,330 @@
+"""M3U tamponunun satır döngüsü olmadan (vektörel) taranması.
+
+Satır sınırları, #EXTINF → URL eşleştirmesi, başlığı ayıran virgül ve
+``group-title``/``tvg-logo`` değerleri numpy ile tüm tampon üzerinde tek
+seferde bulunur; alanlar kanal başına Python ``str``/``tuple`` oluşturulmadan
+Arrow string dizilerine kopyalanır. Sonuç ``parser._iter_records`` ile
+aynıdır: satırlar ``\\n`` (ve ilk ``\\r``) ile biter, uçlardaki boşluklar
+``str.strip`` gibi (ASCII dışı boşluklar dahil) atılır.
+
+pyarrow kurulu değilse veya tampon geçerli UTF-8 değilse (``errors="ignore"``
+ile atılacak baytlar varsa) ``scan_m3u`` None döndürür; çağıran satır satır
+parser'a düşer.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - Streamlit ile birlikte kurulu gelir
+    pa = pc = None
+
+# store.TYPE_CATEGORIES sırasıyla tür kodları
+KIND_HLS, KIND_DASH, KIND_OTHER = 0, 1, 2
+
+_OPTION_PREFIXES = (b"#EXTVLCOPT", b"#KODIPROP")
+_GROUP_KEY = b'group-title="'
+_LOGO_KEY = b'tvg-logo="'
+
+# str.strip'in attığı ASCII karakterler
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
+# ASCII dışı boşlukların (U+0085, U+00A0, U+1680, U+2000-200A, U+2028/2029,
+# U+202F, U+205F, U+3000) UTF-8 ilk ve son baytları; bu baytla başlayan veya
+# biten satırlar Python'da ayrıca kırpılır
+_WIDE_LEAD = np.zeros(256, dtype=bool)
+_WIDE_LEAD[[0xC2, 0xE1, 0xE2, 0xE3]] = True
+_WIDE_TAIL = np.zeros(256, dtype=bool)
+_WIDE_TAIL[[*range(0x80, 0x8B), 0x9F, 0xA0, 0xA8, 0xA9, 0xAF]] = True
+
+
+def _trim(raw: np.ndarray, starts: np.ndarray, stops: np.ndarray, ascii_only: bool = False) -> None:
+    """``[starts, stops)`` aralıklarını ``str.strip`` gibi yerinde kırpar.
+
+    ``ascii_only``: tamponda ASCII dışı bayt yok, geniş boşluk denetimi atlanır.
+    """
+    rows = np.flatnonzero(starts < stops)
+    while len(rows):
+        rows = rows[_SPACE[raw[starts[rows]]]]
+        starts[rows] += 1
+        rows = rows[starts[rows] < stops[rows]]
+    rows = np.flatnonzero(starts < stops)
+    while len(rows):
+        rows = rows[_SPACE[raw[stops[rows] - 1]]]
+        stops[rows] -= 1
+        rows = rows[starts[rows] < stops[rows]]
+
+    if ascii_only:
+        return
+    rows = np.flatnonzero(starts < stops)
+    rows = rows[_WIDE_LEAD[raw[starts[rows]]] | _WIDE_TAIL[raw[stops[rows] - 1]]]
+    for row in rows.tolist():
+        start, stop = int(starts[row]), int(stops[row])
+        text = raw[start:stop].tobytes().decode("utf-8", errors="ignore")
+        stripped = text.strip()
+        if len(stripped) == len(text):
+            continue
+        head = len(text) - len(text.lstrip())
+        starts[row] = start + len(text[:head].encode("utf-8"))
+        stops[row] = starts[row] + len(stripped.encode("utf-8"))
+
+
+def _words(raw: np.ndarray) -> np.ndarray:
+    """Her bayt konumundan başlayan 8 baytlık (hizasız, little-endian) sözcükler; kopyasız görünüm."""
+    return np.ndarray((max(len(raw) - 7, 0),), dtype="<u8", buffer=raw, strides=(1,))
+
+
+def _match_mask(raw: np.ndarray, candidates: np.ndarray, pattern: bytes, fold: bool = False) -> np.ndarray:
+    """``candidates`` konumlarından hangilerinde ``pattern`` başladığını gösteren maske.
+
+    Karşılaştırma bayt bayt değil 8 baytlık sözcüklerle yapılır; sözcüğün
+    sığmadığı tampon sonundaki adaylar bayt bayt denetlenir. ``fold``
+    verilirse ASCII harflerde büyük/küçük harf gözetilmez.
+    """
+    fits = (candidates >= 0) & (candidates <= len(raw) - len(pattern))
+    whole = fits & (candidates <= len(raw) - 8)
+    hits = np.flatnonzero(whole)
+    words = _words(raw)
+    for offset in sorted({*range(0, len(pattern) - 7, 8), max(len(pattern) - 8, 0)}):
+        chunk = pattern[offset:offset + 8]
+        fold_bits = int.from_bytes(bytes(0x20 if fold and chr(c).isalpha() else 0 for c in chunk), "little")
+        width = (1 << (8 * len(chunk))) - 1
+        found = words[candidates[hits] + offset]
+        if fold_bits:
+            found = found | np.uint64(fold_bits)
+        if width != (1 << 64) - 1:
+            found = found & np.uint64(width)
+        hits = hits[found == np.uint64(int.from_bytes(chunk, "little"))]
+
+    tail = np.flatnonzero(fits & ~whole)
+    for offset, char in enumerate(pattern):
+        if not len(tail):
+            break
+        found = raw[candidates[tail] + offset]
+        if fold and chr(char).isalpha():
+            found = found | 0x20
+        tail = tail[found == char]
+
+    mask = np.zeros(len(candidates), dtype=bool)
+    mask[hits] = True
+    mask[tail] = True
+    return mask
+
+
+def _match_at(raw: np.ndarray, candidates: np.ndarray, pattern: bytes, fold: bool = False) -> np.ndarray:
+    """``candidates`` içinden ``pattern``'in başladığı konumlar (bkz. ``_match_mask``)."""
+    return candidates[_match_mask(raw, candidates, pattern, fold)]
+
+
+def _first_within(positions: np.ndarray, starts: np.ndarray, limits: np.ndarray) -> np.ndarray:
+    """Her aralık için ``starts`` ile ``limits`` (hariç) arasındaki ilk konum, yoksa -1."""
+    if not len(positions):
+        return np.full(len(starts), -1, dtype=np.int64)
+    slots = np.searchsorted(positions, starts)
+    found = positions[np.minimum(slots, len(positions) - 1)]
+    return np.where((slots < len(positions)) & (found < limits), found, -1)
+
+
+def _segments(buffer, starts: np.ndarray, stops: np.ndarray):
+    """Sıralı, çakışmayan bayt aralıklarını kopyasız bir Arrow ikili dizisi olarak gösterir.
+
+    Aralıklar ve aralarındaki boşluklar sırayla dilimlenir; çift konumlar
+    boşluklar, tek konumlar istenen aralıklardır.
+    """
+    count = len(starts)
+    offsets = np.empty(2 * count + 1, dtype=np.int64)
+    offsets[0] = 0
+    offsets[1::2] = starts
+    offsets[2::2] = stops
+    return pa.Array.from_buffers(pa.large_binary(), 2 * count, [None, pa.py_buffer(offsets), buffer])
+
+
+def _prefixed(raw: np.ndarray, starts: np.ndarray, stops: np.ndarray, rows: np.ndarray, prefix: bytes) -> np.ndarray:
+    """``rows`` içinden ``prefix`` ile başlayan satırlar."""
+    rows = rows[stops[rows] - starts[rows] >= len(prefix)]
+    return np.searchsorted(starts, _match_at(raw, starts[rows], prefix))
+
+
+def _strings(buffer, starts: np.ndarray, stops: np.ndarray, ascii_only: bool = False):
+    """Aralıkları tek kopyayla Arrow string dizisine alır (geçersiz UTF-8'de ``ArrowInvalid``).
+
+    Tamponda ASCII dışı bayt yoksa UTF-8 doğrulaması atlanır.
+    """
+    pieces = _segments(buffer, starts, stops)
+    values = pieces.take(np.arange(1, len(pieces), 2, dtype=np.int64))
+    return values.view(pa.large_string()) if ascii_only else values.cast(pa.large_string())
+
+
+def scan_m3u(data, start: int = 0, end: Optional[int] = None) -> Optional[Dict[str, object]]:
+    """``data[start:end]`` aralığındaki kanalları sütunlar halinde çıkarır.
+
+    Returns:
+        ``Kanal Adı``, ``URL``, ``LogoURL``, ``Öznitelikler`` Arrow string
+        dizileri, ``Grup`` için ``(kodlar, kategoriler)`` (ilk görülme
+        sırasıyla), ``Tür`` kod dizisi (``KIND_*``) ve ``Seçenekler``
+        (``{satır: [yönerge, ...]}``) içeren sözlük; pyarrow yoksa veya içerik
+        geçerli UTF-8 değilse None
+    """
+    if pa is None:
+        return None
+    view = memoryview(data)[start:end]
+    raw = np.frombuffer(view, dtype=np.uint8)
+    size = len(raw)
+    ascii_only = not size or raw.max() < 0x80
+
+    # Satırlar \n'den sonra başlar, ilk \r veya \n'de biter
+    newlines = np.flatnonzero(raw == 10)
+    line_starts = np.concatenate(([0], newlines + 1))
+    if data.find(b"\r", start, start + size) >= 0 if hasattr(data, "find") else np.any(raw == 13):
+        breaks = np.flatnonzero((raw == 10) | (raw == 13))
+        slots = np.searchsorted(breaks, line_starts)
+        line_ends = np.where(slots < len(breaks), breaks[np.minimum(slots, len(breaks) - 1)], size)
+    else:
+        line_ends = np.append(newlines, size)
+    _trim(raw, line_starts, line_ends, ascii_only)
+    kept = line_starts < line_ends
+    line_starts, line_ends = line_starts[kept], line_ends[kept]
+
+    is_url = raw[line_starts] != 35
+    comment_rows = np.flatnonzero(~is_url)
+    inf_mask = np.zeros(len(line_starts), dtype=bool)
+    inf_mask[_prefixed(raw, line_starts, line_ends, comment_rows, b"#EXTINF")] = True
+
+    # URL satırı yalnızca hemen önceki işaret (#EXTINF/URL) bir #EXTINF ise kanaldır
+    markers = np.flatnonzero(inf_mask | is_url)
+    marker_is_inf = inf_mask[markers]
+    paired = marker_is_inf[:-1] & ~marker_is_inf[1:]
+    inf_rows = markers[:-1][paired]
+    url_rows = markers[1:][paired]
+    count = len(inf_rows)
+
+    inf_starts = line_starts[inf_rows]
+    inf_ends = line_ends[inf_rows]
+    head = np.minimum(inf_starts + 8, inf_ends)
+
+    # Başlığı ayıran virgül: öznitelik bölümünde tırnak dışında kalan ilk virgül
+    quotes = np.flatnonzero(raw == 34)
+    commas = np.flatnonzero(raw == 44)
+    row_of_comma = np.searchsorted(inf_starts, commas, side="right") - 1
+    valid = row_of_comma >= 0
+    if count:
+        safe_rows = np.where(valid, row_of_comma, 0)
+        valid &= (commas >= head[safe_rows]) & (commas < inf_ends[safe_rows])
+    commas, row_of_comma = commas[valid], row_of_comma[valid]
+    parity = np.searchsorted(quotes, commas) - np.searchsorted(quotes, head[row_of_comma])
+    comma = _first_within(commas[(parity & 1) == 0], head, inf_ends)
+    missing = np.flatnonzero(comma < 0)
+    if len(missing):
+        # Kapanmayan tırnak: başlık son tırnaktan sonraki ilk virgülden başlar
+        ends = inf_ends[missing]
+        quotes_before = np.searchsorted(quotes, ends)
+        open_quote = (quotes_before - np.searchsorted(quotes, head[missing])) & 1
+        last_quote = quotes[np.maximum(quotes_before - 1, 0)] if len(quotes) else ends
+        after = _first_within(commas, np.where(open_quote == 1, last_quote, ends), ends)
+        comma[missing] = np.where(after >= 0, after, ends)
+
+    attr_starts, attr_stops = head.copy(), comma.copy()
+    _trim(raw, attr_starts, attr_stops, ascii_only)
+    title_starts, title_stops = np.minimum(comma + 1, inf_ends), inf_ends.copy()
+    _trim(raw, title_starts, title_stops, ascii_only)
+
+    # Anahtarlar tırnakla biter: her tırnaktan önceki 8 bayt bir kez okunur, anahtarın
+    # sonuyla eşleşen adaylar tam anahtarla doğrulanır
+    key_ends = quotes[quotes >= 7]
+    tails = _words(raw)[key_ends - 7]
+    group_starts, group_stops = _quoted_value(raw, _GROUP_KEY, key_ends, tails, inf_starts, inf_ends, comma, quotes)
+    logo_starts, logo_stops = _quoted_value(raw, _LOGO_KEY, key_ends, tails, inf_starts, inf_ends, comma, quotes)
+
+    url_starts = line_starts[url_rows]
+    url_ends = line_ends[url_rows]
+    options: Dict[int, List[str]] = {}
+    other_rows = comment_rows[~inf_mask[comment_rows]]
+    option_rows = np.sort(
+        np.concatenate([_prefixed(raw, line_starts, line_ends, other_rows, prefix) for prefix in _OPTION_PREFIXES])
+    )
+    if len(option_rows) and len(markers):
+        # Yönerge, kendinden önceki son işaret eşleşmiş bir #EXTINF ise o kanala aittir
+        owner = np.searchsorted(markers, option_rows) - 1
+        channel = np.full(len(markers), -1, dtype=np.int64)
+        channel[np.flatnonzero(np.append(paired, False))] = np.arange(count)
+        owners = np.where(owner >= 0, channel[np.maximum(owner, 0)], -1)
+        for row, line in zip(owners.tolist(), option_rows.tolist()):
+            if row >= 0:
+                text = raw[line_starts[line]:line_ends[line]].tobytes().decode("utf-8", errors="ignore")
+                options.setdefault(row, []).append(text)
+
+    buffer = pa.py_buffer(raw)
+    try:
+        groups = _strings(buffer, group_starts, group_stops, ascii_only)
+        titles = _strings(buffer, title_starts, title_stops, ascii_only)
+        urls = _strings(buffer, url_starts, url_ends, ascii_only)
+        columns = {
+            "URL": urls,
+            "LogoURL": _strings(buffer, logo_starts, logo_stops, ascii_only),
+            "Öznitelikler": _strings(buffer, attr_starts, attr_stops, ascii_only),
+        }
+    except pa.ArrowInvalid:
+        return None
+
+    # Grup yoksa "Genel", başlık yoksa "Bilinmeyen" (parser._iter_records ile aynı)
+    encoded = groups.dictionary_encode()
+    codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+    names: Dict[str, int] = {}
+    remap = np.array(
+        [names.setdefault(name or "Genel", len(names)) for name in encoded.dictionary.to_pylist()], dtype=np.int32
+    )
+    columns["Grup"] = (remap[codes] if len(remap) else codes, list(names))
+    columns["Kanal Adı"] = pc.if_else(pc.equal(pc.binary_length(titles), 0), "Bilinmeyen", titles)
+    columns["Tür"] = _kinds(urls)
+    columns["Seçenekler"] = options
+    return columns
+
+
+def _quoted_value(raw, key: bytes, key_ends, tails, starts, stops, commas, quotes) -> tuple:
+    """``key="..."`` değerinin aralıkları (``str.find`` ile öznitelik bölümünde aranır); yoksa boş aralık."""
+    candidates = key_ends[tails == np.uint64(int.from_bytes(key[-8:], "little"))] - (len(key) - 1)
+    if len(key) > 8:
+        candidates = _match_at(raw, candidates, key[:-8])
+    found = _first_within(candidates, starts, commas - len(key) + 1)
+    value = found + len(key)
+    close = _first_within(quotes, value, stops)
+    # Kapanış tırnağı yoksa değer satır sonundan bir önceki karaktere kadardır
+    close = np.where(close >= 0, close, stops - 1)
+    has = found >= 0
+    value_starts = np.where(has, value, starts)
+    return value_starts, np.where(has, np.maximum(close, value), starts)
+
+
+def _kinds(urls) -> np.ndarray:
+    """URL'lerin tür kodları: ``.m3u8``/``/live/`` → HLS, ``.mpd`` → DASH (büyük/küçük harf duyarsız)."""
+    kinds = np.full(len(urls), KIND_OTHER, dtype=np.int8)
+    _, offsets, values = urls.buffers()
+    if len(urls) < 1 or values is None:
+        return kinds
+    offsets = np.frombuffer(offsets, dtype=np.int64)[urls.offset:urls.offset + len(urls) + 1]
+    data = np.frombuffer(values, dtype=np.uint8)[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+
+    # Adaylar tek geçişte: ".m" (.m3u8, .mpd) ve "/l" (/live/) başlangıçları
+    second = data[1:] | 0x20
+    candidates = np.flatnonzero(((data[:-1] == 46) & (second == 109)) | ((data[:-1] == 47) & (second == 108)))
+    del second
+
+    owner = np.searchsorted(offsets, candidates, side="right") - 1
+    # URL'ler ayraçsız art arda durduğundan eşleşme kendi satırına sığmalıdır
+    room = offsets[owner + 1] - candidates
+    dots = data[candidates] == 46
+
+    def rows(subset, pattern):
+        matched = _match_mask(data, candidates[subset], pattern, fold=True) & (room[subset] >= len(pattern))
+        return owner[subset][matched]
+
+    kinds[rows(dots, b".mpd")] = KIND_DASH
+    kinds[rows(dots, b".m3u8")] = KIND_HLS
+    kinds[rows(~dots, b"/live/")] = KIND_HLS
+    return kinds
@@ -0,0 +1,170 @@
+"""Kanal adı / grup araması için bellek içi arama indeksi.
+
+Kanal adları Türkçe uyumlu küçük harfe katlanıp (İ/I/ı → i) tek bir metinde
+birleştirilir ve her 3'lü karakter grubunun (trigram) geçtiği konumlar
+sıralı dizilerde tutulur. Sorgu, trigramlarının konum kümelerinin uygun
+kaydırmalarla kesişimi olarak hesaplanır; bu kesişim tam alt dize eşleşmesi
+verir, ayrıca doğrulama taraması gerekmez. Grup adları kategori başına bir
+kez katlanır ve kategori kodları üzerinden satırlara yayılır.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+_TR_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+_SEPARATOR = "\x00"
+
+
+def fold_tr(text: str) -> str:
+    """Metni Türkçe uyumlu biçimde küçük harfe katlar (İ, I, ı ve i eşdeğer sayılır)."""
+    return text.translate(_TR_FOLD).lower()
+
+
+def _fold_series(values: pd.Series) -> pd.Series:
+    """``fold_tr``'nin sütun işlemleriyle çalışan karşılığı."""
+    values = values.astype(str)
+    for src in ("İ", "I", "ı"):
+        values = values.str.replace(src, "i", regex=False)
+    return values.str.lower()
+
+
+class SearchIndex:
+    """Kanal adı ve grup üzerinde alt dize / önek araması yapan trigram indeksi.
+
+    Trigramlar katlanmış adların UTF-8 baytları üzerinde tutulur; UTF-8
+    kendini eşleyen bir kodlama olduğu için bayt düzeyindeki eşleşme
+    karakter düzeyindeki eşleşmeyle aynıdır.
+
+    Args:
+        names: Kanal adları (satır sırasıyla)
+        groups: Grup adları (satır sırasıyla) veya kategorik sütun
+    """
+
+    def __init__(self, names: Sequence[str], groups: Optional[Sequence[str]] = None) -> None:
+        names = names if isinstance(names, pd.Series) else pd.Series(list(names), dtype=object)
+        self.size = len(names)
+        folded = _fold_series(names).str.replace(_SEPARATOR, " ", regex=False).tolist() if self.size else []
+
+        blob = (_SEPARATOR.join(folded) + _SEPARATOR).encode("utf-8") if folded else b""
+        self._bytes = np.frombuffer(blob, dtype=np.uint8)
+        del folded, blob
+        row_ends = np.flatnonzero(self._bytes == 0)
+        self._row_starts = np.zeros(self.size, dtype=np.int64)
+        self._row_starts[1:] = row_ends[:-1] + 1
+
+        # (trigram << 32 | konum) çiftlerini tek bir uint64 dizide sıralamak,
+        # argsort'a göre belirgin biçimde hızlıdır ve konumları trigram içinde
+        # artan sırada bırakır.
+        chars = self._bytes.astype(np.uint64)
+        pairs = (chars[:-2] << np.uint64(48)) | (chars[1:-1] << np.uint64(40)) | (chars[2:] << np.uint64(32))
+        del chars
+        pairs |= np.arange(len(pairs), dtype=np.uint64)
+        pairs.sort()
+        sorted_keys = (pairs >> np.uint64(32)).astype(np.uint32)
+        self._positions = (pairs & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+        del pairs
+        starts = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate(([0], starts)) if len(sorted_keys) else starts
+        self._trigrams = sorted_keys[starts]
+        self._posting_bounds = np.append(starts, len(sorted_keys))
+        del sorted_keys
+
+        if groups is None:
+            groups = pd.Series([""] * self.size, dtype=object)
+        group_series = groups if isinstance(groups, pd.Series) else pd.Series(list(groups))
+        if isinstance(group_series.dtype, pd.CategoricalDtype):
+            self._group_codes = group_series.cat.codes.to_numpy()
+            categories = pd.Series(group_series.cat.categories)
+        else:
+            self._group_codes, uniques = pd.factorize(group_series)
+            categories = pd.Series(uniques)
+        self._group_keys = _fold_series(categories).tolist() if len(categories) else []
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SearchIndex":
+        """Kanal tablosunun ``Kanal Adı`` ve ``Grup`` sütunlarından indeks oluşturur."""
+        groups = df["Grup"] if "Grup" in df.columns else None
+        return cls(df["Kanal Adı"], groups)
+
+    def _posting(self, key: int) -> np.ndarray:
+        slot = int(np.searchsorted(self._trigrams, key))
+        if slot >= len(self._trigrams) or self._trigrams[slot] != key:
+            return self._positions[:0]
+        return self._positions[self._posting_bounds[slot]:self._posting_bounds[slot + 1]]
+
+    def _name_mask(self, query: bytes, prefix: bool) -> np.ndarray:
+        """Adında (veya ad başında) ``query`` geçen satırların maskesi."""
+        length = len(query)
+        if length < 3:
+            # Kısa sorgular: bayt dizisinde doğrudan karşılaştırma
+            data = self._bytes
+            hits = np.zeros(len(data), dtype=bool)
+            # Sondaki boş/kısa adların satır başı da dizinin içinde kalsın diye
+            # maske tüm bayt dizisi uzunluğundadır (son konumlar eşleşmez)
+            hits[: len(data) - length + 1] = data[: len(data) - length + 1] == query[0]
+            if length == 2:
+                hits[:-1] &= data[1:] == query[1]
+            if prefix:
+                return hits[self._row_starts]
+            return np.logical_or.reduceat(hits, self._row_starts)
+
+        # Sorguyu örten trigram kaydırmaları: 0, 3, 6, ... ve son trigram.
+        # Her trigramın konum listesi sıralı olduğundan kesişim ikili aramayla yapılır.
+        offsets = sorted(set(range(0, length - 2, 3)) | {length - 3})
+        postings = sorted(
+            ((self._posting((query[o] << 16) | (query[o + 1] << 8) | query[o + 2]), o) for o in offsets),
+            key=lambda item: len(item[0]),
+        )
+        first, first_offset = postings[0]
+        result = first.astype(np.int64) - first_offset
+        for posting, offset in postings[1:]:
+            if not len(result) or not len(posting):
+                result = result[:0]
+                break
+            wanted = result + offset
+            slots = np.minimum(np.searchsorted(posting, wanted), len(posting) - 1)
+            result = result[posting[slots] == wanted]
+
+        mask = np.zeros(self.size, dtype=bool)
+        rows = np.searchsorted(self._row_starts, result, side="right") - 1
+        if prefix:
+            rows = rows[self._row_starts[rows] == result]
+        mask[rows] = True
+        return mask
+
+    def mask(self, query: str, prefix: bool = False) -> np.ndarray:
+        """Sorguyla eşleşen satırların boolean maskesini döndürür.
+
+        Args:
+            query: Aranan metin (büyük/küçük harf ve İ/ı farkı gözetilmez)
+            prefix: True ise yalnızca adı/grubu sorguyla başlayan satırlar
+
+        Returns:
+            Satır sayısı uzunluğunda boolean dizi
+        """
+        folded = fold_tr(query.strip())
+        if not folded:
+            return np.ones(self.size, dtype=bool)
+        if not self.size:
+            return np.zeros(0, dtype=bool)
+
+        if _SEPARATOR in folded:
+            mask = np.zeros(self.size, dtype=bool)
+        else:
+            mask = self._name_mask(folded.encode("utf-8"), prefix)
+
+        if prefix:
+            matched_groups = [code for code, key in enumerate(self._group_keys) if key.startswith(folded)]
+        else:
+            matched_groups = [code for code, key in enumerate(self._group_keys) if folded in key]
+        if matched_groups:
+            mask |= np.isin(self._group_codes, matched_groups)
+        return mask
+
+    def search(self, query: str, prefix: bool = False) -> np.ndarray:
+        """Sorguyla eşleşen satırların konumlarını (0 tabanlı, artan sırada) döndürür."""
+        return np.flatnonzero(self.mask(query, prefix=prefix))
@@ -0,0 +1,298 @@
+"""Sütunlu (columnar) kanal deposu.
+
+Parser çıktısı kanal başına dict oluşturmak yerine doğrudan sütun
+listelerine yazılır. ``Grup``/``Tür``/``Durum`` kategorik tutulur (her
+benzersiz değer bir kez saklanır, satırlar yalnızca tamsayı kod taşır),
+URL ve metin sütunları mümkünse Arrow tabanlı string dizilere dönüştürülür.
+"""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+# Parser kayıt demetlerinin alan sırası
+RECORD_FIELDS = ("Grup", "Kanal Adı", "URL", "LogoURL", "Tür", "Öznitelikler", "Seçenekler")
+
+CATEGORICAL_COLUMNS = ("Grup", "Tür", "Durum", "Bölge", "Kaynak")
+TEXT_COLUMNS = ("Kanal Adı", "URL", "LogoURL", "Öznitelikler")
+
+STATUS_PENDING = "❔ Bekliyor"
+
+# Sağlık kontrolünün bilinen durumları; listede olmayanlar (ör. "⚠️ HTTP 500")
+# atama sırasında kategorilere eklenir.
+STATUS_CATEGORIES = [
+    STATUS_PENDING,
+    "✅ Aktif",
+    "🔌 Erişilebilir",
+    "⚠️ Web Sayfası",
+    "⚠️ Boş Liste",
+    "⚠️ Segment Yok",
+    "🔀 Yönlendirme",
+    "🔒 Yasaklı",
+    "🔒 CORS/Yasaklı",
+    "🔒 SSL Hatası",
+    "🔑 Yetki Gerekli",
+    "❌ Bulunamadı",
+    "❌ Bağlantı Hatası",
+    "❌ Sunucu Yanıt Vermiyor",
+    "❌ Geçersiz",
+    "❌ Hata",
+    "⏱️ Zaman Aşımı",
+]
+
+TYPE_CATEGORIES = ["HLS", "DASH", "Diğer"]
+
+# Derin HLS testinin ölçüm sütunları: {sütun: (sonuç alanı, çarpan)}; çarpan
+# None ise değer metin olarak yazılır
+PROBE_COLUMNS = {
+    "TTFB (ms)": ("ttfb", 1000),
+    "Hız (kbit/s)": ("throughput", 1),
+    "Bant Genişliği (kbit/s)": ("bandwidth", 1),
+    "Çözünürlük": ("resolution", None),
+}
+
+
+def _string_dtype():
+    """Arrow varsa Arrow tabanlı string dtype'ı, yoksa pandas string dtype'ı döndürür."""
+    try:
+        import pyarrow  # noqa: F401  (Streamlit bağımlılığı olarak genelde kurulu)
+
+        return pd.StringDtype("pyarrow")
+    except ImportError:
+        return pd.StringDtype("python")
+
+
+class ChannelStoreBuilder:
+    """Parser kayıtlarını sütunlara yazan artımlı kanal tablosu oluşturucu."""
+
+    def __init__(self) -> None:
+        self._group_codes: Dict[str, int] = {}
+        self._groups = array("i")
+        self._type_codes: Dict[str, int] = {name: i for i, name in enumerate(TYPE_CATEGORIES)}
+        self._types = array("b")
+        self._region_codes: Dict[str, int] = {}
+        self._regions = array("b")
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._options: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def append(self, record: Sequence, region: Optional[str] = None) -> None:
+        """Tek bir ``RECORD_FIELDS`` demetini (varsa bölge etiketiyle) ekler."""
+        group, title, url, logo, kind, attrs, options = record
+
+        code = self._group_codes.get(group)
+        if code is None:
+            code = self._group_codes[group] = len(self._group_codes)
+        self._groups.append(code)
+
+        kind_code = self._type_codes.get(kind)
+        if kind_code is None:
+            kind_code = self._type_codes[kind] = len(self._type_codes)
+        self._types.append(kind_code)
+
+        if region is not None:
+            region_code = self._region_codes.get(region)
+            if region_code is None:
+                region_code = self._region_codes[region] = len(self._region_codes)
+            self._regions.append(region_code)
+
+        if options:
+            self._options[len(self._groups) - 1] = options
+        self._text["Kanal Adı"].append(title)
+        self._text["URL"].append(url)
+        self._text["LogoURL"].append(logo)
+        self._text["Öznitelikler"].append(attrs)
+
+    def extend(self, records: Iterable[Sequence]) -> "ChannelStoreBuilder":
+        """Kayıt akışının tamamını ekler."""
+        append = self.append
+        for record in records:
+            append(record)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """Biriken sütunlardan kategorik/Arrow dtype'lı DataFrame üretir."""
+        size = len(self._groups)
+        return channel_frame(
+            group_codes=np.frombuffer(self._groups, dtype=np.int32) if size else np.empty(0, dtype=np.int32),
+            groups=list(self._group_codes),
+            titles=self._text["Kanal Adı"],
+            urls=self._text["URL"],
+            logos=self._text["LogoURL"],
+            type_codes=np.frombuffer(self._types, dtype=np.int8) if size else np.empty(0, dtype=np.int8),
+            types=list(self._type_codes),
+            region_codes=(
+                (np.frombuffer(self._regions, dtype=np.int8) if size else np.empty(0, dtype=np.int8))
+                if len(self._regions) == size
+                else None
+            ),
+            regions=list(self._region_codes),
+            attrs=self._text["Öznitelikler"],
+            options=self._options,
+        )
+
+
+def channel_frame(
+    *,
+    group_codes: np.ndarray,
+    groups: Sequence[str],
+    titles,
+    urls,
+    logos,
+    type_codes: np.ndarray,
+    types: Sequence[str] = TYPE_CATEGORIES,
+    region_codes: Optional[np.ndarray] = None,
+    regions: Sequence[str] = (),
+    attrs,
+    options: Optional[Mapping[int, List[str]]] = None,
+) -> pd.DataFrame:
+    """Kod dizileri ve metin sütunlarından (liste veya Arrow dizisi) kanal tablosunu kurar.
+
+    ``ChannelStoreBuilder`` ve vektörel tarayıcı aynı sütun sırası ve
+    dtype'larını bu fonksiyon üzerinden üretir.
+    """
+    size = len(group_codes)
+    string_dtype = _string_dtype()
+    data: Dict[str, object] = {
+        "Grup": pd.Categorical.from_codes(group_codes, categories=list(groups)),
+        "Kanal Adı": pd.array(titles, dtype=string_dtype),
+        "URL": pd.array(urls, dtype=string_dtype),
+        "LogoURL": pd.array(logos, dtype=string_dtype),
+        "Tür": pd.Categorical.from_codes(type_codes, categories=list(types)),
+        "Durum": pd.Categorical.from_codes(np.zeros(size, dtype=np.int8), categories=STATUS_CATEGORIES),
+    }
+    if region_codes is not None:
+        data["Bölge"] = pd.Categorical.from_codes(region_codes, categories=list(regions))
+    data["Öznitelikler"] = pd.array(attrs, dtype=string_dtype)
+    column = np.full(size, None, dtype=object)
+    for row, value in (options or {}).items():
+        column[row] = value
+    data["Seçenekler"] = column
+    return pd.DataFrame(data)
+
+
+def ensure_channel_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Eksik kanal sütunlarını ekler ve ``Grup``/``Tür``/``Durum`` sütunlarını kategoriğe çevirir."""
+    for column_name, default_value in [("LogoURL", ""), ("Tür", ""), ("Durum", STATUS_PENDING)]:
+        if column_name not in df.columns:
+            df[column_name] = default_value
+    for column_name in CATEGORICAL_COLUMNS:
+        if column_name in df.columns and not isinstance(df[column_name].dtype, pd.CategoricalDtype):
+            df[column_name] = df[column_name].astype("category")
+    return df
+
+
+def category_options(df: pd.DataFrame, column: str) -> List[str]:
+    """Sütunda gerçekten kullanılan kategorileri sıralı döndürür."""
+    if column not in df.columns:
+        return []
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        used = np.unique(series.cat.codes.to_numpy())
+        categories = series.cat.categories
+        return sorted(str(categories[code]) for code in used if code >= 0)
+    return sorted(series.astype(str).dropna().unique())
+
+
+def category_mask(series: pd.Series, values: Iterable[str]) -> np.ndarray:
+    """Kategorik sütunda ``values`` içinde olan satırların maskesini tamsayı kodlar üzerinden hesaplar."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(list(values)).to_numpy()
+    codes = series.cat.categories.get_indexer(list(values))
+    return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    groups: Optional[Iterable[str]] = None,
+    types: Optional[Iterable[str]] = None,
+    statuses: Optional[Iterable[str]] = None,
+    regions: Optional[Iterable[str]] = None,
+    sources: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Grup/tür/durum/bölge/kaynak seçimlerine göre satırları kategori kodlarıyla filtreler."""
+    mask: Optional[np.ndarray] = None
+    filters = (("Grup", groups), ("Tür", types), ("Durum", statuses), ("Bölge", regions), ("Kaynak", sources))
+    for column, values in filters:
+        if not values or column not in df.columns:
+            continue
+        column_mask = category_mask(df[column], values)
+        mask = column_mask if mask is None else mask & column_mask
+    return df if mask is None else df[mask]
+
+
+def set_statuses(df: pd.DataFrame, statuses: Mapping[str, str]) -> None:
+    """``{URL: durum}`` eşlemesini, aynı URL'ye sahip tüm satırların ``Durum`` sütununa yazar."""
+    if not statuses or "Durum" not in df.columns:
+        return
+    column = df["Durum"]
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype("category")
+    missing = sorted(set(statuses.values()) - set(column.cat.categories))
+    if missing:
+        column = column.cat.add_categories(missing)
+
+    updates = df["URL"].map(statuses)
+    mask = updates.notna().to_numpy()
+    if mask.any():
+        column = column.copy()
+        column[mask] = updates[mask].to_numpy(dtype=object)
+    df["Durum"] = column
+
+
+def set_probe_metrics(df: pd.DataFrame, probes: Mapping[str, object]) -> None:
+    """``{URL: DeepProbeResult}`` ölçümlerini aynı URL'ye sahip satırların ``PROBE_COLUMNS`` sütunlarına yazar.
+
+    Sütunlar ilk derin testte oluşturulur; ölçülmeyen satırlar boş kalır.
+    """
+    if not probes or "URL" not in df.columns:
+        return
+    matched = df["URL"].isin(list(probes)).to_numpy()
+    if not matched.any():
+        return
+    for column, (field, scale) in PROBE_COLUMNS.items():
+        values = {}
+        for url, probe in probes.items():
+            value = getattr(probe, field, None)
+            if value is not None and scale is not None:
+                value = round(value * scale)
+            values[url] = value
+        mapped = df["URL"].map(values)
+        current = df[column] if column in df.columns else pd.Series(np.nan, index=df.index)
+        column_values = np.where(matched, mapped.to_numpy(dtype=object), current.to_numpy(dtype=object))
+        if scale is None:
+            df[column] = pd.array(column_values, dtype=_string_dtype())
+        else:
+            df[column] = pd.array(column_values, dtype="Float64").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Kanal tablolarını sırayı koruyarak birleştirir; kategorik sütunların kategorileri birleştirilir.
+
+    Kategoriler ilk görülme sırasıyla birleştirildiği için sonuç, aynı
+    kayıtların tek bir ``ChannelStoreBuilder`` ile oluşturulmasıyla aynıdır.
+    """
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return ChannelStoreBuilder().to_frame()
+    if len(frames) == 1:
+        return frames[0]
+
+    merged: Dict[str, object] = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            merged[column] = union_categoricals(parts)
+        else:
+            merged[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(merged)
@@ -10,6 +10,29 @@ logger = logging.getLogger(__name__)
 _global_vc_lock = threading.Lock()
 
 
+def data_path(filename: str) -> str:
+    """Yazılabilir bir dizinde dosya yolu döndürür.
+
+    Önbellek, sağlık deposu gibi oturumlar arasında paylaşılan dosyalar
+    için kullanılır (Streamlit Cloud'da çalışma dizini salt okunur olabilir).
+    """
+    # Zaten mutlak yol verilmişse olduğu gibi kullan
+    if os.path.isabs(filename):
+        return filename
+    # /tmp varsa ve yazılabilirse orayı kullan (Cloud uyumlu)
+    for d in ["/tmp", os.environ.get("TMPDIR", "")]:
+        if d and os.path.isdir(d):
+            try:
+                test = os.path.join(d, ".vc_test")
+                with open(test, "w") as f:
+                    f.write("t")
+                os.remove(test)
+                return os.path.join(d, filename)
+            except OSError:
+                continue
+    return filename
+
+
 class VisitorCounter:
     """Ziyaretçi sayacı - JSON dosyası ile ziyaretçi sayısını takip eder."""
 
@@ -19,24 +42,7 @@ class VisitorCounter:
         self.lock = _global_vc_lock
         self._ensure_file_exists()
 
-    @staticmethod
-    def _resolve_path(filename: str) -> str:
-        """Yazılabilir bir dizinde dosya yolu döndürür."""
-        # Zaten mutlak yol verilmişse olduğu gibi kullan
-        if os.path.isabs(filename):
-            return filename
-        # /tmp varsa ve yazılabilirse orayı kullan (Cloud uyumlu)
-        for d in ["/tmp", os.environ.get("TMPDIR", "")]:
-            if d and os.path.isdir(d):
-                try:
-                    test = os.path.join(d, ".vc_test")
-                    with open(test, "w") as f:
-                        f.write("t")
-                    os.remove(test)
-                    return os.path.join(d, filename)
-                except OSError:
-                    continue
-        return filename
+    _resolve_path = staticmethod(data_path)
 
     def _ensure_file_exists(self):
         """Sayaç dosyası yoksa oluştur."""